@@ -0,0 +1,88 @@
+"""
+Benchmark the streaming RSS parser against feedparser on feeds recorded in the response archive.
+
+Run from the Tamil_News_Translator directory after at least one live run has archived some feeds:
+    python benchmark_rss_parser.py --repeat 20
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import feedparser
+
+from archive import ResponseArchive
+from rss_parser import iter_rss_items
+
+
+def recorded_feeds(archive):
+    """Bodies of archived Google News RSS responses"""
+    feeds = []
+    for url in archive.urls():
+        if "news.google.com/rss" not in url:
+            continue
+        body = archive.load(url)
+        if body:
+            feeds.append((url, body))
+    return feeds
+
+
+def measure(parse, body, repeat):
+    """Mean seconds per parse and peak traced memory of one parse"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        count = parse(body)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    parse(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak, count
+
+
+def parse_feedparser(body):
+    return len(feedparser.parse(body).entries)
+
+
+def parse_streaming(body, chunk_size=16384):
+    chunks = (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+    return sum(1 for _ in iter_rss_items(chunks))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare feedparser with the streaming RSS parser")
+    parser.add_argument("--archive", default="data/archive", help="Response archive directory")
+    parser.add_argument("--repeat", type=int, default=10, help="Parses per feed and parser")
+    args = parser.parse_args()
+
+    feeds = recorded_feeds(ResponseArchive(directory=args.archive))
+    if not feeds:
+        print(f"No Google News feeds found in {args.archive}; run the translator once to record some.")
+        return
+
+    print(f"{'Feed':<60} {'KB':>7} {'Items':>6} {'feedparser':>12} {'streaming':>12} {'Speedup':>8} "
+          f"{'Peak KB (fp/stream)':>20}")
+    totals = [0.0, 0.0]
+    for url, body in feeds:
+        fp_time, fp_peak, fp_count = measure(parse_feedparser, body, args.repeat)
+        st_time, st_peak, st_count = measure(parse_streaming, body, args.repeat)
+        totals[0] += fp_time
+        totals[1] += st_time
+
+        items = str(st_count) if st_count == fp_count else f"{st_count}/{fp_count}"
+        print(f"{url[-60:]:<60} {len(body) / 1024:>7.1f} {items:>6} {fp_time * 1000:>10.2f}ms "
+              f"{st_time * 1000:>10.2f}ms {fp_time / st_time:>7.1f}x "
+              f"{fp_peak // 1024:>9}/{st_peak // 1024:<10}")
+
+    print(f"\nTotal over {len(feeds)} feeds: feedparser {totals[0] * 1000:.1f}ms, "
+          f"streaming {totals[1] * 1000:.1f}ms ({totals[0] / totals[1]:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
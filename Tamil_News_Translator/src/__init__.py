@@ -8,6 +8,10 @@ from .content_scraper import ContentScraper
 from .translator import TamilTranslator
 from .file_manager import FileManager
 from .error_handler import ErrorHandler
+from .archive import ResponseArchive
+from .deduplicator import StoryDeduplicator
+from .checkpoint import RunCheckpoint
+from .site_exporter import StaticSiteExporter
 
 __all__ = [
     "TamilNewsTranslator",
@@ -16,5 +20,9 @@ __all__ = [
     "ContentScraper",
     "TamilTranslator", 
     "FileManager",
-    "ErrorHandler"
+    "ErrorHandler",
+    "ResponseArchive",
+    "StoryDeduplicator",
+    "RunCheckpoint",
+    "StaticSiteExporter"
 ]
@@ -0,0 +1,141 @@
+
+"""
+Response archive for Tamil News Translator
+Stores every fetched response in a compressed, content-addressed store keyed by URL and fetch time
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from charset import decode_html
+from config import ARCHIVE_CONFIG
+from error_handler import ErrorHandler
+
+
+class ResponseArchive:
+    """WARC-like archive of raw responses with offline replay support"""
+
+    def __init__(self, directory: str = None, replay: bool = False):
+        self.error_handler = ErrorHandler()
+        self.directory = directory or ARCHIVE_CONFIG["directory"]
+        self.objects_dir = os.path.join(self.directory, "objects")
+        self.index_file = os.path.join(self.directory, "index.jsonl")
+        self.replay = replay
+
+        # url -> list of records ordered by fetch time
+        self._index: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Load the archive index into memory"""
+        if not os.path.exists(self.index_file):
+            return
+
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self.error_handler.log_warning("Skipping corrupt archive index line", "archive")
+                    continue
+                self._index.setdefault(record["url"], []).append(record)
+
+        for records in self._index.values():
+            records.sort(key=lambda r: r["fetched_at"])
+
+        self.error_handler.log_info(f"Loaded archive index with {len(self._index)} URLs", "archive")
+
+    def _object_path(self, digest: str) -> str:
+        """Get the on-disk path for a content digest"""
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.gz")
+
+    def store(self, url: str, body: bytes, status: int = 200, content_type: str = "",
+              fetched_at: str = None) -> Optional[str]:
+        """Store a response body and record it under the URL, returns the content digest"""
+        if body is None:
+            return None
+
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+
+        record = {
+            "url": url,
+            "fetched_at": fetched_at or datetime.now().isoformat(),
+            "sha256": digest,
+            "status": status,
+            "content_type": content_type,
+            "length": len(body)
+        }
+
+        with self._lock:
+            # Identical bodies are stored once
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with gzip.open(tmp_path, 'wb', compresslevel=ARCHIVE_CONFIG["compression_level"]) as f:
+                    f.write(body)
+                os.replace(tmp_path, path)
+
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+            self._index.setdefault(url, []).append(record)
+
+        return digest
+
+    def lookup(self, url: str, as_of: str = None) -> Optional[Dict]:
+        """Get the latest record for a URL, optionally no later than an ISO timestamp"""
+        records = self._index.get(url)
+        if not records:
+            return None
+
+        if as_of is None:
+            return records[-1]
+
+        candidates = [r for r in records if r["fetched_at"] <= as_of]
+        return candidates[-1] if candidates else None
+
+    def load(self, url: str, as_of: str = None) -> Optional[bytes]:
+        """Load the archived body for a URL"""
+        record = self.lookup(url, as_of)
+        if not record:
+            return None
+
+        path = self._object_path(record["sha256"])
+        if not os.path.exists(path):
+            self.error_handler.log_warning(f"Archive object missing for {url}", "archive")
+            return None
+
+        with gzip.open(path, 'rb') as f:
+            return f.read()
+
+    def load_text(self, url: str, as_of: str = None) -> Optional[str]:
+        """Load the archived body for a URL decoded as text"""
+        body = self.load(url, as_of)
+        if body is None:
+            return None
+
+        record = self.lookup(url, as_of)
+        return decode_html(body, record.get("content_type", ""))
+
+    def records(self, url: str) -> List[Dict]:
+        """Get all records for a URL"""
+        return list(self._index.get(url, []))
+
+    def urls(self) -> List[str]:
+        """Get all archived URLs"""
+        return list(self._index.keys())
+
+    def __len__(self) -> int:
+        return len(self._index)
@@ -0,0 +1,170 @@
+
+"""
+Boilerplate filter for Tamil News Translator
+Drops cookie notices, link lists, bylines and other low-information paragraphs before translation
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+from config import BOILERPLATE_CONFIG, PROCESSING_LIMITS
+from error_handler import ErrorHandler, handle_exceptions
+
+
+class BoilerplateFilter:
+    """Paragraph-level filter using link density, per-domain repetition and length heuristics"""
+
+    def __init__(self, fingerprint_file: str = None):
+        self.error_handler = ErrorHandler()
+        self.fingerprint_file = fingerprint_file or BOILERPLATE_CONFIG["fingerprint_file"]
+        self.phrase_pattern = re.compile("|".join(BOILERPLATE_CONFIG["phrases"]), re.IGNORECASE)
+        self._lock = threading.Lock()
+
+        # domain -> paragraph fingerprint -> keys of the distinct articles it appeared in (capped at the threshold)
+        self.fingerprints: Dict[str, Dict[str, List[str]]] = {}
+        self._load()
+
+        self.reset_stats()
+
+    def _load(self):
+        """Load paragraph fingerprints seen on earlier runs"""
+        if not os.path.exists(self.fingerprint_file):
+            return
+
+        try:
+            with open(self.fingerprint_file, 'r', encoding='utf-8') as f:
+                self.fingerprints = json.load(f)
+        except (OSError, ValueError) as e:
+            self.error_handler.log_warning(f"Could not load boilerplate fingerprints: {e}", "boilerplate")
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return re.sub(r"\s+", " ", text).strip()
+
+    @staticmethod
+    def _fingerprint(paragraph: str) -> str:
+        # Digits are dropped so "Updated 5 minutes ago" style lines match across articles
+        key = re.sub(r"\d+", "", paragraph.lower())
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+    def _link_densities(self, html: str) -> Dict[str, float]:
+        """Map each paragraph's text to the share of its characters inside links"""
+        if not html or lxml_html is None:
+            return {}
+
+        try:
+            tree = lxml_html.fromstring(html)
+        except (ValueError, TypeError) as e:
+            self.error_handler.log_warning(f"Could not parse page for link density: {e}", "boilerplate")
+            return {}
+
+        densities = {}
+        for element in tree.iter("p", "li"):
+            text = self._normalize(element.text_content())
+            if not text or text in densities:
+                continue
+            link_chars = sum(len(self._normalize(a.text_content())) for a in element.iter("a"))
+            densities[text] = min(1.0, link_chars / len(text))
+        return densities
+
+    def _remember(self, domain: str, fingerprints: List[str], article_key: str) -> Dict[str, int]:
+        """Record the article against each paragraph and return how many distinct articles each appeared in"""
+        # Re-scraping the same article on a later run must not make its own paragraphs look repeated
+        article_key = hashlib.blake2b(article_key.encode('utf-8'), digest_size=6).hexdigest()
+        threshold = BOILERPLATE_CONFIG["repeat_threshold"]
+
+        counts = {}
+        with self._lock:
+            seen = self.fingerprints.setdefault(domain, {})
+            for fingerprint in fingerprints:
+                articles = seen.setdefault(fingerprint, [])
+                if article_key not in articles and len(articles) < threshold:
+                    articles.append(article_key)
+                counts[fingerprint] = len(articles)
+
+            # Keep the most repeated fingerprints when a domain grows past its limit
+            limit = BOILERPLATE_CONFIG["max_fingerprints_per_domain"]
+            if len(seen) > limit:
+                ranked = sorted(seen.items(), key=lambda item: len(item[1]), reverse=True)
+                self.fingerprints[domain] = dict(ranked[:limit // 2])
+        return counts
+
+    def _reason(self, paragraph: str, density: float, repeats: int) -> Optional[str]:
+        """Why a paragraph is boilerplate, or None to keep it"""
+        if density > BOILERPLATE_CONFIG["max_link_density"]:
+            return "link_density"
+        if repeats >= BOILERPLATE_CONFIG["repeat_threshold"]:
+            return "repeated"
+        if len(paragraph) < BOILERPLATE_CONFIG["phrase_max_length"] and self.phrase_pattern.search(paragraph):
+            return "phrase"
+        if len(paragraph) < BOILERPLATE_CONFIG["min_paragraph_length"] and not re.search(r"[.!?।]\W*$", paragraph):
+            return "short"
+        return None
+
+    def clean(self, text: str, html: str = None, domain: str = "", article_key: str = "") -> str:
+        """Return the text without boilerplate paragraphs, or unchanged if too little would be left"""
+        if not BOILERPLATE_CONFIG["enabled"] or not text:
+            return text
+
+        paragraphs = [self._normalize(p) for p in re.split(r"\n+", text)]
+        paragraphs = [p for p in paragraphs if p]
+        densities = self._link_densities(html)
+        fingerprints = [self._fingerprint(p) for p in paragraphs]
+        repeats = self._remember(domain, fingerprints, article_key)
+
+        kept = []
+        removed = {}
+        for paragraph, fingerprint in zip(paragraphs, fingerprints):
+            reason = self._reason(paragraph, densities.get(paragraph, 0.0), repeats[fingerprint])
+            if reason:
+                removed[reason] = removed.get(reason, 0) + 1
+            else:
+                kept.append(paragraph)
+
+        cleaned = "\n\n".join(kept)
+        if len(cleaned) < PROCESSING_LIMITS["min_article_length"]:
+            self.error_handler.log_warning("Boilerplate filter would leave too little text, keeping original", "boilerplate")
+            cleaned, removed = text, {}
+
+        saved = len(text) - len(cleaned)
+        with self._lock:
+            self.stats["articles"] += 1
+            self.stats["chars_in"] += len(text)
+            self.stats["chars_removed"] += max(saved, 0)
+            for reason, count in removed.items():
+                self.stats[reason] += count
+
+        if saved > 0:
+            self.error_handler.log_info(
+                f"Boilerplate filter saved {saved} of {len(text)} characters ({saved / len(text):.0%}), "
+                f"paragraphs dropped: {removed}", "boilerplate")
+        return cleaned
+
+    def reset_stats(self):
+        """Start counting characters saved for a new run"""
+        self.stats = {"articles": 0, "chars_in": 0, "chars_removed": 0,
+                      "link_density": 0, "repeated": 0, "phrase": 0, "short": 0}
+
+    def get_stats(self) -> Dict[str, float]:
+        """Totals for the run, including average characters saved per article"""
+        stats = dict(self.stats)
+        stats["chars_saved_per_article"] = round(stats["chars_removed"] / stats["articles"], 1) if stats["articles"] else 0.0
+        return stats
+
+    @handle_exceptions("save_boilerplate_fingerprints")
+    def save(self) -> bool:
+        """Persist paragraph fingerprints to disk"""
+        with self._lock:
+            tmp_file = f"{self.fingerprint_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.fingerprints, f)
+            os.replace(tmp_file, self.fingerprint_file)
+        return True
@@ -0,0 +1,88 @@
+
+"""
+Charset handling for Tamil News Translator
+Finds a page's encoding from the header, BOM or meta tags, using full detection only as a last resort
+"""
+
+import codecs
+import re
+from typing import Optional, Tuple
+try:
+    from charset_normalizer import from_bytes
+except ImportError:
+    from_bytes = None
+
+from config import SCRAPING_CONFIG
+
+
+# Codecs that also strip the BOM when decoding
+BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# <meta charset="x"> and <meta http-equiv="Content-Type" content="text/html; charset=x">
+META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_.:-]+)""", re.IGNORECASE)
+
+
+def _valid(encoding: Optional[str]) -> Optional[str]:
+    if not encoding:
+        return None
+    try:
+        return codecs.lookup(encoding.strip().strip('"\'')).name
+    except LookupError:
+        return None
+
+
+def header_charset(content_type: str) -> Optional[str]:
+    """Charset parameter of a Content-Type header"""
+    for param in (content_type or "").split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset":
+            return _valid(value)
+    return None
+
+
+def is_html_content_type(content_type: str) -> bool:
+    """True for HTML media types, or when the server did not say"""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return not media_type or media_type in SCRAPING_CONFIG["html_content_types"]
+
+
+def sniff_encoding(body: bytes, content_type: str = "") -> Tuple[str, str]:
+    """Pick the encoding of an HTML body; returns (encoding, how it was found)"""
+    for bom, encoding in BOMS:
+        if body.startswith(bom):
+            return encoding, "bom"
+
+    encoding = header_charset(content_type)
+    if encoding:
+        return encoding, "header"
+
+    match = META_CHARSET.search(body[:SCRAPING_CONFIG["charset_sniff_bytes"]])
+    if match:
+        encoding = _valid(match.group(1).decode("ascii", errors="ignore"))
+        if encoding:
+            return encoding, "meta"
+
+    # Most undeclared pages are UTF-8 (or ASCII); a strict decode settles that without statistics
+    try:
+        # final=False tolerates a multi-byte character cut off by the download size cap
+        codecs.getincrementaldecoder("utf-8")().decode(body, final=False)
+        return "utf-8", "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    if from_bytes is not None:
+        best = from_bytes(body).best()
+        if best is not None:
+            return best.encoding, "detected"
+
+    return "cp1252", "fallback"
+
+
+def decode_html(body: bytes, content_type: str = "") -> str:
+    """Decode an HTML body with the sniffed encoding"""
+    encoding, _ = sniff_encoding(body, content_type)
+    return body.decode(encoding, errors="replace")
@@ -0,0 +1,128 @@
+
+"""
+Run checkpoints for Tamil News Translator
+Durably records each article's progress so an interrupted run can resume where it stopped
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from config import CHECKPOINT_CONFIG
+from error_handler import ErrorHandler
+from news_fetcher import NewsArticle
+
+
+class RunCheckpoint:
+    """Append-only per-article state log for one run"""
+
+    # States an article moves through; "failed" means scraping found no content
+    FETCHED = "fetched"
+    SCRAPED = "scraped"
+    TRANSLATED = "translated"
+    FAILED = "failed"
+
+    def __init__(self, run_id: str = None, directory: str = None):
+        self.error_handler = ErrorHandler()
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        self.run_dir = os.path.join(directory or CHECKPOINT_CONFIG["directory"], self.run_id)
+        self.manifest_file = os.path.join(self.run_dir, "manifest.json")
+        self.state_file = os.path.join(self.run_dir, "state.jsonl")
+
+        self.manifest: Dict = {}
+
+        # url -> (latest state, offset of its record); fetch order is kept for resuming
+        self._latest: Dict[str, Tuple[str, int]] = {}
+        self._fetched: Dict[str, int] = {}
+
+    @staticmethod
+    def _url(article: NewsArticle) -> str:
+        return article.link or article.original_url
+
+    def start(self, params: Dict) -> bool:
+        """Create the run directory and manifest for a new run"""
+        os.makedirs(self.run_dir, exist_ok=True)
+        self.manifest = dict(params, run_id=self.run_id, started_at=datetime.now().isoformat(), completed_at=None)
+        self._write_manifest()
+        self.error_handler.log_info(f"Checkpointing run {self.run_id} to {self.run_dir}", "checkpoint")
+        return True
+
+    def load(self) -> bool:
+        """Load the manifest and state log of an existing run"""
+        if not os.path.exists(self.manifest_file):
+            self.error_handler.log_warning(f"No checkpoint found for run {self.run_id}", "checkpoint")
+            return False
+
+        with open(self.manifest_file, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+        if os.path.exists(self.state_file):
+            with open(self.state_file, 'r+b') as f:
+                while True:
+                    offset = f.tell()
+                    line = f.readline()
+                    if not line:
+                        break
+                    try:
+                        record = json.loads(line.decode('utf-8'))
+                    except ValueError:
+                        # A crash can leave a partly written last line; drop it so new records start clean
+                        self.error_handler.log_warning("Discarding truncated checkpoint record", "checkpoint")
+                        f.truncate(offset)
+                        break
+                    self._latest[record["url"]] = (record["state"], offset)
+                    if record["state"] == self.FETCHED:
+                        self._fetched.setdefault(record["url"], offset)
+
+        done = sum(1 for state, _ in self._latest.values() if state in (self.TRANSLATED, self.FAILED))
+        self.error_handler.log_info(
+            f"Resuming run {self.run_id}: {done}/{len(self._fetched)} articles already finished", "checkpoint")
+        return True
+
+    def record(self, article: NewsArticle, state: str):
+        """Durably append the article's current snapshot under a new state"""
+        url = self._url(article)
+        line = json.dumps({"url": url, "state": state, "article": article.to_dict()}, ensure_ascii=False)
+
+        with open(self.state_file, 'ab') as f:
+            offset = f.tell()
+            f.write(line.encode('utf-8') + b"\n")
+            f.flush()
+            if CHECKPOINT_CONFIG["fsync"]:
+                os.fsync(f.fileno())
+
+        self._latest[url] = (state, offset)
+        if state == self.FETCHED:
+            self._fetched.setdefault(url, offset)
+
+    def state(self, article: NewsArticle) -> Optional[str]:
+        """Latest recorded state of an article"""
+        latest = self._latest.get(self._url(article))
+        return latest[0] if latest else None
+
+    def _read(self, offset: int) -> NewsArticle:
+        with open(self.state_file, 'rb') as f:
+            f.seek(offset)
+            return NewsArticle.from_dict(json.loads(f.readline().decode('utf-8'))["article"])
+
+    def load_article(self, article: NewsArticle) -> NewsArticle:
+        """Load the latest snapshot of an article, including any scraped or translated text"""
+        latest = self._latest.get(self._url(article))
+        return self._read(latest[1]) if latest else article
+
+    def fetched_articles(self) -> List[NewsArticle]:
+        """Articles as originally fetched, in fetch order, without bodies"""
+        return [self._read(offset) for offset in self._fetched.values()]
+
+    def complete(self):
+        """Mark the run as finished"""
+        self.manifest["completed_at"] = datetime.now().isoformat()
+        self._write_manifest()
+
+    def _write_manifest(self):
+        tmp_file = f"{self.manifest_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.manifest_file)
@@ -14,7 +14,8 @@ GOOGLE_NEWS_URLS = {
 # Translation settings
 TRANSLATION_CONFIG = {
     "source_language": "en",
-    "target_language": "ta",  # Tamil language code
+    "target_language": "ta",  # Tamil language code (primary output language)
+    "target_languages": ["ta"],  # every language each article is translated into, e.g. ["ta", "hi", "kn", "te", "ml"]
     "service_urls": [
         'translate.google.com',
         'translate.google.co.kr',
@@ -26,9 +27,10 @@ TRANSLATION_CONFIG = {
 SCRAPING_CONFIG = {
     "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
     "timeout": 30,
-    "max_retries": 3,
-    "backoff_factor": 1,
     "status_forcelist": [429, 500, 502, 503, 504],
+    "max_page_bytes": 3000000,    # article downloads stop reading after this many bytes
+    "html_content_types": ["text/html", "application/xhtml+xml"],
+    "charset_sniff_bytes": 4096,  # bytes searched for a <meta charset> declaration
     "headers": {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -39,13 +41,45 @@ SCRAPING_CONFIG = {
     }
 }
 
+# Shared HTTP client (connection pools are reused across all components)
+HTTP_CLIENT_CONFIG = {
+    "pool_connections": 50,       # host pools kept per adapter
+    "pool_maxsize": 10,           # keep-alive connections per host
+    "host_pool_sizes": {          # per-host overrides
+        "news.google.com": 4
+    },
+    "http2": False,               # requires httpx[http2]
+    "http2_hosts": []             # hosts to route through the HTTP/2 client
+}
+
+# Single retry policy shared by every network call
+RETRY_CONFIG = {
+    "max_attempts": 3,
+    "backoff_base": 1,            # seconds, doubled per attempt
+    "backoff_max": 8,             # cap on a single wait, including Retry-After
+    "request_deadline": 45,       # seconds for one request including retries
+    "article_deadline": 60,       # seconds for everything spent on one article
+    "host_failure_threshold": 5,  # consecutive failures before a host is failed fast
+    "host_cooldown": 300          # seconds a failing host is skipped
+}
+
 # File paths
 FILE_PATHS = {
     "json_output": "data/translated_articles.json",
     "text_output": "data/translated_articles.txt",
+    "jsonl_output": "data/translated_articles.jsonl",  # one record per line, appended as articles finish
     "error_log": "data/error_log.txt"
 }
 
+# Raw response archive (used for offline replay and re-extraction)
+ARCHIVE_CONFIG = {
+    "enabled": True,
+    "directory": "data/archive",
+    "compression_level": 6,
+    "archive_translations": True,
+    "replay_live_translation": False  # allow translation API calls on replay cache misses
+}
+
 # Logging configuration
 LOGGING_CONFIG = {
     "level": "INFO",
@@ -61,10 +95,107 @@ RATE_LIMIT_CONFIG = {
     "translation_delay": 0.5  # seconds between translation requests
 }
 
+# RSS feed parsing
+RSS_PARSER_CONFIG = {
+    "streaming": True,            # lxml streaming parser; feedparser is used for malformed feeds
+    "chunk_size": 16384           # bytes read from the response per parser feed
+}
+
+# Adaptive content extractor ordering
+EXTRACTOR_CONFIG = {
+    "default_order": ["newspaper3k", "beautifulsoup", "readability"],
+    "stats_file": "data/extractor_stats.json",
+    "min_attempts": 5,            # failures on a domain before an extractor is skipped
+    "reprobe_probability": 0.1    # chance to retry a skipped extractor anyway
+}
+
+# Near-duplicate story detection
+DEDUP_CONFIG = {
+    "enabled": True,
+    "shingle_size": 3,            # words per shingle
+    "max_hamming_distance": 3,    # bits out of 64
+    "history_file": "data/fingerprints.json",
+    "translations_file": "data/fingerprint_translations.jsonl",
+    "history_days": 3,
+    "history_max_entries": 5000
+}
+
+# Boilerplate filtering between scraping and translation
+BOILERPLATE_CONFIG = {
+    "enabled": True,
+    "max_link_density": 0.5,      # share of a paragraph's characters inside links
+    "repeat_threshold": 3,        # distinct articles on one domain sharing a paragraph
+    "min_paragraph_length": 40,   # shorter paragraphs without closing punctuation are dropped
+    "phrase_max_length": 200,     # phrases below only mark paragraphs shorter than this
+    "phrases": [
+        r"\bcookies?\b", r"\bread more\b", r"\balso read\b", r"\bclick here\b", r"\bsubscribe\b",
+        r"\bsign up\b", r"\bnewsletter\b", r"\bfollow us\b", r"\ball rights reserved\b",
+        r"\badvertisement\b", r"\brelated (articles|stories|news)\b", r"\bshare (this|on)\b"
+    ],
+    "fingerprint_file": "data/boilerplate_fingerprints.json",
+    "max_fingerprints_per_domain": 2000
+}
+
+# Priority order in which fetched articles are processed
+SCHEDULER_CONFIG = {
+    "recency_half_life_hours": 12,  # an article's recency score halves every this many hours
+    "category_weights": {
+        "top_stories": 1.5,
+        "world": 1.2,
+        "business": 1.0,
+        "technology": 1.0,
+        "health": 1.0,
+        "sports": 0.8,
+        "entertainment": 0.7
+    },
+    "source_weights": {},           # e.g. {"Reuters": 1.3}; sources not listed use the default
+    "default_source_weight": 1.0
+}
+
+# Daily character budget for the translation provider
+QUOTA_CONFIG = {
+    "daily_char_limit": 1000000,    # None disables the limit; usage is still tracked
+    "state_file": "data/translation_quota.json"
+}
+
+# Long-running daemon mode
+DAEMON_CONFIG = {
+    "categories": ["top_stories"],
+    "interval_minutes": 30,
+    "jitter_seconds": 120,        # random +/- offset added to each poll interval
+    "processed_url_memory": 5000, # URLs remembered across cycles to skip re-processing
+    "decoded_url_memory": 5000    # decoded Google News links cached across cycles
+}
+
+# Static HTML export of translated articles
+SITE_CONFIG = {
+    "enabled": True,
+    "directory": "data/site",
+    "site_title": "தமிழ் செய்திகள்",
+    "language": "ta",
+    "page_size": 50,              # articles per index page
+    "gzip_level": 9,
+    "brotli_quality": 11          # used when the optional brotli package is installed
+}
+
+# Per-article run checkpoints used by --resume
+CHECKPOINT_CONFIG = {
+    "directory": "data/runs",
+    "fsync": True                 # flush each state change to disk before moving on
+}
+
+# --profile output
+PROFILE_CONFIG = {
+    "directory": "data/profiles",
+    "sample_interval": 0.005,     # seconds between stack samples
+    "top_n": 15                   # functions listed per stage in the summary
+}
+
 # Article processing limits
 PROCESSING_LIMITS = {
     "max_articles_per_run": 50,
     "max_article_length": 15000,  # characters (googletrans limit)
     "min_article_length": 100,    # minimum article length to process
-    "chunk_size": 5000           # for splitting long articles
+    "chunk_size": 5000,          # for splitting long articles
+    "translation_cache_bytes": 8 * 1024 * 1024  # memory budget of each language's translation cache
 }
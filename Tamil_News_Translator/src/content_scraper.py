@@ -3,7 +3,6 @@ import time
 from typing import Optional
 from urllib.parse import urljoin, urlparse
 
-import requests
 from bs4 import BeautifulSoup
 from newspaper import Article
 try:
@@ -11,22 +10,75 @@ try:
 except ImportError:
     Document = None
 
-from config import SCRAPING_CONFIG, RATE_LIMIT_CONFIG, PROCESSING_LIMITS
-from error_handler import ErrorHandler, NetworkErrorHandler, handle_exceptions, rate_limit
+from archive import ResponseArchive
+from boilerplate import BoilerplateFilter
+from charset import decode_html, is_html_content_type
+from config import SCRAPING_CONFIG, RATE_LIMIT_CONFIG, PROCESSING_LIMITS, RETRY_CONFIG, EXTRACTOR_CONFIG
+from error_handler import Deadline, ErrorHandler, NetworkErrorHandler, handle_exceptions, rate_limit
+from extractor_stats import ExtractorScoreboard
+from http_client import read_capped
 from news_fetcher import NewsArticle
 
 
 class ContentScraper:
     """Scrapes full content from news article URLs"""
     
-    def __init__(self):
+    def __init__(self, archive: Optional[ResponseArchive] = None):
         self.error_handler = ErrorHandler()
         self.network_handler = NetworkErrorHandler(self.error_handler)
         self.session = self.network_handler.create_session_with_retries()
+        self.archive = archive
+        self.scoreboard = ExtractorScoreboard()
+        self.boilerplate_filter = BoilerplateFilter()
         
-    @handle_exceptions("scrape_with_newspaper3k")
+        self.extractors = {
+            "newspaper3k": self.scrape_with_newspaper3k,
+            "beautifulsoup": self.scrape_with_beautifulsoup,
+        }
+        if Document:
+            self.extractors["readability"] = self.scrape_with_readability
+        
+    @handle_exceptions("fetch_html")
     @rate_limit(calls_per_minute=RATE_LIMIT_CONFIG["requests_per_minute"])
-    def scrape_with_newspaper3k(self, url: str) -> Optional[dict]:
+    def fetch_html(self, url: str, deadline: Optional[Deadline] = None) -> Optional[str]:
+        """Download the article page once, recording it in the archive"""
+        try:
+            response = self.network_handler.make_request(url, self.session, deadline=deadline, stream=True)
+            if not response:
+                return None
+            
+            # Skip PDFs, images and other non-HTML responses before downloading their bodies
+            content_type = response.headers.get("Content-Type", "")
+            if not is_html_content_type(content_type):
+                response.close()
+                self.error_handler.log_warning(f"Skipping non-HTML content ({content_type}): {url}", "fetch_html")
+                return None
+            
+            body, truncated = read_capped(response, SCRAPING_CONFIG["max_page_bytes"], deadline)
+            if truncated:
+                self.error_handler.log_warning(f"Page body cut off at {len(body)} bytes: {url}", "fetch_html")
+            
+            if self.archive:
+                self.archive.store(url, body, response.status_code, content_type)
+            
+            return decode_html(body, content_type)
+            
+        except Exception as e:
+            self.error_handler.log_error(e, f"fetch_html: {url}")
+            return None
+    
+    def get_html(self, url: str, deadline: Optional[Deadline] = None) -> Optional[str]:
+        """Get page HTML from the archive in replay mode, otherwise from the network"""
+        if self.archive and self.archive.replay:
+            html = self.archive.load_text(url)
+            if html is None:
+                self.error_handler.log_warning(f"No archived response for: {url}", "get_html")
+            return html
+        
+        return self.fetch_html(url, deadline)
+        
+    @handle_exceptions("scrape_with_newspaper3k")
+    def scrape_with_newspaper3k(self, url: str, html: str) -> Optional[dict]:
         """Scrape article content using newspaper3k library"""
         try:
             self.error_handler.log_info(f"Scraping with newspaper3k: {url}", "scrape_with_newspaper3k")
@@ -34,8 +86,8 @@ class ContentScraper:
             # Create Article object
             article = Article(url)
             
-            # Download and parse the article
-            article.download()
+            # Parse the already downloaded page
+            article.download(input_html=html)
             article.parse()
             
             # Extract content
@@ -69,19 +121,13 @@ class ContentScraper:
             return None
     
     @handle_exceptions("scrape_with_beautifulsoup")
-    @rate_limit(calls_per_minute=RATE_LIMIT_CONFIG["requests_per_minute"])
-    def scrape_with_beautifulsoup(self, url: str) -> Optional[dict]:
+    def scrape_with_beautifulsoup(self, url: str, html: str) -> Optional[dict]:
         """Scrape article content using BeautifulSoup with fallback strategies"""
         try:
             self.error_handler.log_info(f"Scraping with BeautifulSoup: {url}", "scrape_with_beautifulsoup")
             
-            # Make request
-            response = self.network_handler.make_request(url, self.session)
-            if not response:
-                return None
-            
             # Parse HTML
-            soup = BeautifulSoup(response.text, 'lxml')
+            soup = BeautifulSoup(html, 'lxml')
             
             # Extract title
             title = self._extract_title(soup)
@@ -111,7 +157,7 @@ class ContentScraper:
             return None
     
     @handle_exceptions("scrape_with_readability")
-    def scrape_with_readability(self, url: str) -> Optional[dict]:
+    def scrape_with_readability(self, url: str, html: str) -> Optional[dict]:
         """Scrape article content using readability library"""
         if Document is None:
             return None
@@ -119,13 +165,8 @@ class ContentScraper:
         try:
             self.error_handler.log_info(f"Scraping with readability: {url}", "scrape_with_readability")
             
-            # Make request
-            response = self.network_handler.make_request(url, self.session)
-            if not response:
-                return None
-            
             # Use readability to extract main content
-            doc = Document(response.text)
+            doc = Document(html)
             
             # Extract content
             title = doc.title()
@@ -133,7 +174,8 @@ class ContentScraper:
             
             # Parse the content HTML to get clean text
             content_soup = BeautifulSoup(content_html, 'lxml')
-            content_text = content_soup.get_text(strip=True, separator=' ')
+            paragraphs = [p.get_text(' ', strip=True) for p in content_soup.find_all('p')]
+            content_text = '\n\n'.join(p for p in paragraphs if p) or content_soup.get_text(strip=True, separator=' ')
             
             if not content_text or len(content_text) < PROCESSING_LIMITS["min_article_length"]:
                 self.error_handler.log_warning("Could not extract sufficient content", "scrape_with_readability")
@@ -201,14 +243,14 @@ class ContentScraper:
                 # Extract paragraphs from the content
                 paragraphs = content_elem.find_all('p')
                 if paragraphs and len(paragraphs) > 2:
-                    text = ' '.join([p.get_text(strip=True) for p in paragraphs])
+                    text = '\n\n'.join([p.get_text(strip=True) for p in paragraphs])
                     if len(text) > PROCESSING_LIMITS["min_article_length"]:
                         return text
         
         # Fallback: get all paragraphs
         all_paragraphs = soup.find_all('p')
         if all_paragraphs:
-            text = ' '.join([p.get_text(strip=True) for p in all_paragraphs])
+            text = '\n\n'.join([p.get_text(strip=True) for p in all_paragraphs])
             if len(text) > PROCESSING_LIMITS["min_article_length"]:
                 return text
         
@@ -250,25 +292,28 @@ class ContentScraper:
             
             self.error_handler.log_info(f"Scraping article content from: {url}", "scrape_article_content")
             
-            # Try different scraping methods in order of preference
-            scraped_content = None
-            
-            # Method 1: newspaper3k (most reliable for news articles)
-            scraped_content = self.scrape_with_newspaper3k(url)
+            # Download once under the article's deadline; every extraction method works on the same page
+            deadline = Deadline(RETRY_CONFIG["article_deadline"])
+            html = self.get_html(url, deadline)
+            if not html:
+                self.error_handler.log_warning("Could not download article page", "scrape_article_content")
+                return article
             
-            # Method 2: BeautifulSoup (fallback)
-            if not scraped_content:
-                time.sleep(1)  # Brief delay between methods
-                scraped_content = self.scrape_with_beautifulsoup(url)
+            # Try extraction methods in the order that has worked best for this domain
+            scraped_content = None
+            domain = urlparse(url).netloc
+            names = [name for name in EXTRACTOR_CONFIG["default_order"] if name in self.extractors]
             
-            # Method 3: readability (last resort)
-            if not scraped_content and Document:
-                time.sleep(1)  # Brief delay between methods
-                scraped_content = self.scrape_with_readability(url)
+            for name in self.scoreboard.order(domain, names):
+                start = time.perf_counter()
+                scraped_content = self.extractors[name](url, html)
+                self.scoreboard.record(domain, name, bool(scraped_content), time.perf_counter() - start)
+                if scraped_content:
+                    break
             
             if scraped_content:
-                # Update article with scraped content
-                article.full_content = scraped_content["text"]
+                # Update article with scraped content, minus boilerplate that would only cost translation quota
+                article.full_content = self.boilerplate_filter.clean(scraped_content["text"], html, domain, url)
                 
                 # Update title if scraped title is better
                 if scraped_content["title"] and len(scraped_content["title"]) > len(article.title):
@@ -278,8 +323,9 @@ class ContentScraper:
             else:
                 self.error_handler.log_warning("All scraping methods failed", "scrape_article_content")
             
-            # Add rate limiting delay
-            time.sleep(RATE_LIMIT_CONFIG["delay_between_requests"])
+            # Add rate limiting delay (not needed when replaying from disk)
+            if not (self.archive and self.archive.replay):
+                time.sleep(RATE_LIMIT_CONFIG["delay_between_requests"])
             
             return article
             
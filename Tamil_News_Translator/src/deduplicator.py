@@ -0,0 +1,199 @@
+
+"""
+Near-duplicate story detection for Tamil News Translator
+Clusters near-identical article bodies with SimHash so each story is translated once
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+
+from config import DEDUP_CONFIG
+from error_handler import ErrorHandler, handle_exceptions
+from news_fetcher import NewsArticle
+
+
+FINGERPRINT_BITS = 64
+
+
+class StoryDeduplicator:
+    """Finds near-duplicate articles within a run and against recent history"""
+
+    def __init__(self, history_file: str = None, translations_file: str = None):
+        self.error_handler = ErrorHandler()
+        self.history_file = history_file or DEDUP_CONFIG["history_file"]
+        # Representative translations live on disk; history entries only hold their offset
+        self.translations_file = translations_file or DEDUP_CONFIG["translations_file"]
+        self.max_distance = DEDUP_CONFIG["max_hamming_distance"]
+
+        # With max_distance + 1 bands, two fingerprints within max_distance bits
+        # must agree exactly on at least one band (pigeonhole principle)
+        self.num_bands = self.max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.num_bands
+
+        # Stories translated in this run are added as they finish, so one index covers run and history
+        self.history: Deque[Dict] = deque()
+        self._history_urls = set()
+        self._history_bands: Dict[Tuple[int, int], List[Dict]] = {}
+
+        self._load_history()
+
+    def fingerprint(self, text: str) -> int:
+        """Compute a 64-bit SimHash of the word shingles in a text"""
+        tokens = re.findall(r'\w+', text.lower())
+        size = DEDUP_CONFIG["shingle_size"]
+        if len(tokens) < size:
+            shingles = Counter([" ".join(tokens)])
+        else:
+            shingles = Counter(" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+
+        weights = [0] * FINGERPRINT_BITS
+        for shingle, count in shingles.items():
+            digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "big")
+            for bit in range(FINGERPRINT_BITS):
+                if value >> bit & 1:
+                    weights[bit] += count
+                else:
+                    weights[bit] -= count
+
+        fingerprint = 0
+        for bit, weight in enumerate(weights):
+            if weight > 0:
+                fingerprint |= 1 << bit
+        return fingerprint
+
+    @staticmethod
+    def hamming_distance(a: int, b: int) -> int:
+        """Count differing bits between two fingerprints"""
+        return bin(a ^ b).count("1")
+
+    def _bands(self, fingerprint: int) -> List[Tuple[int, int]]:
+        """Split a fingerprint into (band index, band value) keys"""
+        mask = (1 << self.band_bits) - 1
+        return [(i, fingerprint >> (i * self.band_bits) & mask) for i in range(self.num_bands)]
+
+    def _load_history(self):
+        """Load fingerprints of recently translated stories"""
+        if not os.path.exists(self.history_file):
+            return
+
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            self.error_handler.log_warning(f"Could not load fingerprint history: {e}", "deduplicator")
+            return
+
+        cutoff = (datetime.now() - timedelta(days=DEDUP_CONFIG["history_days"])).isoformat()
+        for entry in entries:
+            if entry.get("seen_at", "") < cutoff:
+                continue
+            if "translated_content" in entry:
+                # Older history files kept the translations inline
+                entry = self._history_entry(entry, entry.pop("translated_content"), entry.pop("translations", {}))
+            self._add_history_entry(entry)
+
+        self.error_handler.log_info(f"Loaded {len(self.history)} story fingerprints", "deduplicator")
+
+    def _history_entry(self, entry: Dict, translated_content: str, translations: Dict[str, str]) -> Dict:
+        """Write a representative's translations to the translations file and keep only their offset"""
+        record = {"translated_content": translated_content, "translations": translations}
+        with open(self.translations_file, 'ab') as f:
+            offset = f.tell()
+            f.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b"\n")
+        entry = {key: entry[key] for key in ("fingerprint", "url", "title", "seen_at")}
+        entry["offset"] = offset
+        return entry
+
+    def _load_translations(self, entry: Dict) -> Dict:
+        """Read a representative's translations back from the translations file"""
+        try:
+            with open(self.translations_file, 'rb') as f:
+                f.seek(entry["offset"])
+                return json.loads(f.readline().decode('utf-8'))
+        except (OSError, ValueError, KeyError) as e:
+            self.error_handler.log_warning(f"Could not load translations for {entry.get('url')}: {e}", "deduplicator")
+            return {}
+
+    def _add_history_entry(self, entry: Dict):
+        """Add an entry to the in-memory history and its band index, evicting the oldest past the limit"""
+        self.history.append(entry)
+        self._history_urls.add(entry["url"])
+        for band in self._bands(entry["fingerprint"]):
+            self._history_bands.setdefault(band, []).append(entry)
+
+        while len(self.history) > DEDUP_CONFIG["history_max_entries"]:
+            oldest = self.history.popleft()
+            self._history_urls.discard(oldest["url"])
+            for band in self._bands(oldest["fingerprint"]):
+                bucket = self._history_bands.get(band)
+                if bucket:
+                    bucket[:] = [entry for entry in bucket if entry is not oldest]
+
+    def find_source(self, article: NewsArticle) -> Optional[Dict]:
+        """Find an already translated story (this run or recent history) that the article duplicates"""
+        try:
+            if not article.full_content:
+                return None
+
+            article.fingerprint = self.fingerprint(article.full_content)
+            for band in self._bands(article.fingerprint):
+                for entry in self._history_bands.get(band, []):
+                    if self.hamming_distance(article.fingerprint, entry["fingerprint"]) <= self.max_distance:
+                        article.duplicate_of = entry["url"]
+                        self.error_handler.log_info(f"Near-duplicate of {entry['url']}", "find_source")
+                        return entry
+            return None
+
+        except Exception as e:
+            self.error_handler.log_error(e, "find_source")
+            return None
+
+    def apply_source(self, article: NewsArticle, source: Dict) -> bool:
+        """Copy the representative's content translations onto a duplicate; titles stay the duplicate's own"""
+        stored = self._load_translations(source)
+        for language, content in stored.get("translations", {}).items():
+            if content:
+                article.translations.setdefault(language, {"title": None, "content": None})["content"] = content
+
+        if stored.get("translated_content"):
+            article.translated_content = stored["translated_content"]
+            return True
+        return False
+
+    def remember(self, article: NewsArticle):
+        """Make a translated story available as a representative for later duplicates"""
+        url = article.original_url or article.link
+        if article.duplicate_of or not article.translated_content or article.fingerprint is None:
+            return
+        if url in self._history_urls:
+            return
+
+        self._add_history_entry(self._history_entry(
+            {"fingerprint": article.fingerprint, "url": url, "title": article.title,
+             "seen_at": datetime.now().isoformat()},
+            article.translated_content,
+            {language: t.get("content") for language, t in article.translations.items()}
+        ))
+
+    @handle_exceptions("save_history")
+    def save_history(self) -> bool:
+        """Persist the fingerprint history, dropping translations of entries that have aged out"""
+        tmp_translations = f"{self.translations_file}.tmp"
+        with open(tmp_translations, 'wb') as out:
+            for entry in self.history:
+                record = self._load_translations(entry)
+                entry["offset"] = out.tell()
+                out.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b"\n")
+        os.replace(tmp_translations, self.translations_file)
+
+        tmp_file = f"{self.history_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(list(self.history), f, ensure_ascii=False)
+        os.replace(tmp_file, self.history_file)
+        return True
@@ -1,17 +1,17 @@
 
 import logging
+import threading
 import time
 import traceback
 from functools import wraps
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Optional
 from datetime import datetime
+from urllib.parse import urlparse
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
-from config import LOGGING_CONFIG, SCRAPING_CONFIG, RATE_LIMIT_CONFIG
+from config import LOGGING_CONFIG, SCRAPING_CONFIG, RATE_LIMIT_CONFIG, RETRY_CONFIG
+from http_client import HttpClient
 
 
 class ErrorHandler:
@@ -57,67 +57,173 @@ class ErrorHandler:
         self.logger.info(f"INFO in {context}: {message}")
 
 
+class RetryBudgetExceeded(requests.exceptions.RequestException):
+    """Raised when a request runs out of attempts or deadline"""
+
+
+class HostUnavailable(requests.exceptions.ConnectionError):
+    """Raised without touching the network when a host keeps failing"""
+
+
+class Deadline:
+    """Absolute point in time that a request or article must finish by"""
+    
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+        
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative"""
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def expired(self) -> bool:
+        """Check whether the deadline has passed"""
+        return self.remaining() <= 0
+    
+    def limit(self, seconds: float) -> "Deadline":
+        """Get a deadline that is the earlier of this one and `seconds` from now"""
+        child = Deadline(seconds)
+        child.expires_at = min(child.expires_at, self.expires_at)
+        return child
+
+
 class NetworkErrorHandler:
     """Handles network-related errors and retries"""
     
+    # Shared by every handler so all components see the same host health and counters
+    _lock = threading.Lock()
+    _host_failures: Dict[str, int] = {}
+    _host_open_until: Dict[str, float] = {}
+    metrics: Dict[str, int] = {
+        "requests": 0,
+        "retries": 0,
+        "failures": 0,
+        "fast_failures": 0,
+        "deadline_exceeded": 0
+    }
+    
     def __init__(self, error_handler: ErrorHandler):
         self.error_handler = error_handler
         
     def create_session_with_retries(self) -> requests.Session:
-        """Create requests session with retry strategy"""
-        session = requests.Session()
-        
-        retry_strategy = Retry(
-            total=SCRAPING_CONFIG["max_retries"],
-            backoff_factor=SCRAPING_CONFIG["backoff_factor"],
-            status_forcelist=SCRAPING_CONFIG["status_forcelist"],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        """Get the shared keep-alive session; retries are handled by make_request, not urllib3"""
+        return HttpClient.shared().session
+    
+    @classmethod
+    def _count(cls, metric: str):
+        with cls._lock:
+            cls.metrics[metric] += 1
+    
+    @classmethod
+    def get_metrics(cls) -> Dict[str, int]:
+        """Get a snapshot of the shared request counters"""
+        with cls._lock:
+            return dict(cls.metrics, open_hosts=sum(1 for t in cls._host_open_until.values() if t > time.monotonic()))
+    
+    def _host_is_open(self, host: str) -> bool:
+        """Check whether a host is currently being failed fast"""
+        with self._lock:
+            return self._host_open_until.get(host, 0) > time.monotonic()
+    
+    def _record_host_result(self, host: str, success: bool):
+        """Track consecutive failures per host and open the breaker past the threshold"""
+        with self._lock:
+            if success:
+                self._host_failures.pop(host, None)
+                self._host_open_until.pop(host, None)
+                return
+            
+            failures = self._host_failures.get(host, 0) + 1
+            self._host_failures[host] = failures
+            if failures >= RETRY_CONFIG["host_failure_threshold"]:
+                self._host_open_until[host] = time.monotonic() + RETRY_CONFIG["host_cooldown"]
         
-        return session
+        if failures == RETRY_CONFIG["host_failure_threshold"]:
+            self.error_handler.log_warning(
+                f"Host {host} failed {failures} times in a row, failing fast for {RETRY_CONFIG['host_cooldown']}s",
+                "make_request")
+    
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Compute the wait before the next attempt, honouring Retry-After on 429/503"""
+        wait = min(RETRY_CONFIG["backoff_base"] * (2 ** attempt), RETRY_CONFIG["backoff_max"])
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                wait = max(wait, min(float(retry_after), RETRY_CONFIG["backoff_max"]))
+            elif response.status_code == 429:
+                wait = max(wait, RATE_LIMIT_CONFIG["delay_between_requests"] * 2)
+        return wait
         
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((requests.exceptions.ConnectionError, requests.exceptions.Timeout))
-    )
-    def make_request(self, url: str, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
-        """Make HTTP request with error handling and retries"""
+    def make_request(self, url: str, session: Optional[requests.Session] = None,
+                     deadline: Optional[Deadline] = None, **kwargs) -> requests.Response:
+        """Make HTTP request under a single retry policy bounded by a deadline"""
         if session is None:
             session = self.create_session_with_retries()
+        
+        request_deadline = Deadline(RETRY_CONFIG["request_deadline"])
+        if deadline is not None:
+            request_deadline = deadline.limit(RETRY_CONFIG["request_deadline"])
+        
+        host = urlparse(url).netloc
+        if self._host_is_open(host):
+            self._count("fast_failures")
+            raise HostUnavailable(f"Host {host} is failing, skipping request for URL: {url}")
+        
+        last_error = None
+        for attempt in range(RETRY_CONFIG["max_attempts"]):
+            if request_deadline.expired():
+                self._count("deadline_exceeded")
+                break
+            if attempt > 0:
+                self._count("retries")
+            self._count("requests")
             
-        try:
-            response = session.get(
-                url, 
-                headers=SCRAPING_CONFIG["headers"],
-                timeout=SCRAPING_CONFIG["timeout"],
-                **kwargs
-            )
-            response.raise_for_status()
-            return response
-            
-        except requests.exceptions.HTTPError as e:
-            self.error_handler.log_error(e, f"HTTP Error for URL: {url}")
-            if e.response.status_code == 429:
-                self.error_handler.log_warning("Rate limit detected, slowing down requests", "make_request")
-                time.sleep(RATE_LIMIT_CONFIG["delay_between_requests"] * 2)
-            raise
-            
-        except requests.exceptions.ConnectionError as e:
-            self.error_handler.log_error(e, f"Connection Error for URL: {url}")
-            raise
+            timeout = min(SCRAPING_CONFIG["timeout"], request_deadline.remaining())
+            response = None
+            try:
+                response = session.get(
+                    url, 
+                    headers=SCRAPING_CONFIG["headers"],
+                    timeout=timeout,
+                    **kwargs
+                )
+                response.raise_for_status()
+                self._record_host_result(host, True)
+                return response
+                
+            except requests.exceptions.HTTPError as e:
+                self.error_handler.log_error(e, f"HTTP Error for URL: {url}")
+                last_error = e
+                # Streamed error responses would otherwise hold their pooled connection
+                e.response.close()
+                if e.response.status_code not in SCRAPING_CONFIG["status_forcelist"]:
+                    # Client errors will not get better by retrying
+                    self._count("failures")
+                    raise
+                if e.response.status_code == 429:
+                    self.error_handler.log_warning("Rate limit detected, slowing down requests", "make_request")
+                
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.error_handler.log_error(e, f"{type(e).__name__} for URL: {url}")
+                last_error = e
+                
+            except requests.exceptions.RequestException as e:
+                self.error_handler.log_error(e, f"Request Error for URL: {url}")
+                self._count("failures")
+                raise
             
-        except requests.exceptions.Timeout as e:
-            self.error_handler.log_error(e, f"Timeout Error for URL: {url}")
-            raise
+            self._record_host_result(host, False)
+            if attempt == RETRY_CONFIG["max_attempts"] - 1 or self._host_is_open(host):
+                break
             
-        except requests.exceptions.RequestException as e:
-            self.error_handler.log_error(e, f"Request Error for URL: {url}")
-            raise
+            wait = self._backoff(attempt, response)
+            if wait >= request_deadline.remaining():
+                self._count("deadline_exceeded")
+                self.error_handler.log_warning(f"Deadline reached, giving up on URL: {url}", "make_request")
+                break
+            time.sleep(wait)
+        
+        self._count("failures")
+        raise RetryBudgetExceeded(f"Giving up on URL: {url} ({last_error})")
 
 
 def handle_exceptions(context: str = ""):
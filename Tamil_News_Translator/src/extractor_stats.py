@@ -0,0 +1,110 @@
+
+"""
+Extractor scoreboard for Tamil News Translator
+Tracks per-domain success rate and latency of each content extractor to pick the best order
+"""
+
+import json
+import os
+import random
+import threading
+from typing import Dict, List
+
+from config import EXTRACTOR_CONFIG
+from error_handler import ErrorHandler, handle_exceptions
+
+
+class ExtractorScoreboard:
+    """Persistent per-domain statistics used to reorder extraction strategies"""
+
+    def __init__(self, stats_file: str = None):
+        self.error_handler = ErrorHandler()
+        self.stats_file = stats_file or EXTRACTOR_CONFIG["stats_file"]
+        self._lock = threading.Lock()
+
+        # domain -> extractor -> {"attempts", "successes", "total_time"}
+        self.stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._load()
+
+    def _load(self):
+        """Load saved statistics"""
+        if not os.path.exists(self.stats_file):
+            return
+
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                self.stats = json.load(f)
+        except (OSError, ValueError) as e:
+            self.error_handler.log_warning(f"Could not load extractor stats: {e}", "extractor_stats")
+
+    def _entry(self, domain: str, extractor: str) -> Dict[str, float]:
+        return self.stats.setdefault(domain, {}).setdefault(
+            extractor, {"attempts": 0, "successes": 0, "total_time": 0.0})
+
+    def success_rate(self, domain: str, extractor: str) -> float:
+        """Smoothed success rate; unseen extractors start at 0.5"""
+        entry = self.stats.get(domain, {}).get(extractor)
+        if not entry:
+            return 0.5
+        return (entry["successes"] + 1) / (entry["attempts"] + 2)
+
+    def average_time(self, domain: str, extractor: str) -> float:
+        """Average seconds per attempt"""
+        entry = self.stats.get(domain, {}).get(extractor)
+        if not entry or not entry["attempts"]:
+            return 0.0
+        return entry["total_time"] / entry["attempts"]
+
+    def never_succeeds(self, domain: str, extractor: str) -> bool:
+        """Check whether an extractor has enough failed attempts on a domain to be skipped"""
+        entry = self.stats.get(domain, {}).get(extractor)
+        return bool(entry) and entry["attempts"] >= EXTRACTOR_CONFIG["min_attempts"] and entry["successes"] == 0
+
+    def order(self, domain: str, extractors: List[str]) -> List[str]:
+        """Order extractors for a domain, dropping ones that never work there except for occasional re-probes"""
+        ranked = sorted(
+            extractors,
+            key=lambda name: (-self.success_rate(domain, name), self.average_time(domain, name))
+        )
+
+        ordered = []
+        for name in ranked:
+            if self.never_succeeds(domain, name) and random.random() >= EXTRACTOR_CONFIG["reprobe_probability"]:
+                continue
+            ordered.append(name)
+
+        return ordered
+
+    def record(self, domain: str, extractor: str, success: bool, elapsed: float):
+        """Record the outcome of one extraction attempt"""
+        with self._lock:
+            entry = self._entry(domain, extractor)
+            entry["attempts"] += 1
+            entry["successes"] += 1 if success else 0
+            entry["total_time"] += elapsed
+
+    @handle_exceptions("save_extractor_stats")
+    def save(self) -> bool:
+        """Persist statistics to disk"""
+        with self._lock:
+            tmp_file = f"{self.stats_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.stats, f, indent=2)
+            os.replace(tmp_file, self.stats_file)
+        return True
+
+    def format_table(self) -> str:
+        """Format the scoreboard for display on the command line"""
+        lines = [f"{'Domain':<35} {'Extractor':<15} {'Attempts':>8} {'Success':>8} {'Avg time':>9}"]
+        lines.append("-" * len(lines[0]))
+
+        for domain in sorted(self.stats):
+            for extractor, entry in sorted(self.stats[domain].items()):
+                attempts = entry["attempts"]
+                rate = entry["successes"] / attempts * 100 if attempts else 0.0
+                skipped = " (skipped)" if self.never_succeeds(domain, extractor) else ""
+                lines.append(
+                    f"{domain[:35]:<35} {extractor:<15} {attempts:>8} {rate:>7.1f}% "
+                    f"{self.average_time(domain, extractor):>8.2f}s{skipped}")
+
+        return "\n".join(lines)
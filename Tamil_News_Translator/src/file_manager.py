@@ -2,9 +2,9 @@
 import json
 import os
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from config import FILE_PATHS
+from config import FILE_PATHS, TRANSLATION_CONFIG
 from error_handler import ErrorHandler, handle_exceptions
 from news_fetcher import NewsArticle
 
@@ -12,8 +12,11 @@ from news_fetcher import NewsArticle
 class FileManager:
     """Manages file operations for saving translated articles"""
     
-    def __init__(self):
+    def __init__(self, primary_language: str = None):
         self.error_handler = ErrorHandler()
+        # Language held in translated_title/translated_content; other languages come from article.translations
+        self.primary_language = primary_language or TRANSLATION_CONFIG["target_language"]
+        self._pending_stream = None  # (filename, backup) until the first article is appended
         self._ensure_data_directory()
     
     def _ensure_data_directory(self):
@@ -23,34 +26,84 @@ class FileManager:
             os.makedirs(data_dir)
             self.error_handler.log_info(f"Created data directory: {data_dir}", "file_manager")
     
+    @handle_exceptions("start_article_stream")
+    def start_article_stream(self, filename: str = None, backup: bool = False) -> bool:
+        """Start a fresh JSONL stream that articles are appended to as they finish"""
+        # Nothing on disk changes until the first article arrives, so a run that produces
+        # nothing leaves the previous outputs where they were
+        self._pending_stream = (filename or FILE_PATHS["jsonl_output"], backup)
+        return True
+    
+    def _open_pending_stream(self, filename: str):
+        """Back up the previous outputs and truncate the stream before its first article"""
+        if not self._pending_stream or self._pending_stream[0] != filename:
+            return
+        _, backup = self._pending_stream
+        self._pending_stream = None
+        if backup:
+            self.backup_existing_files()
+        open(filename, 'w', encoding='utf-8').close()
+    
+    @handle_exceptions("append_article")
+    def append_article(self, article: NewsArticle, filename: str = None) -> Optional[Tuple[str, int]]:
+        """Append one article to the JSONL stream and return a handle to it"""
+        filename = filename or FILE_PATHS["jsonl_output"]
+        self._open_pending_stream(filename)
+        
+        with open(filename, 'ab') as f:
+            offset = f.tell()
+            f.write(json.dumps(article.to_dict(), ensure_ascii=False).encode('utf-8') + b"\n")
+        
+        return (filename, offset)
+    
+    @handle_exceptions("load_article")
+    def load_article(self, storage_ref: Tuple[str, int]) -> Optional[NewsArticle]:
+        """Load a single persisted article back from its handle"""
+        filename, offset = storage_ref
+        with open(filename, 'rb') as f:
+            f.seek(offset)
+            return NewsArticle.from_dict(json.loads(f.readline().decode('utf-8')))
+    
+    def iter_articles_jsonl(self, filename: str = None) -> Iterator[NewsArticle]:
+        """Yield persisted articles one at a time"""
+        filename = filename or FILE_PATHS["jsonl_output"]
+        if not os.path.exists(filename):
+            return
+        
+        with open(filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield NewsArticle.from_dict(json.loads(line))
+    
     @handle_exceptions("save_to_json")
-    def save_to_json(self, articles: List[NewsArticle], filename: str = None) -> bool:
-        """Save articles to JSON file"""
+    def save_to_json(self, articles: Iterable[NewsArticle], filename: str = None) -> bool:
+        """Save articles to JSON file, writing them one at a time"""
         try:
             filename = filename or FILE_PATHS["json_output"]
+            timestamp = datetime.now().isoformat()
+            total = 0
+            translated = 0
             
-            # Convert articles to dictionaries
-            articles_data = []
-            for article in articles:
-                article_dict = article.to_dict()
-                articles_data.append(article_dict)
-            
-            # Create complete data structure
-            data = {
-                "export_info": {
-                    "timestamp": datetime.now().isoformat(),
-                    "total_articles": len(articles),
-                    "translated_articles": sum(1 for a in articles if a.translated_title or a.translated_content),
-                    "format_version": "1.0"
-                },
-                "articles": articles_data
-            }
-            
-            # Save to file
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.write('{\n  "articles": [')
+                for article in articles:
+                    article_json = json.dumps(article.to_dict(timestamp), ensure_ascii=False, indent=2)
+                    f.write((",\n    " if total else "\n    ") + article_json.replace("\n", "\n    "))
+                    total += 1
+                    translated += 1 if article.translated_title or article.translated_content else 0
+                
+                # Counts are only known after streaming the articles, so export info comes last
+                export_info = {
+                    "timestamp": timestamp,
+                    "total_articles": total,
+                    "translated_articles": translated,
+                    "format_version": "1.0"
+                }
+                f.write("\n  ],\n  \"export_info\": ")
+                f.write(json.dumps(export_info, ensure_ascii=False, indent=2).replace("\n", "\n  "))
+                f.write("\n}\n")
             
-            self.error_handler.log_info(f"Successfully saved {len(articles)} articles to {filename}", "save_to_json")
+            self.error_handler.log_info(f"Successfully saved {total} articles to {filename}", "save_to_json")
             return True
             
         except Exception as e:
@@ -58,10 +111,11 @@ class FileManager:
             return False
     
     @handle_exceptions("save_to_text")
-    def save_to_text(self, articles: List[NewsArticle], filename: str = None) -> bool:
+    def save_to_text(self, articles: Iterable[NewsArticle], filename: str = None, total: int = None) -> bool:
         """Save articles to formatted text file"""
         try:
             filename = filename or FILE_PATHS["text_output"]
+            total = len(articles) if total is None else total
             
             with open(filename, 'w', encoding='utf-8') as f:
                 # Write header
@@ -69,7 +123,7 @@ class FileManager:
                 f.write("தமிழ் செய்தி மொழிபெயர்ப்பு (Tamil News Translation)\n")
                 f.write("=" * 80 + "\n")
                 f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Total articles: {len(articles)}\n")
+                f.write(f"Total articles: {total}\n")
                 f.write("=" * 80 + "\n\n")
                 
                 # Write articles
@@ -110,9 +164,18 @@ class FileManager:
                     else:
                         f.write("Tamil Translation: Not available\n")
                     
+                    # Additional target languages
+                    for language, translation in article.translations.items():
+                        if language == self.primary_language or not translation.get("content"):
+                            continue
+                        f.write(f"\nTranslation ({language}):\n")
+                        if translation.get("title"):
+                            f.write(f"{translation['title']}\n")
+                        f.write(f"{translation['content']}\n")
+                    
                     f.write("\n" + "=" * 80 + "\n\n")
             
-            self.error_handler.log_info(f"Successfully saved {len(articles)} articles to {filename}", "save_to_text")
+            self.error_handler.log_info(f"Successfully saved {total} articles to {filename}", "save_to_text")
             return True
             
         except Exception as e:
@@ -136,21 +199,7 @@ class FileManager:
             articles_data = data.get("articles", [])
             
             for article_dict in articles_data:
-                article = NewsArticle(
-                    title=article_dict.get("title", ""),
-                    link=article_dict.get("link", ""),
-                    published=article_dict.get("published", ""),
-                    description=article_dict.get("description", ""),
-                    source=article_dict.get("source", "")
-                )
-                
-                # Set additional attributes
-                article.original_url = article_dict.get("original_url")
-                article.full_content = article_dict.get("full_content")
-                article.translated_title = article_dict.get("translated_title")
-                article.translated_content = article_dict.get("translated_content")
-                
-                articles.append(article)
+                articles.append(NewsArticle.from_dict(article_dict))
             
             self.error_handler.log_info(f"Successfully loaded {len(articles)} articles from {filename}", "load_from_json")
             return articles
@@ -177,7 +226,10 @@ class FileManager:
                 f.write(f"Titles translated: {translation_stats.get('titles_translated', 0)}\n")
                 f.write(f"Content translated: {translation_stats.get('content_translated', 0)}\n")
                 f.write(f"Fully translated: {translation_stats.get('fully_translated', 0)}\n")
-                f.write(f"Translation cache size: {translation_stats.get('cache_size', 0)}\n\n")
+                f.write(f"Translation cache size: {translation_stats.get('cache_size', 0)}\n")
+                for language, count in translation_stats.get('languages', {}).items():
+                    f.write(f"Content translated ({language}): {count}\n")
+                f.write("\n")
                 
                 # Success rate
                 total = translation_stats.get('total_articles', 0)
@@ -185,6 +237,50 @@ class FileManager:
                     success_rate = (translation_stats.get('fully_translated', 0) / total) * 100
                     f.write(f"Success rate: {success_rate:.2f}%\n\n")
                 
+                # Boilerplate filter
+                boilerplate = translation_stats.get('boilerplate')
+                if boilerplate and boilerplate.get('articles'):
+                    f.write("Boilerplate Filter:\n")
+                    f.write("-" * 19 + "\n")
+                    f.write(f"Characters scraped: {boilerplate['chars_in']}\n")
+                    f.write(f"Characters removed: {boilerplate['chars_removed']}\n")
+                    f.write(f"Saved per article: {boilerplate['chars_saved_per_article']}\n")
+                    f.write(f"Paragraphs dropped (link density / repeated / phrase / short): "
+                            f"{boilerplate['link_density']} / {boilerplate['repeated']} / "
+                            f"{boilerplate['phrase']} / {boilerplate['short']}\n\n")
+                
+                # Translation quota
+                quota = translation_stats.get('quota')
+                if quota:
+                    f.write("Translation Quota:\n")
+                    f.write("-" * 18 + "\n")
+                    f.write(f"Characters used today ({quota['date']}): {quota['used']}\n")
+                    f.write(f"Daily limit: {quota['limit'] or 'none'}\n")
+                    if quota['remaining'] is not None:
+                        f.write(f"Remaining: {quota['remaining']}\n")
+                    f.write("\n")
+                
+                # Network statistics
+                network = translation_stats.get('network')
+                if network:
+                    f.write("Network Statistics:\n")
+                    f.write("-" * 19 + "\n")
+                    for key, value in network.items():
+                        f.write(f"{key.replace('_', ' ').capitalize()}: {value}\n")
+                    f.write("\n")
+                
+                # Profile by pipeline stage (--profile)
+                profile = translation_stats.get('profile')
+                if profile:
+                    f.write("Profile by Stage:\n")
+                    f.write("-" * 17 + "\n")
+                    for stage, timing in profile.items():
+                        f.write(f"{stage}: wall {timing['wall']:.2f}s, work {timing['work']:.2f}s, "
+                                f"sleep {timing['sleep']:.2f}s, cpu {timing['cpu']:.2f}s\n")
+                        for line in timing['top_functions']:
+                            f.write(f"    {line}\n")
+                    f.write("\n")
+                
                 # File information
                 f.write("Output Files:\n")
                 f.write("-" * 15 + "\n")
@@ -216,7 +312,7 @@ class FileManager:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             
             for file_type, filepath in FILE_PATHS.items():
-                if os.path.exists(filepath) and file_type in ['json_output', 'text_output']:
+                if os.path.exists(filepath) and file_type in ['json_output', 'text_output', 'jsonl_output']:
                     backup_name = f"{filepath}.backup_{timestamp}"
                     os.rename(filepath, backup_name)
                     self.error_handler.log_info(f"Backed up {filepath} to {backup_name}", "backup_existing_files")
@@ -0,0 +1,224 @@
+
+"""
+Shared HTTP client for Tamil News Translator
+One session with per-host connection pools, reused by every component, plus optional HTTP/2
+"""
+
+import io
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from config import HTTP_CLIENT_CONFIG
+
+
+def read_capped(response: requests.Response, max_bytes: int, deadline=None,
+                chunk_size: int = 65536) -> Tuple[bytes, bool]:
+    """Read a streamed response body up to max_bytes; returns (body, truncated)"""
+    parts = []
+    size = 0
+    truncated = False
+
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= max_bytes or (deadline is not None and deadline.expired()):
+            truncated = True
+            break
+
+    # Closing early drops the connection instead of draining the rest of a huge body
+    response.close()
+    return b"".join(parts)[:max_bytes], truncated
+
+
+class _HttpxBodyReader:
+    """File-like view of a streamed httpx response, used as requests.Response.raw"""
+
+    def __init__(self, result: "httpx.Response"):
+        self.result = result
+        self._chunks = result.iter_bytes()
+        self._buffer = b""
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        while amt is None or len(self._buffer) < amt:
+            try:
+                chunk = next(self._chunks, None)
+            except httpx.TimeoutException as e:
+                raise requests.exceptions.Timeout(e)
+            except httpx.TransportError as e:
+                raise requests.exceptions.ConnectionError(e)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if amt is None:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def close(self):
+        self.result.close()
+
+
+class Http2Adapter(BaseAdapter):
+    """Transport adapter that sends requests through an HTTP/2 capable httpx client"""
+
+    def __init__(self, client: "httpx.Client"):
+        super().__init__()
+        self.client = client
+        self.requests_sent = 0
+        self.http2_responses = 0
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+
+        try:
+            result = self.client.send(
+                self.client.build_request(
+                    request.method,
+                    request.url,
+                    headers=dict(request.headers),
+                    content=request.body,
+                    timeout=timeout
+                ),
+                stream=stream
+            )
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+
+        self.requests_sent += 1
+        if result.http_version == "HTTP/2":
+            self.http2_responses += 1
+
+        # Present the httpx result as a requests.Response so callers are unaffected
+        response = requests.Response()
+        response.status_code = result.status_code
+        response.headers = CaseInsensitiveDict(result.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = result.reason_phrase
+        response.url = str(result.url)
+        response.request = request
+        if stream:
+            # Body is read lazily through iter_content, so read_capped can stop early
+            response.raw = _HttpxBodyReader(result)
+        else:
+            response.raw = io.BytesIO(result.content)
+            response._content = result.content
+            response._content_consumed = True
+        return response
+
+    def open_connections(self) -> int:
+        """Number of connections currently held by the httpx pool"""
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        return len(getattr(pool, "connections", []))
+
+    def close(self):
+        self.client.close()
+
+
+class HttpClient:
+    """Process-wide HTTP session with keep-alive pools sized per host"""
+
+    _shared: Optional["HttpClient"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self.session = requests.Session()
+
+        # Retries are owned by NetworkErrorHandler.make_request, never by urllib3
+        self.session.mount("http://", self._pooled_adapter(HTTP_CLIENT_CONFIG["pool_maxsize"]))
+        self.session.mount("https://", self._pooled_adapter(HTTP_CLIENT_CONFIG["pool_maxsize"]))
+
+        self._host_adapters: Dict[str, BaseAdapter] = {}
+        for host, pool_size in HTTP_CLIENT_CONFIG["host_pool_sizes"].items():
+            self._mount_host(host, self._pooled_adapter(pool_size))
+
+        if HTTP_CLIENT_CONFIG["http2"] and httpx is not None:
+            for host in HTTP_CLIENT_CONFIG["http2_hosts"]:
+                client = httpx.Client(
+                    http2=True,
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=HTTP_CLIENT_CONFIG["host_pool_sizes"].get(host, HTTP_CLIENT_CONFIG["pool_maxsize"]),
+                        max_keepalive_connections=HTTP_CLIENT_CONFIG["pool_maxsize"]
+                    )
+                )
+                self._mount_host(host, Http2Adapter(client))
+
+    @classmethod
+    def shared(cls) -> "HttpClient":
+        """Get the client shared by all components"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _pooled_adapter(self, pool_size: int) -> HTTPAdapter:
+        return HTTPAdapter(
+            pool_connections=HTTP_CLIENT_CONFIG["pool_connections"],
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=0, raise_on_status=False)
+        )
+
+    def _mount_host(self, host: str, adapter: BaseAdapter):
+        self._host_adapters[host] = adapter
+        self.session.mount(f"https://{host}", adapter)
+        self.session.mount(f"http://{host}", adapter)
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-host request and connection counts, to confirm keep-alive reuse"""
+        metrics: Dict[str, Dict[str, float]] = {}
+
+        adapters = [self.session.get_adapter("https://"), self.session.get_adapter("http://")]
+        adapters += list(self._host_adapters.values())
+
+        for adapter in set(adapters):
+            if isinstance(adapter, Http2Adapter):
+                continue
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = metrics.setdefault(pool.host, {"requests": 0, "connections": 0})
+                host["requests"] += pool.num_requests
+                host["connections"] += pool.num_connections
+
+        for host, adapter in self._host_adapters.items():
+            if isinstance(adapter, Http2Adapter):
+                metrics[host] = {
+                    "requests": adapter.requests_sent,
+                    "connections": adapter.open_connections(),
+                    "http2_responses": adapter.http2_responses
+                }
+
+        for host in metrics.values():
+            if host["requests"]:
+                host["reuse_rate"] = round(1 - host["connections"] / host["requests"], 3)
+
+        return metrics
+
+    def get_summary(self) -> Dict[str, float]:
+        """Totals across hosts"""
+        metrics = self.get_metrics()
+        requests_made = sum(h["requests"] for h in metrics.values())
+        connections = sum(h["connections"] for h in metrics.values())
+        return {
+            "hosts": len(metrics),
+            "http_requests": requests_made,
+            "connections_opened": connections,
+            "connection_reuse_rate": round(1 - connections / requests_made, 3) if requests_made else 0.0
+        }
@@ -1,13 +1,28 @@
 
 import sys
 import argparse
+import random
+import resource
+import signal
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from typing import List, Optional
 
-from config import GOOGLE_NEWS_URLS, PROCESSING_LIMITS, FILE_PATHS
-from error_handler import ErrorHandler
+from archive import ResponseArchive
+from checkpoint import RunCheckpoint
+from config import (GOOGLE_NEWS_URLS, PROCESSING_LIMITS, FILE_PATHS, ARCHIVE_CONFIG, DEDUP_CONFIG, DAEMON_CONFIG,
+                    SITE_CONFIG)
+from error_handler import ErrorHandler, NetworkErrorHandler
+from http_client import HttpClient
 from news_fetcher import GoogleNewsFetcher, NewsArticle
+from profiler import PipelineProfiler
+from scheduler import PriorityScheduler, TranslationQuota
 from content_scraper import ContentScraper
+from site_exporter import StaticSiteExporter
+from deduplicator import StoryDeduplicator
+from extractor_stats import ExtractorScoreboard
 from translator import TamilTranslator
 from file_manager import FileManager
 
@@ -15,77 +30,172 @@ from file_manager import FileManager
 class TamilNewsTranslator:
     """Main class that orchestrates the entire translation process"""
     
-    def __init__(self):
+    def __init__(self, replay: bool = False, target_languages: List[str] = None, profile: bool = False):
         self.error_handler = ErrorHandler()
-        self.news_fetcher = GoogleNewsFetcher()
-        self.content_scraper = ContentScraper()
-        self.translator = TamilTranslator()
-        self.file_manager = FileManager()
         
-        self.error_handler.log_info("Tamil News Translator initialized", "main")
+        # Shared response archive; replay mode serves everything from it
+        self.archive = None
+        if ARCHIVE_CONFIG["enabled"] or replay:
+            self.archive = ResponseArchive(replay=replay)
+        
+        self.news_fetcher = GoogleNewsFetcher(archive=self.archive)
+        self.content_scraper = ContentScraper(archive=self.archive)
+        self.quota = TranslationQuota()
+        self.scheduler = PriorityScheduler()
+        self.profiler = PipelineProfiler(enabled=profile)
+        self.translator = TamilTranslator(archive=self.archive, target_languages=target_languages, quota=self.quota,
+                                          profiler=self.profiler)
+        self.file_manager = FileManager(primary_language=self.translator.primary_language)
+        self.site_exporter = StaticSiteExporter() if SITE_CONFIG["enabled"] else None
+        self.deduplicator = StoryDeduplicator() if DEDUP_CONFIG["enabled"] else None
+        
+        # Set on SIGTERM/SIGINT in daemon mode; in-flight articles are drained, no new ones started
+        self.stop_event = threading.Event()
+        
+        # Set when the next article would not fit in today's translation quota; ends the current run only
+        self.quota_exhausted = False
+        
+        # URLs already processed by this instance, so daemon cycles only handle new stories
+        self.processed_urls = deque(maxlen=DAEMON_CONFIG["processed_url_memory"])
+        self._processed_url_set = set()
+        
+        mode = "replay" if replay else "live"
+        self.error_handler.log_info(f"Tamil News Translator initialized ({mode} mode)", "main")
     
-    def run(self, category: str = "top_stories", query: str = None, max_articles: int = None) -> bool:
+    def run(self, category: str = "top_stories", query: str = None, max_articles: int = None,
+            low_memory: bool = False, resume_run_id: str = None) -> bool:
         """Run the complete translation process"""
+        self.profiler.start()
+        self.content_scraper.boilerplate_filter.reset_stats()
+        self.quota_exhausted = False
         try:
+            checkpoint = RunCheckpoint(run_id=resume_run_id)
+            
+            if resume_run_id:
+                # Resume with the original run's parameters and article list, without refetching
+                if not checkpoint.load():
+                    return False
+                category = checkpoint.manifest.get("category")
+                query = checkpoint.manifest.get("query")
+                max_articles = checkpoint.manifest.get("max_articles")
+            
             max_articles = max_articles or PROCESSING_LIMITS["max_articles_per_run"]
             
             self.error_handler.log_info(f"Starting Tamil News Translator", "run")
             self.error_handler.log_info(f"Category: {category}, Query: {query}, Max articles: {max_articles}", "run")
             
-            # Step 1: Fetch news articles
-            self.error_handler.log_info("Step 1: Fetching news articles...", "run")
-            if query:
-                articles = self.news_fetcher.fetch_news_by_query(query)
+            if resume_run_id:
+                articles = checkpoint.fetched_articles()
+                self.error_handler.log_info(f"Step 1: Resuming {len(articles)} fetched articles from run {checkpoint.run_id}", "run")
             else:
-                articles = self.news_fetcher.fetch_news_by_category(category)
+                # Step 1: Fetch news articles
+                self.error_handler.log_info("Step 1: Fetching news articles...", "run")
+                with self.profiler.stage("fetch"):
+                    if query:
+                        articles = self.news_fetcher.fetch_news_by_query(query)
+                    else:
+                        articles = self.news_fetcher.fetch_news_by_category(category)
+                
+                if not articles:
+                    self.error_handler.log_warning("No articles fetched", "run")
+                    return False
+                
+                # Skip stories this instance already processed (daemon cycles)
+                articles = [a for a in articles if (a.original_url or a.link) not in self._processed_url_set]
+                if not articles:
+                    self.error_handler.log_info("No new articles since last run", "run")
+                    return True
+                
+                # Most valuable stories first, so a capped or quota-limited run keeps the best ones
+                articles = self.scheduler.order(articles, category)
+                
+                # Limit articles if needed
+                articles = articles[:max_articles]
+                self.error_handler.log_info(f"Fetched {len(articles)} articles", "run")
+                
+                checkpoint.start({
+                    "category": category,
+                    "query": query,
+                    "max_articles": max_articles,
+                    "languages": self.translator.target_languages
+                })
+                for article in articles:
+                    checkpoint.record(article, RunCheckpoint.FETCHED)
             
-            if not articles:
-                self.error_handler.log_warning("No articles fetched", "run")
-                return False
+            # Step 2: Scrape, translate and persist each article in turn
+            self.error_handler.log_info("Step 2: Scraping and translating articles...", "run")
             
-            # Limit articles if needed
-            articles = articles[:max_articles]
-            self.error_handler.log_info(f"Fetched {len(articles)} articles", "run")
+            # Existing files are backed up when the first article is written, not before
+            self.file_manager.start_article_stream(backup=True)
             
-            # Step 2: Scrape full content
-            self.error_handler.log_info("Step 2: Scraping full content...", "run")
-            scraped_articles = []
+            translated_articles = []
+            translation_stats = None
             for i, article in enumerate(articles, 1):
-                self.error_handler.log_info(f"Scraping article {i}/{len(articles)}: {article.title[:50]}...", "run")
-                scraped_article = self.content_scraper.scrape_article_content(article)
-                scraped_articles.append(scraped_article)
+                if self.stop_event.is_set():
+                    self.error_handler.log_warning("Stop requested, not starting further articles", "run")
+                    break
+                self.error_handler.log_info(f"Processing article {i}/{len(articles)}: {article.title[:50]}...", "run")
+                
+                article = self._process_article(article, checkpoint)
+                self.quota.save()
+                if self.quota_exhausted:
+                    self.error_handler.log_warning(
+                        f"Daily translation quota reached, leaving {len(articles) - i + 1} lower-priority articles", "run")
+                    break
+                if not article:
+                    continue
+                
+                translated_articles.append(article)
+                translation_stats = self._accumulate_stats(translation_stats, article)
+                
+                # Only the lightweight metadata and storage handle stay in memory
+                if low_memory:
+                    article.release_bodies()
             
-            # Filter articles with content
-            articles_with_content = [a for a in scraped_articles if a.full_content]
-            self.error_handler.log_info(f"Successfully scraped content for {len(articles_with_content)} articles", "run")
+            self.content_scraper.scoreboard.save()
+            self.content_scraper.boilerplate_filter.save()
+            if self.deduplicator:
+                self.deduplicator.save_history()
             
-            if not articles_with_content:
+            self.error_handler.log_info(f"Successfully processed {len(translated_articles)} articles", "run")
+            if not translated_articles:
                 self.error_handler.log_warning("No articles with content to translate", "run")
-                # Still save the articles we have
-                self.file_manager.save_to_json(scraped_articles)
-                self.file_manager.save_to_text(scraped_articles)
                 return False
             
-            # Step 3: Translate articles
-            self.error_handler.log_info("Step 3: Translating articles...", "run")
-            translated_articles = self.translator.translate_multiple_articles(articles_with_content)
-            
-            # Step 4: Save results
-            self.error_handler.log_info("Step 4: Saving results...", "run")
-            
-            # Backup existing files
-            self.file_manager.backup_existing_files()
+            # Step 3: Save results, streaming the persisted articles back from disk
+            self.error_handler.log_info("Step 3: Saving results...", "run")
             
-            # Save to JSON
-            json_success = self.file_manager.save_to_json(translated_articles)
-            
-            # Save to text
-            text_success = self.file_manager.save_to_text(translated_articles)
+            with self.profiler.stage("save"):
+                # Save to JSON
+                json_success = self.file_manager.save_to_json(self.file_manager.iter_articles_jsonl())
+                
+                # Save to text
+                text_success = self.file_manager.save_to_text(self.file_manager.iter_articles_jsonl(),
+                                                              total=len(translated_articles))
+                
+                # Update the static site, rewriting only changed pages
+                site_result = None
+                if self.site_exporter:
+                    site_result = self.site_exporter.export(self.file_manager.iter_articles_jsonl())
             
             # Create summary report
-            translation_stats = self.translator.get_translation_stats(translated_articles)
+            translation_stats["cache_size"] = len(self.translator.translation_cache)
+            translation_stats["boilerplate"] = self.content_scraper.boilerplate_filter.get_stats()
+            translation_stats["quota"] = self.quota.get_stats()
+            translation_stats["network"] = NetworkErrorHandler.get_metrics()
+            translation_stats["network"].update(HttpClient.shared().get_summary())
+            for host, host_metrics in HttpClient.shared().get_metrics().items():
+                self.error_handler.log_info(f"  Connections to {host}: {host_metrics}", "run")
+            if self.profiler.enabled:
+                self.profiler.stop()
+                self.profiler.save()
+                translation_stats["profile"] = self.profiler.get_summary()
+                self.error_handler.log_info(f"Profile by stage:\n{self.profiler.format_summary(top_n=5)}", "run")
             report_success = self.file_manager.create_summary_report(translated_articles, translation_stats)
             
+            self._remember_processed(translated_articles)
+            checkpoint.complete()
+            
             # Log final results
             self.error_handler.log_info("Translation process completed!", "run")
             self.error_handler.log_info(f"Results:", "run")
@@ -93,15 +203,141 @@ class TamilNewsTranslator:
             self.error_handler.log_info(f"  - Articles with translated titles: {translation_stats['titles_translated']}", "run")
             self.error_handler.log_info(f"  - Articles with translated content: {translation_stats['content_translated']}", "run")
             self.error_handler.log_info(f"  - Fully translated articles: {translation_stats['fully_translated']}", "run")
+            self.error_handler.log_info(f"  - Boilerplate removed: {translation_stats['boilerplate']}", "run")
+            self.error_handler.log_info(f"  - Translation quota: {translation_stats['quota']}", "run")
+            self.error_handler.log_info(f"  - Network: {translation_stats['network']}", "run")
             self.error_handler.log_info(f"  - JSON saved: {json_success}", "run")
             self.error_handler.log_info(f"  - Text saved: {text_success}", "run")
+            self.error_handler.log_info(f"  - Static site: {site_result}", "run")
             self.error_handler.log_info(f"  - Report created: {report_success}", "run")
+            self.error_handler.log_info(f"  - Run id (for --resume): {checkpoint.run_id}", "run")
             
             return True
             
         except Exception as e:
             self.error_handler.log_error(e, "run")
             return False
+        
+        finally:
+            self.profiler.stop()
+    
+    def _process_article(self, article: NewsArticle, checkpoint: RunCheckpoint) -> Optional[NewsArticle]:
+        """Scrape, translate and persist one article, skipping stages the checkpoint shows as done"""
+        state = checkpoint.state(article)
+        if state == RunCheckpoint.FAILED:
+            return None
+        
+        if state == RunCheckpoint.TRANSLATED:
+            # Finished before the interruption; only the output stream needs it again
+            article = checkpoint.load_article(article)
+            article.storage_ref = self.file_manager.append_article(article)
+            return article
+        
+        if state == RunCheckpoint.SCRAPED:
+            article = checkpoint.load_article(article)
+        else:
+            with self.profiler.stage("scrape"):
+                self.content_scraper.scrape_article_content(article)
+            if not article.full_content:
+                checkpoint.record(article, RunCheckpoint.FAILED)
+                return None
+            checkpoint.record(article, RunCheckpoint.SCRAPED)
+        
+        # Near-duplicates of an already translated story reuse its body translation
+        with self.profiler.stage("dedup"):
+            source = self.deduplicator.find_source(article) if self.deduplicator else None
+        
+            # Copy the stored body translations first; any language they don't cover is translated below
+            if source and not self.deduplicator.apply_source(article, source):
+                self.error_handler.log_warning(
+                    f"Stored translations of {source['url']} unavailable, translating content", "run")
+        content_languages = [
+            language for language in self.translator.target_languages
+            if not article.translations.get(language, {}).get("content")
+        ]
+        
+        # Stop before starting a translation that would overrun today's quota; the article stays
+        # checkpointed as scraped so a resumed run can pick it up
+        estimate = self.translator.estimate_characters(article, content_languages=content_languages)
+        if not self.quota.can_afford(estimate):
+            self.error_handler.log_warning(
+                f"Article needs up to {estimate} characters, only {self.quota.remaining()} left in today's quota", "run")
+            self.quota_exhausted = True
+            return None
+        with self.profiler.stage("translate"):
+            self.translator.translate_article(article, content_languages=content_languages)
+        if not source and self.deduplicator:
+            self.deduplicator.remember(article)
+        
+        article.processed_at = datetime.now().isoformat()
+        checkpoint.record(article, RunCheckpoint.TRANSLATED)
+        article.storage_ref = self.file_manager.append_article(article)
+        return article
+    
+    def _accumulate_stats(self, totals: Optional[dict], article: NewsArticle) -> dict:
+        """Add one article's translation statistics to the running totals"""
+        stats = self.translator.get_translation_stats([article])
+        if totals is None:
+            return stats
+        
+        for key, value in stats.items():
+            if isinstance(value, dict):
+                for sub_key, sub_value in value.items():
+                    totals[key][sub_key] = totals[key].get(sub_key, 0) + sub_value
+            elif key != "cache_size":
+                totals[key] += value
+        return totals
+    
+    def _remember_processed(self, articles: List[NewsArticle]):
+        """Remember processed URLs, forgetting the oldest beyond the configured limit"""
+        for article in articles:
+            url = article.original_url or article.link
+            if url in self._processed_url_set:
+                continue
+            if len(self.processed_urls) == self.processed_urls.maxlen:
+                self._processed_url_set.discard(self.processed_urls[0])
+            self.processed_urls.append(url)
+            self._processed_url_set.add(url)
+    
+    def request_stop(self, signum=None, frame=None):
+        """Signal handler that asks the daemon loop to drain and exit"""
+        self.error_handler.log_warning(f"Received signal {signum}, draining in-flight articles", "daemon")
+        self.stop_event.set()
+    
+    def run_daemon(self, categories: List[str] = None, max_articles: int = None,
+                   interval_minutes: float = None, low_memory: bool = False) -> bool:
+        """Poll the configured categories on a schedule, reusing this instance between cycles"""
+        categories = self.scheduler.order_categories(categories or DAEMON_CONFIG["categories"])
+        interval = (interval_minutes or DAEMON_CONFIG["interval_minutes"]) * 60
+        
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+        
+        self.error_handler.log_info(f"Daemon started: categories={categories}, interval={interval}s", "daemon")
+        
+        cycle = 0
+        while not self.stop_event.is_set():
+            cycle += 1
+            cycle_start = time.time()
+            cpu_start = time.process_time()
+            
+            for category in categories:
+                if self.stop_event.is_set():
+                    break
+                self.run(category=category, max_articles=max_articles, low_memory=low_memory)
+            
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            self.error_handler.log_info(
+                f"Cycle {cycle} finished in {time.time() - cycle_start:.1f}s "
+                f"(cpu {time.process_time() - cpu_start:.1f}s, max RSS {usage.ru_maxrss} KB, "
+                f"translation cache {len(self.translator.translation_cache)})", "daemon")
+            
+            # Sleep with jitter; wakes immediately when a stop is requested
+            jitter = random.uniform(-DAEMON_CONFIG["jitter_seconds"], DAEMON_CONFIG["jitter_seconds"])
+            self.stop_event.wait(max(0.0, interval + jitter))
+        
+        self.error_handler.log_info("Daemon stopped", "daemon")
+        return True
     
     def run_interactive(self):
         """Run the translator in interactive mode"""
@@ -165,6 +401,8 @@ class TamilNewsTranslator:
                 print("\nOutput files:")
                 print(f"  - JSON: {FILE_PATHS['json_output']}")
                 print(f"  - Text: {FILE_PATHS['text_output']}")
+                if SITE_CONFIG["enabled"]:
+                    print(f"  - Static site: {SITE_CONFIG['directory']}/index.html")
                 print(f"  - Error log: {FILE_PATHS['error_log']}")
             else:
                 print("\n" + "="*60)
@@ -204,19 +442,79 @@ def main():
         action="store_true",
         help="Run in interactive mode"
     )
+    parser.add_argument(
+        "--languages",
+        nargs="+",
+        help="Target language codes to translate into (default from TRANSLATION_CONFIG)"
+    )
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="Drop article bodies from memory once they are saved (for large backfills)"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and poll categories on a schedule"
+    )
+    parser.add_argument(
+        "--categories",
+        nargs="+",
+        choices=list(GOOGLE_NEWS_URLS.keys()),
+        help="Categories to poll in daemon mode"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DAEMON_CONFIG["interval_minutes"],
+        help="Minutes between daemon polling cycles"
+    )
+    parser.add_argument(
+        "--extractor-stats",
+        action="store_true",
+        help="Show per-domain content extractor statistics and exit"
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Run the pipeline from the response archive without network access"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each pipeline stage and save the results under data/profiles/"
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume an interrupted run from its checkpoint, skipping finished articles"
+    )
     
     args = parser.parse_args()
     
+    if args.extractor_stats:
+        print(ExtractorScoreboard().format_table())
+        return
+    
     # Create translator instance
-    translator = TamilNewsTranslator()
+    translator = TamilNewsTranslator(replay=args.replay, target_languages=args.languages, profile=args.profile)
     
     if args.interactive:
         translator.run_interactive()
+    elif args.daemon:
+        translator.run_daemon(
+            categories=args.categories,
+            max_articles=args.max_articles,
+            interval_minutes=args.interval,
+            low_memory=args.low_memory
+        )
     else:
         success = translator.run(
             category=args.category,
             query=args.query,
-            max_articles=args.max_articles
+            max_articles=args.max_articles,
+            low_memory=args.low_memory,
+            resume_run_id=args.resume
         )
         
         if success:
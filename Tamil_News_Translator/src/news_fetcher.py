@@ -1,18 +1,29 @@
 
 import time
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
 from datetime import datetime
 
 import feedparser
 from googlenewsdecoder import gnewsdecoder
 
-from config import GOOGLE_NEWS_URLS, RATE_LIMIT_CONFIG, PROCESSING_LIMITS
+from archive import ResponseArchive
+from config import GOOGLE_NEWS_URLS, RATE_LIMIT_CONFIG, PROCESSING_LIMITS, RSS_PARSER_CONFIG, DAEMON_CONFIG
 from error_handler import ErrorHandler, NetworkErrorHandler, handle_exceptions, rate_limit
+from rss_parser import RSSParseError, iter_rss_items
 
 
 class NewsArticle:
     """Data class for news articles"""
     
+    # Fixed attribute set keeps per-article overhead small on large runs
+    __slots__ = (
+        "title", "link", "published", "description", "source", "original_url",
+        "full_content", "translated_title", "translated_content", "translations",
+        "fingerprint", "duplicate_of", "processed_at", "storage_ref"
+    )
+    
     def __init__(self, title: str, link: str, published: str, description: str, source: str = ""):
         self.title = title
         self.link = link
@@ -23,8 +34,19 @@ class NewsArticle:
         self.full_content = None
         self.translated_title = None
         self.translated_content = None
+        self.translations = {}  # language code -> {"title": ..., "content": ...}
+        self.fingerprint = None
+        self.duplicate_of = None
+        self.processed_at = None
+        self.storage_ref = None  # (file, offset) of the persisted record once saved
+        
+    def release_bodies(self):
+        """Drop the heavy text fields once the article has been persisted"""
+        self.full_content = None
+        self.translated_content = None
+        self.translations = {}
         
-    def to_dict(self) -> Dict:
+    def to_dict(self, processed_at: str = None) -> Dict:
         """Convert article to dictionary"""
         return {
             "title": self.title,
@@ -36,17 +58,45 @@ class NewsArticle:
             "full_content": self.full_content,
             "translated_title": self.translated_title,
             "translated_content": self.translated_content,
-            "processed_at": datetime.now().isoformat()
+            "translations": self.translations,
+            "duplicate_of": self.duplicate_of,
+            "processed_at": self.processed_at or processed_at or datetime.now().isoformat()
         }
+    
+    @classmethod
+    def from_dict(cls, article_dict: Dict) -> "NewsArticle":
+        """Rebuild an article from its dictionary form"""
+        article = cls(
+            title=article_dict.get("title", ""),
+            link=article_dict.get("link", ""),
+            published=article_dict.get("published", ""),
+            description=article_dict.get("description", ""),
+            source=article_dict.get("source", "")
+        )
+        
+        # Set additional attributes
+        article.original_url = article_dict.get("original_url")
+        article.full_content = article_dict.get("full_content")
+        article.translated_title = article_dict.get("translated_title")
+        article.translated_content = article_dict.get("translated_content")
+        article.translations = article_dict.get("translations") or {}
+        article.duplicate_of = article_dict.get("duplicate_of")
+        article.processed_at = article_dict.get("processed_at")
+        
+        return article
 
 
 class GoogleNewsFetcher:
     """Fetches news articles from Google News RSS feeds"""
     
-    def __init__(self):
+    def __init__(self, archive: Optional[ResponseArchive] = None):
         self.error_handler = ErrorHandler()
         self.network_handler = NetworkErrorHandler(self.error_handler)
         self.session = self.network_handler.create_session_with_retries()
+        self.archive = archive
+        
+        # Decoded Google News links, kept warm across daemon cycles; least recently used dropped first
+        self.decoded_urls: "OrderedDict[str, str]" = OrderedDict()
         
     @handle_exceptions("fetch_rss_feed")
     @rate_limit(calls_per_minute=RATE_LIMIT_CONFIG["requests_per_minute"])
@@ -55,8 +105,21 @@ class GoogleNewsFetcher:
         try:
             self.error_handler.log_info(f"Fetching RSS feed: {rss_url}", "fetch_rss_feed")
             
-            # Use feedparser to get the RSS feed
-            feed = feedparser.parse(rss_url)
+            if self.archive and self.archive.replay:
+                # Replay the archived feed instead of hitting the network
+                feed_content = self.archive.load(rss_url)
+                if feed_content is None:
+                    self.error_handler.log_warning(f"No archived feed for: {rss_url}", "fetch_rss_feed")
+                    return None
+            else:
+                response = self.network_handler.make_request(rss_url, self.session)
+                feed_content = response.content
+                if self.archive:
+                    self.archive.store(rss_url, feed_content, response.status_code,
+                                       response.headers.get("Content-Type", ""))
+            
+            # Use feedparser to parse the RSS feed
+            feed = feedparser.parse(feed_content)
             
             if feed.bozo:
                 self.error_handler.log_warning(f"RSS feed has parsing issues: {feed.bozo_exception}", "fetch_rss_feed")
@@ -66,7 +129,8 @@ class GoogleNewsFetcher:
                 return None
                 
             self.error_handler.log_info(f"Successfully fetched {len(feed.entries)} articles", "fetch_rss_feed")
-            time.sleep(RATE_LIMIT_CONFIG["google_news_delay"])
+            if not (self.archive and self.archive.replay):
+                time.sleep(RATE_LIMIT_CONFIG["google_news_delay"])
             
             return feed
             
@@ -74,17 +138,84 @@ class GoogleNewsFetcher:
             self.error_handler.log_error(e, "fetch_rss_feed")
             return None
     
+    def _feed_chunks(self, rss_url: str, body_parts: List[bytes]) -> Iterator[bytes]:
+        """Yield the feed body as it downloads, keeping the parts so the whole feed can be archived"""
+        if self.archive and self.archive.replay:
+            feed_content = self.archive.load(rss_url)
+            if feed_content is None:
+                self.error_handler.log_warning(f"No archived feed for: {rss_url}", "stream_rss_entries")
+                return
+            body_parts.append(feed_content)
+            yield feed_content
+            return
+        
+        response = self.network_handler.make_request(rss_url, self.session, stream=True)
+        if not response:
+            return
+        try:
+            for chunk in response.iter_content(chunk_size=RSS_PARSER_CONFIG["chunk_size"]):
+                body_parts.append(chunk)
+                yield chunk
+        finally:
+            response.close()
+        
+        if self.archive:
+            self.archive.store(rss_url, b"".join(body_parts), response.status_code,
+                               response.headers.get("Content-Type", ""))
+    
+    @rate_limit(calls_per_minute=RATE_LIMIT_CONFIG["requests_per_minute"])
+    def stream_rss_entries(self, rss_url: str) -> Iterator[Dict[str, str]]:
+        """Yield feed entries while the feed downloads, falling back to feedparser for malformed feeds"""
+        self.error_handler.log_info(f"Streaming RSS feed: {rss_url}", "stream_rss_entries")
+        
+        body_parts: List[bytes] = []
+        chunks = self._feed_chunks(rss_url, body_parts)
+        yielded = 0
+        
+        try:
+            try:
+                for entry in iter_rss_items(chunks):
+                    yielded += 1
+                    yield entry
+            except RSSParseError as e:
+                self.error_handler.log_warning(f"Streaming parse failed, using feedparser: {e}", "stream_rss_entries")
+                for _ in chunks:
+                    pass
+                feed = feedparser.parse(b"".join(body_parts))
+                # Entries already yielded before the error are not repeated
+                for entry in feed.entries[yielded:]:
+                    yielded += 1
+                    yield entry
+        finally:
+            # Finish the download even if the caller stopped early, so the archive holds the whole
+            # feed and the connection goes back to the pool
+            for _ in chunks:
+                pass
+        
+        self.error_handler.log_info(f"Streamed {yielded} entries", "stream_rss_entries")
+        if not (self.archive and self.archive.replay):
+            time.sleep(RATE_LIMIT_CONFIG["google_news_delay"])
+    
     @handle_exceptions("decode_google_news_url")
     def decode_google_news_url(self, google_url: str) -> Optional[str]:
         """Decode Google News URL to get original article URL"""
         try:
             self.error_handler.log_info(f"Decoding Google News URL", "decode_google_news_url")
             
+            archive_key = f"gnewsdecode:{google_url}"
+            if self.archive and self.archive.replay:
+                original_url = self.archive.load_text(archive_key)
+                if not original_url:
+                    self.error_handler.log_warning("No archived decode result", "decode_google_news_url")
+                return original_url
+            
             # Use googlenewsdecoder to get the original URL
             decoded_result = gnewsdecoder(google_url, interval=1)
             
             if decoded_result.get("status"):
                 original_url = decoded_result["decoded_url"]
+                if self.archive:
+                    self.archive.store(archive_key, original_url.encode("utf-8"), content_type="text/uri-list; charset=utf-8")
                 self.error_handler.log_info(f"Successfully decoded URL", "decode_google_news_url")
                 return original_url
             else:
@@ -95,50 +226,78 @@ class GoogleNewsFetcher:
             self.error_handler.log_error(e, f"decode_google_news_url: {google_url}")
             return None
     
+    def iter_articles(self, entries: Iterable[Dict]) -> Iterator[NewsArticle]:
+        """Turn feed entries into NewsArticle objects one at a time"""
+        for entry in islice(entries, PROCESSING_LIMITS["max_articles_per_run"]):
+            # Extract basic information
+            title = entry.get('title', 'No title')
+            link = entry.get('link', '')
+            published = entry.get('published', '')
+            description = entry.get('description', entry.get('summary', ''))
+            
+            # Extract source from title (Google News format: "Title - Source")
+            source = ""
+            if " - " in title:
+                title_parts = title.split(" - ")
+                if len(title_parts) > 1:
+                    title = " - ".join(title_parts[:-1])
+                    source = title_parts[-1]
+            
+            # Create NewsArticle object
+            article = NewsArticle(
+                title=title,
+                link=link,
+                published=published,
+                description=description,
+                source=source
+            )
+            
+            # Decode Google News URL to get original URL
+            if link:
+                original_url = self.decoded_urls.get(link)
+                if original_url is not None:
+                    self.decoded_urls.move_to_end(link)
+                else:
+                    original_url = self.decode_google_news_url(link)
+                    if original_url:
+                        self.decoded_urls[link] = original_url
+                        if len(self.decoded_urls) > DAEMON_CONFIG["decoded_url_memory"]:
+                            self.decoded_urls.popitem(last=False)
+                article.original_url = original_url or link
+            
+            yield article
+    
     @handle_exceptions("parse_rss_entries")
-    def parse_rss_entries(self, feed: feedparser.FeedParserDict) -> List[NewsArticle]:
-        """Parse RSS feed entries into NewsArticle objects"""
+    def parse_rss_entries(self, entries: Iterable[Dict]) -> List[NewsArticle]:
+        """Parse RSS feed entries (streamed or from feedparser) into NewsArticle objects"""
         articles = []
         
         try:
-            for entry in feed.entries[:PROCESSING_LIMITS["max_articles_per_run"]]:
-                # Extract basic information
-                title = entry.get('title', 'No title')
-                link = entry.get('link', '')
-                published = entry.get('published', '')
-                description = entry.get('description', entry.get('summary', ''))
-                
-                # Extract source from title (Google News format: "Title - Source")
-                source = ""
-                if " - " in title:
-                    title_parts = title.split(" - ")
-                    if len(title_parts) > 1:
-                        title = " - ".join(title_parts[:-1])
-                        source = title_parts[-1]
-                
-                # Create NewsArticle object
-                article = NewsArticle(
-                    title=title,
-                    link=link,
-                    published=published,
-                    description=description,
-                    source=source
-                )
-                
-                # Decode Google News URL to get original URL
-                if link:
-                    original_url = self.decode_google_news_url(link)
-                    article.original_url = original_url or link
-                
+            for article in self.iter_articles(entries):
                 articles.append(article)
-                
+            
             self.error_handler.log_info(f"Parsed {len(articles)} articles", "parse_rss_entries")
             
         except Exception as e:
             self.error_handler.log_error(e, "parse_rss_entries")
         
+        finally:
+            # Stop a streamed feed deterministically once enough entries were read
+            if hasattr(entries, "close"):
+                entries.close()
+        
         return articles
     
+    def _fetch_articles(self, rss_url: str) -> List[NewsArticle]:
+        """Fetch a feed and parse its entries, streaming unless disabled in RSS_PARSER_CONFIG"""
+        if RSS_PARSER_CONFIG["streaming"]:
+            return self.parse_rss_entries(self.stream_rss_entries(rss_url))
+        
+        feed = self.fetch_rss_feed(rss_url)
+        if not feed:
+            return []
+        return self.parse_rss_entries(feed.entries)
+    
     @handle_exceptions("fetch_news_by_category")
     def fetch_news_by_category(self, category: str = "top_stories") -> List[NewsArticle]:
         """Fetch news articles by category"""
@@ -150,13 +309,8 @@ class GoogleNewsFetcher:
             rss_url = GOOGLE_NEWS_URLS[category]
             self.error_handler.log_info(f"Fetching news for category: {category}", "fetch_news_by_category")
             
-            # Fetch RSS feed
-            feed = self.fetch_rss_feed(rss_url)
-            if not feed:
-                return []
-            
-            # Parse entries
-            articles = self.parse_rss_entries(feed)
+            # Fetch and parse the RSS feed
+            articles = self._fetch_articles(rss_url)
             
             self.error_handler.log_info(f"Successfully fetched {len(articles)} articles for category: {category}", "fetch_news_by_category")
             
@@ -175,13 +329,8 @@ class GoogleNewsFetcher:
             
             self.error_handler.log_info(f"Searching news for query: {query}", "fetch_news_by_query")
             
-            # Fetch RSS feed
-            feed = self.fetch_rss_feed(search_url)
-            if not feed:
-                return []
-            
-            # Parse entries
-            articles = self.parse_rss_entries(feed)
+            # Fetch and parse the RSS feed
+            articles = self._fetch_articles(search_url)
             
             self.error_handler.log_info(f"Successfully found {len(articles)} articles for query: {query}", "fetch_news_by_query")
             
@@ -0,0 +1,247 @@
+
+"""
+Pipeline profiler for Tamil News Translator
+Per-stage cProfile and sampled stack profiles, plus accounting of deliberate sleeps versus work
+"""
+
+import cProfile
+import functools
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import PROFILE_CONFIG
+from error_handler import ErrorHandler
+
+
+class PipelineProfiler:
+    """Profiles the named stages of a run; a disabled profiler costs nothing"""
+
+    def __init__(self, enabled: bool = False, directory: str = None):
+        self.enabled = enabled
+        self.error_handler = ErrorHandler()
+        self.directory = directory or PROFILE_CONFIG["directory"]
+        self.output_dir = None
+
+        # Stage and profile each thread is running in; worker threads join a stage through bind()
+        self._thread_stages: Dict[int, Tuple[str, Optional[cProfile.Profile]]] = {}
+        self._profiles: Dict[str, List[cProfile.Profile]] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._samples: Counter = Counter()
+        self._lock = threading.Lock()
+
+        self._real_sleep = time.sleep
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
+
+    def start(self):
+        """Start a fresh profile: reset stages, start the stack sampler and begin counting sleeps"""
+        if not self.enabled:
+            return
+
+        self.output_dir = os.path.join(self.directory, datetime.now().strftime('%Y%m%d_%H%M%S'))
+        self._thread_stages.clear()
+        self._profiles.clear()
+        self._timings.clear()
+        self._samples.clear()
+
+        # Every component sleeps through time.sleep, so wrapping it attributes sleeps to the current stage
+        time.sleep = self._counted_sleep
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="profile-sampler", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        """Stop sampling and restore time.sleep"""
+        if not self.enabled or self._sampler is None:
+            return
+
+        self._stop_sampling.set()
+        self._sampler.join()
+        self._sampler = None
+        time.sleep = self._real_sleep
+
+    @property
+    def current_stage(self) -> Optional[str]:
+        """Stage the calling thread is running in"""
+        entry = self._thread_stages.get(threading.get_ident())
+        return entry[0] if entry else None
+
+    @contextmanager
+    def stage(self, name: str):
+        """Attribute everything done inside the block to a pipeline stage"""
+        if not self.enabled:
+            yield
+            return
+
+        timing = self._timing(name)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            with self._run_in_stage(name):
+                yield
+        finally:
+            timing["wall"] += time.perf_counter() - wall_start
+            timing["cpu"] += time.process_time() - cpu_start
+
+    def bind(self, function: Callable) -> Callable:
+        """Wrap function so that, run on a worker thread, it is profiled as part of the caller's stage"""
+        stage = self.current_stage
+        if not self.enabled or not stage:
+            return function
+
+        @functools.wraps(function)
+        def run_in_stage(*args, **kwargs):
+            # Wall and cpu time are already counted by the thread that entered the stage
+            with self._run_in_stage(stage):
+                return function(*args, **kwargs)
+
+        return run_in_stage
+
+    @contextmanager
+    def _run_in_stage(self, name: str):
+        """Record the calling thread as running name, with its own profile for the duration"""
+        thread_id = threading.get_ident()
+        previous = self._thread_stages.get(thread_id)
+
+        # A cProfile.Profile only follows the thread that enabled it, so every entry gets its own
+        profile = cProfile.Profile()
+        if previous and previous[1] is not None:
+            previous[1].disable()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler already owns this interpreter (Python 3.12+); keep the stack samples only
+            profile = None
+        else:
+            with self._lock:
+                self._profiles.setdefault(name, []).append(profile)
+        self._thread_stages[thread_id] = (name, profile)
+
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            if previous:
+                self._thread_stages[thread_id] = previous
+                if previous[1] is not None:
+                    previous[1].enable()
+            else:
+                self._thread_stages.pop(thread_id, None)
+
+    def _timing(self, name: str) -> Dict[str, float]:
+        return self._timings.setdefault(name, {"wall": 0.0, "cpu": 0.0, "sleep": 0.0})
+
+    def _counted_sleep(self, seconds: float):
+        start = time.perf_counter()
+        self._real_sleep(seconds)
+        stage = self.current_stage
+        if stage:
+            with self._lock:
+                self._timing(stage)["sleep"] += time.perf_counter() - start
+
+    def _sample_loop(self):
+        """Periodically record the stack of every thread running a stage, rooted at that stage"""
+        interval = PROFILE_CONFIG["sample_interval"]
+
+        while not self._stop_sampling.wait(interval):
+            for thread_id, frame in sys._current_frames().items():
+                # Idle pool workers and the sampler itself are not running any stage
+                entry = self._thread_stages.get(thread_id)
+                if not entry:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.splitext(os.path.basename(code.co_filename))[0]}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(entry[0])
+                self._samples[";".join(reversed(stack))] += 1
+
+    def get_summary(self, top_n: int = None) -> Dict[str, Dict]:
+        """Per-stage wall, cpu and sleep seconds with the top functions by cumulative time"""
+        top_n = top_n or PROFILE_CONFIG["top_n"]
+        summary = {}
+
+        for name, timing in self._timings.items():
+            sleep = min(timing["sleep"], timing["wall"])
+            summary[name] = {
+                "wall": round(timing["wall"], 3),
+                "cpu": round(timing["cpu"], 3),
+                "sleep": round(sleep, 3),
+                "work": round(timing["wall"] - sleep, 3),
+                "top_functions": self._top_functions(name, top_n)
+            }
+
+        return summary
+
+    def _stage_stats(self, name: str) -> Optional[pstats.Stats]:
+        """Profiles of every thread that ran the stage, merged"""
+        with self._lock:
+            profiles = list(self._profiles.get(name, []))
+        if not profiles:
+            return None
+        return pstats.Stats(*profiles)
+
+    def _top_functions(self, name: str, top_n: int) -> List[str]:
+        stats = self._stage_stats(name)
+        if stats is None:
+            return []
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+
+        lines = []
+        for (filename, line, function), (_, calls, _, cumulative, _) in entries[:top_n]:
+            location = f"{os.path.basename(filename)}:{line}" if line else filename
+            lines.append(f"{cumulative:8.3f}s {calls:>7} calls  {function} ({location})")
+        return lines
+
+    def save(self) -> Optional[str]:
+        """Write per-stage .prof files, collapsed stacks for flamegraphs and a text summary"""
+        if not self.enabled or not self.output_dir or not self._timings:
+            return None
+
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+
+            for name in list(self._profiles):
+                stats = self._stage_stats(name)
+                if stats is not None:
+                    stats.dump_stats(os.path.join(self.output_dir, f"{name}.prof"))
+
+            # One "frame;frame;frame count" line per stack, as read by flamegraph.pl and speedscope
+            with open(os.path.join(self.output_dir, "samples.collapsed"), 'w', encoding='utf-8') as f:
+                for stack, count in sorted(self._samples.items()):
+                    f.write(f"{stack} {count}\n")
+
+            with open(os.path.join(self.output_dir, "summary.txt"), 'w', encoding='utf-8') as f:
+                f.write(self.format_summary())
+
+            self.error_handler.log_info(f"Profile saved to {self.output_dir}", "profiler")
+            return self.output_dir
+
+        except Exception as e:
+            self.error_handler.log_error(e, "profiler")
+            return None
+
+    def format_summary(self, top_n: int = None) -> str:
+        """Format the profile summary for logs and reports"""
+        lines = [f"{'Stage':<12} {'Wall':>9} {'Work':>9} {'Sleep':>9} {'CPU':>9}"]
+        summary = self.get_summary(top_n)
+
+        for name, stage in summary.items():
+            lines.append(f"{name:<12} {stage['wall']:>8.2f}s {stage['work']:>8.2f}s "
+                         f"{stage['sleep']:>8.2f}s {stage['cpu']:>8.2f}s")
+
+        for name, stage in summary.items():
+            lines.append("")
+            lines.append(f"Top functions in {name} (cumulative):")
+            lines.extend(f"  {line}" for line in stage["top_functions"])
+
+        return "\n".join(lines) + "\n"
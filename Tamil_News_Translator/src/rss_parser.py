@@ -0,0 +1,54 @@
+
+"""
+Streaming RSS parser for Tamil News Translator
+Yields feed items one at a time as the XML arrives, reading only the fields the pipeline uses
+"""
+
+from typing import Dict, Iterable, Iterator
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+class RSSParseError(Exception):
+    """Raised when a feed is not well-formed enough to stream; callers fall back to feedparser"""
+
+
+# Child elements of <item> that are kept; everything else is skipped without building a dict entry
+ITEM_FIELDS = {"title": "title", "link": "link", "pubDate": "published", "description": "description"}
+
+
+def iter_rss_items(chunks: Iterable[bytes]) -> Iterator[Dict[str, str]]:
+    """Incrementally parse RSS 2.0 bytes, yielding {title, link, published, description} per <item>"""
+    if etree is None:
+        raise RSSParseError("lxml is not installed")
+
+    # XMLPullParser is lxml's feed-driven form of iterparse: it accepts bytes as they are downloaded
+    parser = etree.XMLPullParser(events=("end",), tag="item", resolve_entities=False, no_network=True)
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from _drain(parser)
+        parser.close()
+        yield from _drain(parser)
+    except etree.XMLSyntaxError as e:
+        raise RSSParseError(str(e)) from e
+
+
+def _drain(parser: "etree.XMLPullParser") -> Iterator[Dict[str, str]]:
+    for _, item in parser.read_events():
+        entry = {}
+        for child in item:
+            field = ITEM_FIELDS.get(child.tag)
+            if field:
+                entry[field] = (child.text or "").strip()
+
+        # Free the parsed item and any earlier siblings so memory stays flat on large feeds
+        item.clear()
+        parent = item.getparent()
+        if parent is not None:
+            while item.getprevious() is not None:
+                del parent[0]
+
+        yield entry
@@ -0,0 +1,132 @@
+
+"""
+Work scheduling for Tamil News Translator
+Orders articles by priority and tracks the daily translation character quota
+"""
+
+import json
+import math
+import os
+import threading
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional
+
+from config import SCHEDULER_CONFIG, QUOTA_CONFIG
+from error_handler import ErrorHandler
+from news_fetcher import NewsArticle
+
+
+class PriorityScheduler:
+    """Orders articles so the most valuable ones are processed first"""
+
+    def __init__(self):
+        self.error_handler = ErrorHandler()
+
+    def category_weight(self, category: Optional[str]) -> float:
+        """Configured weight of a category; queries and unknown categories get 1.0"""
+        return SCHEDULER_CONFIG["category_weights"].get(category, 1.0)
+
+    def source_weight(self, source: Optional[str]) -> float:
+        """Configured weight of a news source"""
+        return SCHEDULER_CONFIG["source_weights"].get(source or "", SCHEDULER_CONFIG["default_source_weight"])
+
+    def age_hours(self, article: NewsArticle, now: datetime) -> float:
+        """Hours since publication; undated stories count as one half-life old"""
+        try:
+            published = parsedate_to_datetime(article.published)
+            if published.tzinfo is None:
+                published = published.replace(tzinfo=timezone.utc)
+            return max(0.0, (now - published).total_seconds() / 3600)
+        except (TypeError, ValueError):
+            return SCHEDULER_CONFIG["recency_half_life_hours"]
+
+    def score(self, article: NewsArticle, category: Optional[str] = None, now: datetime = None) -> float:
+        """Log priority of an article: recency (halving every half-life) x category weight x source weight"""
+        now = now or datetime.now(timezone.utc)
+
+        # Summed in log space so week-old stories still compare instead of all underflowing to zero
+        recency = -math.log(2) * self.age_hours(article, now) / SCHEDULER_CONFIG["recency_half_life_hours"]
+        weight = self.category_weight(category) * self.source_weight(article.source)
+        return recency + math.log(weight) if weight > 0 else float("-inf")
+
+    def order(self, articles: List[NewsArticle], category: Optional[str] = None) -> List[NewsArticle]:
+        """Sort articles by descending priority; ties keep feed order"""
+        now = datetime.now(timezone.utc)
+        return sorted(articles, key=lambda article: -self.score(article, category, now))
+
+    def order_categories(self, categories: List[str]) -> List[str]:
+        """Sort categories by descending weight so the most important ones use the quota first"""
+        return sorted(categories, key=lambda category: -self.category_weight(category))
+
+
+class TranslationQuota:
+    """Daily budget of characters sent to the translation provider, persisted across runs"""
+
+    def __init__(self, state_file: str = None, daily_limit: int = None):
+        self.error_handler = ErrorHandler()
+        self.state_file = state_file or QUOTA_CONFIG["state_file"]
+        self.daily_limit = daily_limit if daily_limit is not None else QUOTA_CONFIG["daily_char_limit"]
+        self._lock = threading.Lock()
+
+        self.day = date.today().isoformat()
+        self.used = 0
+        self._load()
+
+    def _load(self):
+        """Load today's usage; usage from earlier days is discarded"""
+        if not os.path.exists(self.state_file):
+            return
+
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get("date") == self.day:
+                self.used = state.get("chars", 0)
+        except (OSError, ValueError) as e:
+            self.error_handler.log_warning(f"Could not load translation quota state: {e}", "quota")
+
+    def _roll_over(self):
+        today = date.today().isoformat()
+        if today != self.day:
+            self.day = today
+            self.used = 0
+
+    @property
+    def unlimited(self) -> bool:
+        return not self.daily_limit
+
+    def remaining(self) -> Optional[int]:
+        """Characters left today, or None without a limit"""
+        if self.unlimited:
+            return None
+        with self._lock:
+            self._roll_over()
+            return max(0, self.daily_limit - self.used)
+
+    def can_afford(self, chars: int) -> bool:
+        """Check whether a translation of this many characters fits in what is left today"""
+        remaining = self.remaining()
+        return remaining is None or chars <= remaining
+
+    def consume(self, chars: int):
+        """Record characters sent to the provider"""
+        with self._lock:
+            self._roll_over()
+            self.used += chars
+
+    def save(self) -> bool:
+        """Persist today's usage"""
+        try:
+            with self._lock:
+                tmp_file = f"{self.state_file}.tmp"
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump({"date": self.day, "chars": self.used, "limit": self.daily_limit}, f)
+                os.replace(tmp_file, self.state_file)
+            return True
+        except OSError as e:
+            self.error_handler.log_error(e, "quota")
+            return False
+
+    def get_stats(self) -> dict:
+        return {"date": self.day, "used": self.used, "limit": self.daily_limit, "remaining": self.remaining()}
@@ -0,0 +1,237 @@
+
+"""
+Static site exporter for Tamil News Translator
+Renders translated articles to HTML pages with paginated indexes, precompressed for static serving
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from html import escape
+from typing import Dict, Iterable, List, Tuple
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from config import SITE_CONFIG
+from error_handler import ErrorHandler, handle_exceptions
+from news_fetcher import NewsArticle
+
+
+class StaticSiteExporter:
+    """Incrementally builds a static HTML site from translated articles"""
+
+    def __init__(self, directory: str = None):
+        self.error_handler = ErrorHandler()
+        self.directory = directory or SITE_CONFIG["directory"]
+        self.manifest_file = os.path.join(self.directory, "manifest.json")
+
+        # "articles": slug -> listing metadata and content hash; "pages": relative path -> page hash
+        self.manifest: Dict[str, Dict] = {"articles": {}, "pages": {}}
+        self._load_manifest()
+
+    def _load_manifest(self):
+        """Load the hashes of the previous build"""
+        if not os.path.exists(self.manifest_file):
+            return
+
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            self.error_handler.log_warning(f"Could not load site manifest, rebuilding: {e}", "site_exporter")
+
+    @staticmethod
+    def _slug(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def _source_slug(source: str) -> str:
+        slug = re.sub(r"[^a-z0-9]+", "-", (source or "unknown").lower()).strip("-")
+        return slug or StaticSiteExporter._slug(source)
+
+    @staticmethod
+    def _article_date(article: NewsArticle) -> str:
+        try:
+            return parsedate_to_datetime(article.published).strftime('%Y-%m-%d')
+        except (TypeError, ValueError):
+            return (article.processed_at or datetime.now().isoformat())[:10]
+
+    @staticmethod
+    def _content_hash(article: NewsArticle) -> str:
+        article_dict = article.to_dict()
+        article_dict.pop("processed_at", None)
+        return hashlib.sha256(json.dumps(article_dict, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    @handle_exceptions("export_site")
+    def export(self, articles: Iterable[NewsArticle]) -> Dict[str, int]:
+        """Add articles to the site, rewriting only pages whose content changed"""
+        written = 0
+        unchanged = 0
+        changed = False
+
+        # Article pages: only rendered when the article is new or its content hash differs
+        for article in articles:
+            url = article.original_url or article.link
+            slug = self._slug(url)
+            content_hash = self._content_hash(article)
+
+            entry = self.manifest["articles"].get(slug)
+            if entry and entry["hash"] == content_hash:
+                unchanged += 1
+                continue
+
+            changed = True
+            self.manifest["articles"][slug] = {
+                "hash": content_hash,
+                "title": article.translated_title or article.title,
+                "original_title": article.title,
+                "source": article.source,
+                "date": self._article_date(article),
+                "published": article.published
+            }
+            written += self._write_page(f"articles/{slug}.html", self._render_article(article))
+
+        # Index pages are cheap to render; they are only written when their listing changed
+        for path, html in self._render_indexes():
+            written += self._write_page(path, html)
+
+        if changed or written:
+            self._save_manifest()
+        self.error_handler.log_info(
+            f"Static site updated in {self.directory}: {written} pages written, {unchanged} articles unchanged",
+            "site_exporter")
+        return {"pages_written": written, "articles_unchanged": unchanged,
+                "articles_total": len(self.manifest["articles"])}
+
+    def _write_page(self, path: str, html: str) -> int:
+        """Write a page and its precompressed copies unless identical to the last build"""
+        data = html.encode('utf-8')
+        page_hash = hashlib.sha256(data).hexdigest()
+        full_path = os.path.join(self.directory, path)
+
+        if self.manifest["pages"].get(path) == page_hash and os.path.exists(full_path):
+            return 0
+
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        self._atomic_write(full_path, data)
+
+        # mtime=0 keeps the gzip output identical for identical pages
+        self._atomic_write(f"{full_path}.gz", gzip.compress(data, compresslevel=SITE_CONFIG["gzip_level"], mtime=0))
+        if brotli is not None:
+            self._atomic_write(f"{full_path}.br", brotli.compress(data, quality=SITE_CONFIG["brotli_quality"]))
+
+        self.manifest["pages"][path] = page_hash
+        return 1
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _save_manifest(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._atomic_write(self.manifest_file,
+                           json.dumps(self.manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    def _render_indexes(self) -> List[Tuple[str, str]]:
+        """Render the front page, per-date and per-source listings, newest first"""
+        entries = sorted(self.manifest["articles"].items(),
+                         key=lambda item: (item[1]["date"], item[1]["published"] or ""), reverse=True)
+
+        by_date: Dict[str, List] = {}
+        by_source: Dict[str, List] = {}
+        for slug, entry in entries:
+            by_date.setdefault(entry["date"], []).append((slug, entry))
+            by_source.setdefault(self._source_slug(entry["source"]), []).append((slug, entry))
+
+        pages = self._paginate("", SITE_CONFIG["site_title"], entries, depth=0)
+        pages += self._paginate("dates/", "தேதிகள் / Dates",
+                                [(date, {"title": date, "count": len(items)}) for date, items in by_date.items()],
+                                depth=1, link_prefix="")
+        pages += self._paginate("sources/", "மூலங்கள் / Sources",
+                                [(source, {"title": items[0][1]["source"], "count": len(items)})
+                                 for source, items in sorted(by_source.items())],
+                                depth=1, link_prefix="")
+
+        for date, items in by_date.items():
+            pages += self._paginate(f"dates/{date}/", date, items, depth=2)
+        for source, items in by_source.items():
+            pages += self._paginate(f"sources/{source}/", items[0][1]["source"], items, depth=2)
+
+        return pages
+
+    def _paginate(self, prefix: str, title: str, items: List[Tuple[str, Dict]], depth: int,
+                  link_prefix: str = None) -> List[Tuple[str, str]]:
+        """Split a listing into index.html, page-2.html, ... under a directory"""
+        page_size = SITE_CONFIG["page_size"]
+        page_count = max(1, -(-len(items) // page_size))
+        pages = []
+
+        for number in range(1, page_count + 1):
+            chunk = items[(number - 1) * page_size:number * page_size]
+            name = "index.html" if number == 1 else f"page-{number}.html"
+            pages.append((f"{prefix}{name}",
+                          self._render_listing(title, chunk, number, page_count, depth, link_prefix)))
+
+        return pages
+
+    def _render_listing(self, title: str, items: List[Tuple[str, Dict]], number: int, page_count: int,
+                        depth: int, link_prefix: str = None) -> str:
+        root = "../" * depth
+        rows = []
+        for key, entry in items:
+            if link_prefix is None:
+                href = f"{root}articles/{key}.html"
+                meta = f"{escape(entry['source'] or '')} · {entry['date']}"
+            else:
+                href = f"{link_prefix}{key}/index.html"
+                meta = f"{entry['count']} articles"
+            rows.append(f'<li><a href="{href}">{escape(entry["title"] or "")}</a> <small>{meta}</small></li>')
+
+        nav = []
+        if number > 1:
+            nav.append(f'<a href="{"index.html" if number == 2 else f"page-{number - 1}.html"}">&larr;</a>')
+        if number < page_count:
+            nav.append(f'<a href="page-{number + 1}.html">&rarr;</a>')
+        if page_count > 1:
+            nav.append(f"<span>{number} / {page_count}</span>")
+
+        body = f"<ul>\n{chr(10).join(rows)}\n</ul>\n<nav>{' '.join(nav)}</nav>"
+        return self._layout(title, body, root)
+
+    def _render_article(self, article: NewsArticle) -> str:
+        title = article.translated_title or article.title or ""
+        content = article.translated_content or article.full_content or ""
+        paragraphs = "\n".join(f"<p>{escape(p.strip())}</p>" for p in content.split("\n") if p.strip())
+        date = self._article_date(article)
+        source = article.source or ""
+
+        body = (
+            f"<article>\n<h1>{escape(title)}</h1>\n"
+            f'<p><small><a href="../sources/{self._source_slug(source)}/index.html">{escape(source)}</a> · '
+            f'<a href="../dates/{date}/index.html">{date}</a></small></p>\n'
+            f"<p><em>{escape(article.title or '')}</em></p>\n"
+            f"{paragraphs}\n"
+            f'<p><a href="{escape(article.original_url or article.link or "", quote=True)}">மூலக் கட்டுரை / Original article</a></p>\n'
+            f"</article>"
+        )
+        return self._layout(title, body, "../")
+
+    def _layout(self, title: str, body: str, root: str) -> str:
+        return (
+            "<!DOCTYPE html>\n"
+            f'<html lang="{SITE_CONFIG["language"]}">\n<head>\n<meta charset="utf-8">\n'
+            '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+            f"<title>{escape(title)}</title>\n</head>\n<body>\n"
+            f'<header><a href="{root}index.html">{escape(SITE_CONFIG["site_title"])}</a> · '
+            f'<a href="{root}dates/index.html">Dates</a> · <a href="{root}sources/index.html">Sources</a></header>\n'
+            f"<main>\n{body}\n</main>\n</body>\n</html>\n"
+        )
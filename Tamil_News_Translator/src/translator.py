@@ -4,63 +4,109 @@ Updated Translator module for Tamil News Translator
 Handles translation of text from English to Tamil using deep-translator (more reliable)
 """
 
+import hashlib
 import time
-from typing import Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, List
 import re
+import sys
 
 from deep_translator import GoogleTranslator
 
-from config import TRANSLATION_CONFIG, RATE_LIMIT_CONFIG, PROCESSING_LIMITS
+from archive import ResponseArchive
+from config import TRANSLATION_CONFIG, RATE_LIMIT_CONFIG, PROCESSING_LIMITS, ARCHIVE_CONFIG
 from error_handler import ErrorHandler, TranslationErrorHandler, handle_exceptions, rate_limit
 from news_fetcher import NewsArticle
+from profiler import PipelineProfiler
+from scheduler import TranslationQuota
 
 
 class TamilTranslator:
-    """Translates text from English to Tamil using deep-translator library"""
+    """Translates text from English to Tamil (and other configured languages) using deep-translator library"""
     
-    def __init__(self):
+    def __init__(self, archive: Optional[ResponseArchive] = None, target_languages: List[str] = None,
+                 quota: Optional[TranslationQuota] = None, profiler: Optional[PipelineProfiler] = None):
         self.error_handler = ErrorHandler()
+        self.quota = quota
+        self.profiler = profiler
         self.translation_error_handler = TranslationErrorHandler(self.error_handler)
+        self.archive = archive if ARCHIVE_CONFIG["archive_translations"] else None
         
-        # Initialize Google Translator with deep-translator (more reliable)
-        self.translator = GoogleTranslator(
-            source=TRANSLATION_CONFIG["source_language"],
-            target=TRANSLATION_CONFIG["target_language"]
-        )
+        # The primary language fills translated_title/translated_content; the rest go to article.translations
+        self.primary_language = TRANSLATION_CONFIG["target_language"]
+        self.target_languages = list(target_languages or TRANSLATION_CONFIG["target_languages"])
+        if self.primary_language not in self.target_languages:
+            self.primary_language = self.target_languages[0]
         
-        # Translation cache to avoid duplicate translations
-        self.translation_cache = {}
+        # Initialize one Google Translator per target language with deep-translator (more reliable)
+        self.translators = {
+            language: GoogleTranslator(source=TRANSLATION_CONFIG["source_language"], target=language)
+            for language in self.target_languages
+        }
+        self.translator = self.translators[self.primary_language]
+        
+        # Conservative rate limiting for translation, applied per language so languages run in parallel
+        self._translate_calls = {
+            language: rate_limit(calls_per_minute=20)(translator.translate)
+            for language, translator in self.translators.items()
+        }
+        
+        # Per-language translation caches to avoid duplicate translations
+        self.translation_caches: Dict[str, Dict[str, str]] = {language: {} for language in self.target_languages}
+        self.translation_cache = self.translation_caches[self.primary_language]
+        self.translation_cache_bytes: Dict[str, int] = {language: 0 for language in self.target_languages}
+        
+        self.executor = ThreadPoolExecutor(max_workers=len(self.target_languages),
+                                           thread_name_prefix="translate")
     
     @handle_exceptions("translate_text")
-    @rate_limit(calls_per_minute=20)  # Conservative rate limiting for translation
-    def translate_text(self, text: str, max_retries: int = 3) -> Optional[str]:
-        """Translate text from English to Tamil"""
+    def translate_text(self, text: str, max_retries: int = 3, target_language: str = None) -> Optional[str]:
+        """Translate text from English to Tamil or another target language"""
         if not text or not text.strip():
             return None
         
+        target_language = target_language or self.primary_language
+        translation_cache = self.translation_caches[target_language]
+        
         # Clean the text
         text = text.strip()
         
         # Check cache first
         text_key = text[:100]  # Use first 100 chars as key
-        if text_key in self.translation_cache:
+        if text_key in translation_cache:
             self.error_handler.log_info("Using cached translation", "translate_text")
-            return self.translation_cache[text_key]
+            return translation_cache[text_key]
         
         # Split text if it's too long
         if len(text) > PROCESSING_LIMITS["max_article_length"]:
-            return self._translate_long_text(text, max_retries)
+            return self._translate_long_text(text, max_retries, target_language)
+        
+        # Archived translations are keyed by a digest of the full source text
+        archive_key = self._archive_key(text, target_language)
+        if self.archive:
+            archived = self.archive.load_text(archive_key)
+            if archived:
+                self._cache_put(target_language, text_key, archived)
+                return archived
+            if self.archive.replay and not ARCHIVE_CONFIG["replay_live_translation"]:
+                self.error_handler.log_warning("No archived translation, skipping in replay mode", "translate_text")
+                return None
         
         for attempt in range(max_retries):
             try:
-                self.error_handler.log_info(f"Translating text (attempt {attempt + 1}): {text[:50]}...", "translate_text")
+                self.error_handler.log_info(f"Translating text to {target_language} (attempt {attempt + 1}): {text[:50]}...", "translate_text")
                 
                 # Perform translation using deep-translator
-                translated_text = self.translator.translate(text)
+                translated_text = self._translate_calls[target_language](text)
+                if self.quota:
+                    self.quota.consume(len(text))
                 
                 if translated_text and translated_text.strip():
                     # Cache the translation
-                    self.translation_cache[text_key] = translated_text
+                    self._cache_put(target_language, text_key, translated_text)
+                    if self.archive:
+                        self.archive.store(archive_key, translated_text.encode("utf-8"),
+                                           content_type="text/plain; charset=utf-8")
                     
                     self.error_handler.log_info(f"Translation successful: {translated_text[:50]}...", "translate_text")
                     
@@ -91,8 +137,40 @@ class TamilTranslator:
         
         return None
     
+    def estimate_characters(self, article: NewsArticle, include_content: bool = True,
+                            content_languages: List[str] = None) -> int:
+        """Upper bound of characters an article would send to the provider across all target languages"""
+        chars = len(article.title or "") * len(self.target_languages)
+        if include_content and article.full_content:
+            chars += len(article.full_content) * len(self._content_languages(content_languages))
+        return chars
+    
+    def _content_languages(self, content_languages: List[str] = None) -> List[str]:
+        """Target languages whose content gets translated; all of them unless narrowed down"""
+        if content_languages is None:
+            return self.target_languages
+        return [language for language in self.target_languages if language in content_languages]
+    
+    def _cache_put(self, target_language: str, key: str, value: str):
+        """Insert into a language's translation cache, evicting the oldest entries past its byte budget"""
+        cache = self.translation_caches[target_language]
+        if key in cache:
+            self.translation_cache_bytes[target_language] -= sys.getsizeof(key) + sys.getsizeof(cache.pop(key))
+        cache[key] = value
+        self.translation_cache_bytes[target_language] += sys.getsizeof(key) + sys.getsizeof(value)
+        
+        # Cached values are whole article bodies, so the budget is in bytes rather than entries
+        while self.translation_cache_bytes[target_language] > PROCESSING_LIMITS["translation_cache_bytes"] and cache:
+            oldest = next(iter(cache))
+            self.translation_cache_bytes[target_language] -= sys.getsizeof(oldest) + sys.getsizeof(cache.pop(oldest))
+    
+    def _archive_key(self, text: str, target_language: str) -> str:
+        """Build the archive key for a translation request"""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"translate:{TRANSLATION_CONFIG['source_language']}-{target_language}:{digest}"
+    
     @handle_exceptions("_translate_long_text")
-    def _translate_long_text(self, text: str, max_retries: int = 3) -> Optional[str]:
+    def _translate_long_text(self, text: str, max_retries: int = 3, target_language: str = None) -> Optional[str]:
         """Translate long text by splitting into chunks"""
         try:
             self.error_handler.log_info(f"Translating long text ({len(text)} chars)", "_translate_long_text")
@@ -108,7 +186,7 @@ class TamilTranslator:
                 if len(current_chunk) + len(sentence) > PROCESSING_LIMITS["chunk_size"]:
                     if current_chunk:
                         # Translate current chunk
-                        translated_chunk = self.translate_text(current_chunk.strip(), max_retries)
+                        translated_chunk = self.translate_text(current_chunk.strip(), max_retries, target_language)
                         if translated_chunk:
                             translated_chunks.append(translated_chunk)
                         
@@ -121,7 +199,7 @@ class TamilTranslator:
             
             # Translate remaining chunk
             if current_chunk.strip():
-                translated_chunk = self.translate_text(current_chunk.strip(), max_retries)
+                translated_chunk = self.translate_text(current_chunk.strip(), max_retries, target_language)
                 if translated_chunk:
                     translated_chunks.append(translated_chunk)
             
@@ -177,35 +255,63 @@ class TamilTranslator:
             self.error_handler.log_error(e, "detect_language")
             return "en"  # Default to English
     
+    def _translate_article_language(self, article: NewsArticle, language: str, include_content: bool) -> Dict[str, Optional[str]]:
+        """Translate title and content of an article into one language"""
+        result = {"title": None, "content": None}
+        
+        # Translate title
+        if article.title:
+            self.error_handler.log_info(f"Translating title to {language}...", "translate_article")
+            result["title"] = self.translate_text(article.title, target_language=language)
+            if result["title"]:
+                self.error_handler.log_info(f"Title translation successful: {result['title'][:50]}...", "translate_article")
+            else:
+                self.error_handler.log_warning(f"Title translation to {language} failed", "translate_article")
+        
+        # Translate content
+        if not include_content:
+            self.error_handler.log_info("Skipping content translation", "translate_article")
+        elif article.full_content:
+            self.error_handler.log_info(f"Translating content to {language}...", "translate_article")
+            
+            # Always translate content (don't worry about language detection for now)
+            result["content"] = self.translate_text(article.full_content, target_language=language)
+            if result["content"]:
+                self.error_handler.log_info(f"Content translation successful ({len(result['content'])} chars)", "translate_article")
+            else:
+                self.error_handler.log_warning(f"Content translation to {language} failed", "translate_article")
+        else:
+            self.error_handler.log_warning("No content to translate", "translate_article")
+        
+        return result
+    
     @handle_exceptions("translate_article")
-    def translate_article(self, article: NewsArticle) -> NewsArticle:
-        """Translate both title and content of a news article"""
+    def translate_article(self, article: NewsArticle, include_content: bool = True,
+                          content_languages: List[str] = None) -> NewsArticle:
+        """Translate title and content of a news article into every target language concurrently; content only into content_languages when given"""
         try:
             self.error_handler.log_info(f"Translating article: {article.title[:50]}...", "translate_article")
             
-            # Translate title
-            if article.title:
-                self.error_handler.log_info("Translating title...", "translate_article")
-                translated_title = self.translate_text(article.title)
-                if translated_title:
-                    article.translated_title = translated_title
-                    self.error_handler.log_info(f"Title translation successful: {translated_title[:50]}...", "translate_article")
-                else:
-                    self.error_handler.log_warning("Title translation failed", "translate_article")
+            # Workers run in the caller's profiler stage, so their time shows up under "translate"
+            translate_language = self._translate_article_language
+            if self.profiler:
+                translate_language = self.profiler.bind(translate_language)
+            languages_with_content = self._content_languages(content_languages)
+            futures = {
+                language: self.executor.submit(translate_language, article, language,
+                                               include_content and language in languages_with_content)
+                for language in self.target_languages
+            }
             
-            # Translate content
-            if article.full_content:
-                self.error_handler.log_info("Translating content...", "translate_article")
-                
-                # Always translate content (don't worry about language detection for now)
-                translated_content = self.translate_text(article.full_content)
-                if translated_content:
-                    article.translated_content = translated_content
-                    self.error_handler.log_info(f"Content translation successful ({len(translated_content)} chars)", "translate_article")
-                else:
-                    self.error_handler.log_warning("Content translation failed", "translate_article")
-            else:
-                self.error_handler.log_warning("No content to translate", "translate_article")
+            for language, future in futures.items():
+                result = future.result()
+                translation = article.translations.setdefault(language, {"title": None, "content": None})
+                translation["title"] = result["title"] or translation["title"]
+                translation["content"] = result["content"] or translation["content"]
+            
+            primary = article.translations[self.primary_language]
+            article.translated_title = primary["title"] or article.translated_title
+            article.translated_content = primary["content"] or article.translated_content
             
             return article
             
@@ -214,7 +320,7 @@ class TamilTranslator:
             return article
     
     @handle_exceptions("translate_multiple_articles")
-    def translate_multiple_articles(self, articles: List[NewsArticle]) -> List[NewsArticle]:
+    def translate_multiple_articles(self, articles: List[NewsArticle], include_content: bool = True) -> List[NewsArticle]:
         """Translate multiple articles with progress tracking"""
         translated_articles = []
         total_articles = len(articles)
@@ -226,7 +332,7 @@ class TamilTranslator:
                 self.error_handler.log_info(f"Translating article {i}/{total_articles}", "translate_multiple_articles")
                 
                 # Translate the article
-                translated_article = self.translate_article(article)
+                translated_article = self.translate_article(article, include_content)
                 translated_articles.append(translated_article)
                 
                 # Progress update
@@ -254,7 +360,11 @@ class TamilTranslator:
             "titles_translated": sum(1 for a in articles if a.translated_title),
             "content_translated": sum(1 for a in articles if a.translated_content),
             "fully_translated": sum(1 for a in articles if a.translated_title and a.translated_content),
-            "cache_size": len(self.translation_cache)
+            "cache_size": len(self.translation_cache),
+            "languages": {
+                language: sum(1 for a in articles if a.translations.get(language, {}).get("content"))
+                for language in self.target_languages
+            }
         }
         
         return stats
@@ -0,0 +1,94 @@
+"""
+Unit tests for the raw response archive
+
+Run from the Tamil_News_Translator directory:
+    python -m unittest test_archive
+"""
+
+import os
+import tempfile
+import unittest
+
+import test_support
+
+from archive import ResponseArchive
+
+FEED_URL = "https://news.google.com/rss?hl=en-IN"
+
+
+class ResponseArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory(dir=test_support.WORK_DIR)
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.archive = ResponseArchive(directory=self.tmp_dir.name)
+
+    def object_files(self):
+        return [name for _, _, files in os.walk(self.archive.objects_dir) for name in files]
+
+    def test_store_and_load_round_trip(self):
+        digest = self.archive.store(FEED_URL, b"<rss>feed</rss>", 200, "application/rss+xml")
+
+        self.assertEqual(self.archive.load(FEED_URL), b"<rss>feed</rss>")
+        record = self.archive.lookup(FEED_URL)
+        self.assertEqual(record["sha256"], digest)
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["length"], len(b"<rss>feed</rss>"))
+        self.assertIsNone(self.archive.load("https://example.com/missing"))
+
+    def test_identical_bodies_are_stored_once(self):
+        self.archive.store("https://example.com/a", b"same body")
+        self.archive.store("https://example.com/b", b"same body")
+        self.archive.store("https://example.com/a", b"same body")
+
+        self.assertEqual(len(self.object_files()), 1)
+        self.assertEqual(len(self.archive.records("https://example.com/a")), 2)
+        self.assertEqual(len(self.archive), 2)
+
+    def test_lookup_as_of_returns_version_at_that_time(self):
+        self.archive.store(FEED_URL, b"morning", fetched_at="2024-05-02T08:00:00")
+        self.archive.store(FEED_URL, b"evening", fetched_at="2024-05-02T18:00:00")
+
+        self.assertEqual(self.archive.load(FEED_URL), b"evening")
+        self.assertEqual(self.archive.load(FEED_URL, as_of="2024-05-02T12:00:00"), b"morning")
+        self.assertIsNone(self.archive.load(FEED_URL, as_of="2024-05-01T00:00:00"))
+
+    def test_index_is_reloaded_in_fetch_order(self):
+        self.archive.store(FEED_URL, b"later", fetched_at="2024-05-02T18:00:00")
+        self.archive.store(FEED_URL, b"earlier", fetched_at="2024-05-02T08:00:00")
+
+        reopened = ResponseArchive(directory=self.tmp_dir.name, replay=True)
+        self.assertTrue(reopened.replay)
+        self.assertEqual(reopened.urls(), [FEED_URL])
+        self.assertEqual(reopened.load(FEED_URL), b"later")
+
+    def test_corrupt_index_line_is_skipped(self):
+        self.archive.store(FEED_URL, b"kept")
+        with open(self.archive.index_file, "a", encoding="utf-8") as f:
+            f.write('{"url": "https://example.com/cut", "fetch\n')
+
+        self.assertEqual(ResponseArchive(directory=self.tmp_dir.name).load(FEED_URL), b"kept")
+
+    def test_missing_object_returns_none(self):
+        self.archive.store(FEED_URL, b"gone")
+        for root, _, files in os.walk(self.archive.objects_dir):
+            for name in files:
+                os.remove(os.path.join(root, name))
+
+        self.assertIsNone(self.archive.load(FEED_URL))
+
+    def test_load_text_decodes_with_stored_content_type(self):
+        body = "<p>தமிழ்</p>".encode("utf-8")
+        self.archive.store("https://example.com/ta", body, content_type="text/html; charset=utf-8")
+        self.archive.store("https://example.com/fr", "<p>café</p>".encode("cp1252"),
+                           content_type="text/html; charset=windows-1252")
+
+        self.assertEqual(self.archive.load_text("https://example.com/ta"), "<p>தமிழ்</p>")
+        self.assertEqual(self.archive.load_text("https://example.com/fr"), "<p>café</p>")
+
+    def test_store_none_is_ignored(self):
+        self.assertIsNone(self.archive.store(FEED_URL, None))
+        self.assertEqual(len(self.archive), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Unit tests for the boilerplate paragraph filter
+
+Run from the Tamil_News_Translator directory:
+    python -m unittest test_boilerplate
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import test_support
+
+import boilerplate
+from boilerplate import BoilerplateFilter
+
+BODY = [
+    "The state government on Monday announced a relief package for farmers affected by the unseasonal rain.",
+    "Officials said the compensation would be credited directly to bank accounts within two weeks of the survey.",
+    "Opposition parties welcomed the move but demanded that tenant farmers also be covered by the scheme.",
+]
+FOOTER = "Copyright holders reserve the right to edit comments posted below this story at any time."
+LINKS = ["Rain updates", "Farmers relief", "Stock market today", "Cricket scores"]
+TOWNS = ["Madurai", "Salem", "Erode", "Vellore", "Karur"]
+
+
+def story(n):
+    """Body paragraphs that differ by more than digits from one article to the next"""
+    return [p.replace("The state", f"The {TOWNS[n]} district").replace("Officials", f"{TOWNS[n]} officials")
+            .replace("Opposition parties", f"Opposition parties in {TOWNS[n]}") for p in BODY]
+
+
+def text(*paragraphs):
+    return "\n".join(paragraphs)
+
+
+class BoilerplateFilterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory(dir=test_support.WORK_DIR)
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.fingerprint_file = os.path.join(self.tmp_dir.name, "boilerplate.json")
+        self.filter = BoilerplateFilter(fingerprint_file=self.fingerprint_file)
+
+    def test_phrases_and_short_fragments_are_dropped(self):
+        raw = text(BODY[0], "Also read: Rain alert for ten districts", BODY[1], "Updated", BODY[2],
+                   "Subscribe to our newsletter for daily updates.")
+        cleaned = self.filter.clean(raw, domain="example.com", article_key="a1")
+
+        self.assertEqual(cleaned, "\n\n".join(BODY))
+        stats = self.filter.get_stats()
+        self.assertEqual(stats["phrase"], 2)
+        self.assertEqual(stats["short"], 1)
+        self.assertEqual(stats["chars_removed"], len(raw) - len(cleaned))
+
+    def test_link_heavy_paragraphs_are_dropped(self):
+        links = " ".join(LINKS)
+        html = ("<html><body>" + "".join(f"<p>{p}</p>" for p in BODY) +
+                "<p>" + " ".join(f'<a href="/{n}">{label}</a>' for n, label in enumerate(LINKS)) + "</p>"
+                "</body></html>")
+        cleaned = self.filter.clean(text(*BODY, links), html=html, domain="example.com", article_key="a1")
+
+        self.assertNotIn(links, cleaned)
+        self.assertEqual(self.filter.get_stats()["link_density"], 1)
+
+    def test_paragraph_repeated_across_articles_is_dropped(self):
+        threshold = boilerplate.BOILERPLATE_CONFIG["repeat_threshold"]
+        for n in range(threshold):
+            cleaned = self.filter.clean(text(*story(n), FOOTER.replace("below", f"below {n}")),
+                                        domain="example.com", article_key=f"article-{n}")
+
+        # Digits are ignored, so the footer counts as the same paragraph each time
+        self.assertNotIn("Copyright holders", cleaned)
+        self.assertIn(story(threshold - 1)[0], cleaned)
+        self.assertEqual(self.filter.get_stats()["repeated"], 1)
+
+    def test_rescraping_one_article_does_not_count_as_repetition(self):
+        for _ in range(5):
+            cleaned = self.filter.clean(text(*BODY, FOOTER), domain="example.com", article_key="same-article")
+        self.assertIn(FOOTER, cleaned)
+
+    def test_repetition_is_per_domain(self):
+        threshold = boilerplate.BOILERPLATE_CONFIG["repeat_threshold"]
+        for n in range(threshold - 1):
+            self.filter.clean(text(*BODY, FOOTER), domain="example.com", article_key=f"a{n}")
+        cleaned = self.filter.clean(text(*BODY, FOOTER), domain="other.example", article_key="b1")
+        self.assertIn(FOOTER, cleaned)
+
+    def test_original_kept_when_too_little_would_remain(self):
+        raw = text("Read more", "Click here to subscribe", "Follow us")
+        self.assertEqual(self.filter.clean(raw, domain="example.com", article_key="a1"), raw)
+        self.assertEqual(self.filter.get_stats()["chars_removed"], 0)
+
+    def test_fingerprints_persist(self):
+        threshold = boilerplate.BOILERPLATE_CONFIG["repeat_threshold"]
+        for n in range(threshold - 1):
+            self.filter.clean(text(*story(n), FOOTER), domain="example.com", article_key=f"a{n}")
+        self.assertTrue(self.filter.save())
+
+        reloaded = BoilerplateFilter(fingerprint_file=self.fingerprint_file)
+        cleaned = reloaded.clean(text(*story(threshold), FOOTER), domain="example.com", article_key="new")
+        self.assertNotIn(FOOTER, cleaned)
+        self.assertIn(story(threshold)[0], cleaned)
+
+    def test_domain_fingerprints_are_capped(self):
+        with mock.patch.dict(boilerplate.BOILERPLATE_CONFIG, max_fingerprints_per_domain=4):
+            self.filter.clean(text(*BODY, FOOTER), domain="example.com", article_key="a1")
+            self.filter.clean(text(*BODY, FOOTER), domain="example.com", article_key="a2")
+            self.filter.clean(text(*(p + " More." for p in BODY)), domain="example.com", article_key="a3")
+
+        seen = self.filter.fingerprints["example.com"]
+        self.assertLessEqual(len(seen), 4)
+        self.assertTrue(all(len(articles) == 2 for articles in seen.values()))
+
+    def test_disabled_filter_returns_text_unchanged(self):
+        raw = text(*BODY, "Read more")
+        with mock.patch.dict(boilerplate.BOILERPLATE_CONFIG, enabled=False):
+            self.assertEqual(self.filter.clean(raw, domain="example.com", article_key="a1"), raw)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Unit tests for charset sniffing
+
+Run from the Tamil_News_Translator directory:
+    python -m unittest test_charset
+"""
+
+import codecs
+import unittest
+from unittest import mock
+
+import test_support
+
+import charset
+from charset import decode_html, header_charset, is_html_content_type, sniff_encoding
+
+TAMIL = "தமிழ் செய்திகள்"
+
+
+def page(head: str, body: str = TAMIL) -> str:
+    return f"<html><head>{head}<title>News</title></head><body><p>{body}</p></body></html>"
+
+
+class SniffEncodingTest(unittest.TestCase):
+    def test_bom_wins_over_header_and_meta(self):
+        body = codecs.BOM_UTF8 + page('<meta charset="iso-8859-1">').encode("utf-8")
+        self.assertEqual(sniff_encoding(body, "text/html; charset=windows-1252"), ("utf-8-sig", "bom"))
+
+        body = codecs.BOM_UTF16_LE + page("").encode("utf-16-le")
+        self.assertEqual(sniff_encoding(body), ("utf-16", "bom"))
+
+    def test_header_charset(self):
+        body = page("").encode("utf-8")
+        self.assertEqual(sniff_encoding(body, 'text/html; charset="UTF-8"'), ("utf-8", "header"))
+
+    def test_meta_charset_forms(self):
+        for head in ('<meta charset="windows-1252">',
+                     "<meta charset=windows-1252>",
+                     '<meta http-equiv="Content-Type" content="text/html; charset=windows-1252">'):
+            with self.subTest(head=head):
+                body = page(head, "café").encode("cp1252")
+                self.assertEqual(sniff_encoding(body, "text/html"), ("cp1252", "meta"))
+
+    def test_invalid_declarations_are_ignored(self):
+        body = page('<meta charset="no-such-charset">').encode("utf-8")
+        self.assertEqual(sniff_encoding(body, "text/html; charset=bogus"), ("utf-8", "utf-8"))
+
+    def test_meta_outside_sniff_window_is_ignored(self):
+        body = (page("") + " " * 100 + '<meta charset="windows-1252">').encode("utf-8")
+        with mock.patch.dict(charset.SCRAPING_CONFIG, charset_sniff_bytes=50):
+            self.assertEqual(sniff_encoding(body)[1], "utf-8")
+
+    def test_undeclared_utf8_skips_detection(self):
+        with mock.patch.object(charset, "from_bytes") as detector:
+            self.assertEqual(sniff_encoding(page("").encode("utf-8")), ("utf-8", "utf-8"))
+        detector.assert_not_called()
+
+    def test_utf8_cut_mid_character_is_still_utf8(self):
+        # The download size cap can end the body inside a multi-byte character
+        body = page("").encode("utf-8")
+        cut = body[:body.index(TAMIL.encode("utf-8")) + 2]
+        self.assertEqual(sniff_encoding(cut), ("utf-8", "utf-8"))
+
+    def test_undeclared_legacy_encoding_uses_detection_or_fallback(self):
+        body = page("", "Çà et là, déjà vu à l'hôtel élégant. " * 20).encode("cp1252")
+        with mock.patch.object(charset, "from_bytes", None):
+            self.assertEqual(sniff_encoding(body), ("cp1252", "fallback"))
+
+        detected = mock.Mock(encoding="cp1252")
+        with mock.patch.object(charset, "from_bytes", return_value=mock.Mock(best=lambda: detected)):
+            self.assertEqual(sniff_encoding(body), ("cp1252", "detected"))
+
+    def test_decode_html(self):
+        self.assertIn(TAMIL, decode_html(page("").encode("utf-8")))
+        self.assertIn("café", decode_html(page('<meta charset="windows-1252">', "café").encode("cp1252")))
+
+
+class ContentTypeTest(unittest.TestCase):
+    def test_header_charset(self):
+        self.assertEqual(header_charset("text/html; charset=UTF-8"), "utf-8")
+        self.assertEqual(header_charset("text/html; Charset='ISO-8859-1'"), "iso8859-1")
+        self.assertIsNone(header_charset("text/html"))
+        self.assertIsNone(header_charset(None))
+
+    def test_is_html_content_type(self):
+        self.assertTrue(is_html_content_type("text/html; charset=utf-8"))
+        self.assertTrue(is_html_content_type(""))
+        self.assertFalse(is_html_content_type("application/pdf"))
+        self.assertFalse(is_html_content_type("image/jpeg"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Unit tests for run checkpoints and resuming interrupted runs
+
+Run from the Tamil_News_Translator directory:
+    python -m unittest test_checkpoint
+"""
+
+import os
+import tempfile
+import unittest
+
+import test_support
+
+from checkpoint import RunCheckpoint
+from news_fetcher import NewsArticle
+
+
+def article(n):
+    return NewsArticle(title=f"Story {n}", link=f"https://news.google.com/articles/{n}",
+                       published="Thu, 02 May 2024 10:00:00 GMT", description=f"Description {n}", source="Example")
+
+
+class RunCheckpointTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory(dir=test_support.WORK_DIR)
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def new_run(self, articles):
+        checkpoint = RunCheckpoint(run_id="run1", directory=self.tmp_dir.name)
+        checkpoint.start({"category": "world", "query": None, "max_articles": 10, "languages": ["ta"]})
+        for a in articles:
+            checkpoint.record(a, RunCheckpoint.FETCHED)
+        return checkpoint
+
+    def resume(self):
+        checkpoint = RunCheckpoint(run_id="run1", directory=self.tmp_dir.name)
+        self.assertTrue(checkpoint.load())
+        return checkpoint
+
+    def test_resume_restores_manifest_and_fetch_order(self):
+        self.new_run([article(n) for n in (3, 1, 2)])
+
+        checkpoint = self.resume()
+        self.assertEqual(checkpoint.manifest["category"], "world")
+        self.assertEqual(checkpoint.manifest["max_articles"], 10)
+        self.assertIsNone(checkpoint.manifest["completed_at"])
+        self.assertEqual([a.title for a in checkpoint.fetched_articles()], ["Story 3", "Story 1", "Story 2"])
+
+    def test_resume_picks_up_latest_state_of_each_article(self):
+        articles = [article(n) for n in range(4)]
+        checkpoint = self.new_run(articles)
+
+        articles[0].full_content = "Scraped body"
+        checkpoint.record(articles[0], RunCheckpoint.SCRAPED)
+        articles[0].translated_content = "மொழிபெயர்ப்பு"
+        checkpoint.record(articles[0], RunCheckpoint.TRANSLATED)
+        articles[1].full_content = "Scraped but not translated"
+        checkpoint.record(articles[1], RunCheckpoint.SCRAPED)
+        checkpoint.record(articles[2], RunCheckpoint.FAILED)
+
+        resumed = self.resume()
+        fetched = resumed.fetched_articles()
+        self.assertEqual([resumed.state(a) for a in fetched],
+                         [RunCheckpoint.TRANSLATED, RunCheckpoint.SCRAPED, RunCheckpoint.FAILED, RunCheckpoint.FETCHED])
+
+        # Snapshots carry the text recorded at each stage; the fetched records stay light
+        self.assertIsNone(fetched[0].full_content)
+        self.assertEqual(resumed.load_article(fetched[0]).translated_content, "மொழிபெயர்ப்பு")
+        self.assertEqual(resumed.load_article(fetched[1]).full_content, "Scraped but not translated")
+        # Articles the checkpoint never saw come back unchanged
+        unknown = article(99)
+        self.assertIs(resumed.load_article(unknown), unknown)
+
+    def test_truncated_last_record_is_discarded(self):
+        checkpoint = self.new_run([article(1), article(2)])
+        with open(checkpoint.state_file, "ab") as f:
+            f.write(b'{"url": "https://news.google.com/articles/1", "state": "transl')
+
+        resumed = self.resume()
+        self.assertEqual(resumed.state(article(1)), RunCheckpoint.FETCHED)
+
+        # New records after the cut start on a clean line and survive the next resume
+        resumed.record(article(1), RunCheckpoint.FAILED)
+        self.assertEqual(self.resume().state(article(1)), RunCheckpoint.FAILED)
+
+    def test_complete_marks_manifest(self):
+        self.new_run([article(1)]).complete()
+        self.assertIsNotNone(self.resume().manifest["completed_at"])
+
+    def test_unknown_run_does_not_load(self):
+        checkpoint = RunCheckpoint(run_id="missing", directory=self.tmp_dir.name)
+        self.assertFalse(checkpoint.load())
+        self.assertFalse(os.path.exists(checkpoint.run_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,217 @@
+"""
+Unit tests for near-duplicate story detection
+
+Run from the Tamil_News_Translator directory:
+    python -m unittest test_deduplicator
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import test_support
+
+import deduplicator
+from checkpoint import RunCheckpoint
+from deduplicator import FINGERPRINT_BITS, StoryDeduplicator
+from main import TamilNewsTranslator
+from news_fetcher import NewsArticle
+
+STORY = ("Heavy rain lashed Chennai on Thursday, flooding several low-lying areas and disrupting "
+         "suburban train services. The meteorological department has forecast more showers over "
+         "the next two days and advised fishermen not to venture into the sea. Schools in the city "
+         "remain closed while corporation workers clear blocked drains across the city.")
+OTHER_STORY = ("The national cricket team announced its squad for the upcoming tour, recalling two "
+               "experienced fast bowlers and handing a first call-up to a young left-arm spinner who "
+               "impressed in the domestic season with forty wickets in eight matches.")
+
+
+def article(url, text):
+    a = NewsArticle(title=url.rsplit("/", 1)[-1], link=url, published="", description="")
+    a.original_url = url
+    a.full_content = text
+    return a
+
+
+def translated(a, content="மொழிபெயர்ப்பு"):
+    a.translated_content = content
+    a.translations = {"ta": {"title": "தலைப்பு", "content": content}, "hi": {"title": None, "content": "अनुवाद"}}
+    return a
+
+
+class StoryDeduplicatorTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory(dir=test_support.WORK_DIR)
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.history_file = os.path.join(self.tmp_dir.name, "fingerprints.json")
+        self.translations_file = os.path.join(self.tmp_dir.name, "fingerprint_translations.jsonl")
+
+    def dedup(self):
+        return StoryDeduplicator(history_file=self.history_file, translations_file=self.translations_file)
+
+    def test_bands_cover_the_fingerprint(self):
+        d = self.dedup()
+        self.assertEqual(d.num_bands, deduplicator.DEDUP_CONFIG["max_hamming_distance"] + 1)
+        fingerprint = d.fingerprint(STORY)
+
+        # Reassembling the bands gives back every bit the bands cover
+        bands = d._bands(fingerprint)
+        rebuilt = sum(value << (index * d.band_bits) for index, value in bands)
+        covered = (1 << (d.num_bands * d.band_bits)) - 1
+        self.assertEqual(rebuilt, fingerprint & covered)
+        self.assertLessEqual(d.num_bands * d.band_bits, FINGERPRINT_BITS)
+
+    def test_fingerprints_within_max_distance_share_a_band(self):
+        d = self.dedup()
+        base = d.fingerprint(STORY)
+        # Flip max_distance bits spread over different bands; pigeonhole leaves one band untouched
+        flipped = base
+        for band in range(d.max_distance):
+            flipped ^= 1 << (band * d.band_bits + 3)
+        self.assertEqual(d.hamming_distance(base, flipped), d.max_distance)
+        self.assertTrue(set(d._bands(base)) & set(d._bands(flipped)))
+
+    def test_near_duplicate_reuses_translation(self):
+        d = self.dedup()
+        first = article("https://example.com/original", STORY)
+        self.assertIsNone(d.find_source(first))
+        d.remember(translated(first))
+
+        rewrite = article("https://example.com/syndicated", STORY.replace("Thursday", "Thursday morning"))
+        source = d.find_source(rewrite)
+
+        self.assertIsNotNone(source)
+        self.assertEqual(rewrite.duplicate_of, "https://example.com/original")
+        self.assertLessEqual(d.hamming_distance(rewrite.fingerprint, first.fingerprint), d.max_distance)
+        self.assertTrue(d.apply_source(rewrite, source))
+        self.assertEqual(rewrite.translated_content, "மொழிபெயர்ப்பு")
+        self.assertEqual(rewrite.translations["hi"]["content"], "अनुवाद")
+        # Titles are not copied from the representative
+        self.assertIsNone(rewrite.translations["ta"]["title"])
+
+    def test_different_story_is_not_matched(self):
+        d = self.dedup()
+        d.find_source(article("https://example.com/rain", STORY))
+        d.remember(translated(article("https://example.com/rain", STORY)))
+
+        self.assertIsNone(d.find_source(article("https://example.com/cricket", OTHER_STORY)))
+
+    def test_history_survives_restart_without_bodies_in_memory(self):
+        d = self.dedup()
+        first = article("https://example.com/original", STORY)
+        d.find_source(first)
+        d.remember(translated(first))
+        self.assertTrue(d.save_history())
+
+        with open(self.history_file, encoding="utf-8") as f:
+            self.assertEqual(set(json.load(f)[0]), {"fingerprint", "url", "title", "seen_at", "offset"})
+
+        restarted = self.dedup()
+        duplicate = article("https://example.com/copy", STORY)
+        source = restarted.find_source(duplicate)
+        self.assertTrue(restarted.apply_source(duplicate, source))
+        self.assertEqual(duplicate.translated_content, "மொழிபெயர்ப்பு")
+
+    def test_old_history_is_dropped_on_load(self):
+        stale = (datetime.now() - timedelta(days=deduplicator.DEDUP_CONFIG["history_days"] + 1)).isoformat()
+        with open(self.history_file, "w", encoding="utf-8") as f:
+            json.dump([{"fingerprint": 1, "url": "https://example.com/old", "title": "old",
+                        "translated_content": "x", "translations": {}, "seen_at": stale}], f)
+
+        self.assertEqual(len(self.dedup().history), 0)
+
+    def test_history_is_capped_and_index_evicted(self):
+        with mock.patch.dict(deduplicator.DEDUP_CONFIG, history_max_entries=2):
+            d = self.dedup()
+            for n in range(3):
+                a = article(f"https://example.com/{n}", " ".join(f"word{n}_{i}" for i in range(60)))
+                d.find_source(a)
+                d.remember(translated(a))
+
+        self.assertEqual([entry["url"] for entry in d.history], ["https://example.com/1", "https://example.com/2"])
+        indexed = {entry["url"] for bucket in d._history_bands.values() for entry in bucket}
+        self.assertNotIn("https://example.com/0", indexed)
+
+    def test_duplicates_and_untranslated_articles_are_not_remembered(self):
+        d = self.dedup()
+        untranslated = article("https://example.com/untranslated", STORY)
+        d.find_source(untranslated)
+        d.remember(untranslated)
+
+        duplicate = translated(article("https://example.com/dup", STORY))
+        duplicate.fingerprint = d.fingerprint(STORY)
+        duplicate.duplicate_of = "https://example.com/original"
+        d.remember(duplicate)
+
+        self.assertEqual(len(d.history), 0)
+
+
+class DuplicateTranslationTest(unittest.TestCase):
+    """How the pipeline translates a near-duplicate, with the provider replaced by a fake"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory(dir=test_support.WORK_DIR)
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.app = TamilNewsTranslator(target_languages=["ta", "hi", "te"])
+        self.app.deduplicator = StoryDeduplicator(
+            history_file=os.path.join(self.tmp_dir.name, "fingerprints.json"),
+            translations_file=os.path.join(self.tmp_dir.name, "fingerprint_translations.jsonl"))
+        self.app.file_manager.append_article = mock.Mock(return_value=None)
+        self.checkpoint = mock.Mock(state=mock.Mock(return_value=RunCheckpoint.FETCHED))
+
+        self.sent = []
+
+        def translate_text(text, max_retries=3, target_language=None):
+            self.sent.append((target_language, text))
+            return f"{target_language}: {text[:20]}"
+
+        self.app.translator.translate_text = translate_text
+        self.addCleanup(self.app.translator.executor.shutdown)
+
+    def process(self, url):
+        a = article(url, STORY)
+        with mock.patch.object(self.app.content_scraper, "scrape_article_content"):
+            return self.app._process_article(a, self.checkpoint)
+
+    def content_sent(self):
+        return sorted(language for language, text in self.sent if text == STORY)
+
+    def test_duplicate_only_translates_titles(self):
+        self.process("https://example.com/original")
+        self.sent.clear()
+
+        duplicate = self.process("https://example.com/copy")
+
+        self.assertEqual(duplicate.duplicate_of, "https://example.com/original")
+        self.assertEqual(self.content_sent(), [])
+        self.assertEqual(duplicate.translations["hi"]["content"], f"hi: {STORY[:20]}")
+
+    def test_missing_stored_translations_are_translated_again(self):
+        self.process("https://example.com/original")
+        self.sent.clear()
+        # The translations file was pruned since the representative was remembered
+        os.remove(self.app.deduplicator.translations_file)
+
+        with self.assertLogs(level="WARNING"):
+            duplicate = self.process("https://example.com/copy")
+
+        self.assertEqual(self.content_sent(), ["hi", "ta", "te"])
+        self.assertEqual(duplicate.translated_content, f"ta: {STORY[:20]}")
+
+    def test_languages_the_source_lacks_are_translated(self):
+        self.app.translator.target_languages = ["ta"]
+        self.process("https://example.com/original")
+        self.app.translator.target_languages = ["ta", "hi", "te"]
+        self.sent.clear()
+
+        duplicate = self.process("https://example.com/copy")
+
+        self.assertEqual(self.content_sent(), ["hi", "te"])
+        self.assertEqual(duplicate.translations["te"]["content"], f"te: {STORY[:20]}")
+
+
+if __name__ == "__main__":
+    unittest.main()
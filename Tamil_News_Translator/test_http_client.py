@@ -0,0 +1,83 @@
+"""
+Unit tests for the shared HTTP client
+
+Run from the Tamil_News_Translator directory:
+    python -m unittest test_http_client
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import httpx
+import requests
+
+from http_client import Http2Adapter, read_capped
+
+BODY = b"<html><body>" + b"x" * 200000 + b"</body></html>"
+
+
+def adapter_session(handler):
+    """Session whose example.com traffic goes through an Http2Adapter backed by a mock transport"""
+    session = requests.Session()
+    adapter = Http2Adapter(httpx.Client(transport=httpx.MockTransport(handler)))
+    session.mount("https://example.com", adapter)
+    return session, adapter
+
+
+class Http2AdapterTest(unittest.TestCase):
+    def setUp(self):
+        self.session, self.adapter = adapter_session(
+            lambda request: httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, content=BODY)
+        )
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_read_capped_on_streamed_response(self):
+        response = self.session.get("https://example.com/page", stream=True)
+        body, truncated = read_capped(response, max_bytes=len(BODY) + 1, chunk_size=4096)
+
+        self.assertEqual(body, BODY)
+        self.assertFalse(truncated)
+        self.assertEqual(self.adapter.requests_sent, 1)
+
+    def test_read_capped_truncates_streamed_response(self):
+        response = self.session.get("https://example.com/page", stream=True)
+        body, truncated = read_capped(response, max_bytes=10000, chunk_size=4096)
+
+        self.assertEqual(body, BODY[:10000])
+        self.assertTrue(truncated)
+
+    def test_read_capped_on_buffered_response(self):
+        response = self.session.get("https://example.com/page")
+        body, truncated = read_capped(response, max_bytes=len(BODY) + 1)
+
+        self.assertEqual(body, BODY)
+        self.assertFalse(truncated)
+
+    def test_response_looks_like_requests(self):
+        response = self.session.get("https://example.com/page")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.encoding, "utf-8")
+        self.assertEqual(response.url, "https://example.com/page")
+        self.assertEqual(response.content, BODY)
+
+    def test_streamed_content_property(self):
+        response = self.session.get("https://example.com/page", stream=True)
+        self.assertEqual(response.content, BODY)
+
+    def test_transport_error_becomes_connection_error(self):
+        def fail(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        session, _ = adapter_session(fail)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            session.get("https://example.com/page", stream=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
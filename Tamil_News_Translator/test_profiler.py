@@ -0,0 +1,81 @@
+"""
+Unit tests for the per-stage pipeline profiler
+
+Run from the Tamil_News_Translator directory:
+    python -m unittest test_profiler
+"""
+
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import test_support
+
+from profiler import PipelineProfiler
+
+
+def translate_in_worker(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+class PipelineProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.profiler = PipelineProfiler(enabled=True, directory=os.path.join(test_support.WORK_DIR, "profiles"))
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.executor.shutdown)
+
+    def run_translate_stage(self):
+        self.profiler.start()
+        try:
+            with self.profiler.stage("translate"):
+                task = self.profiler.bind(translate_in_worker)
+                futures = [self.executor.submit(task, 0.2) for _ in range(2)]
+                for future in futures:
+                    future.result()
+        finally:
+            self.profiler.stop()
+
+    def test_worker_functions_appear_in_stage_top_functions(self):
+        self.run_translate_stage()
+
+        top = self.profiler.get_summary(top_n=50)["translate"]["top_functions"]
+        self.assertTrue(any("translate_in_worker" in line for line in top), top)
+
+    def test_samples_come_only_from_threads_in_a_stage(self):
+        # An idle thread outside any stage must not be charged to "translate"
+        idle = threading.Event()
+        bystander = threading.Thread(target=idle.wait, args=(5,))
+        bystander.start()
+        try:
+            self.run_translate_stage()
+        finally:
+            idle.set()
+            bystander.join()
+
+        stacks = list(self.profiler._samples)
+        self.assertTrue(any("translate_in_worker" in stack for stack in stacks))
+        self.assertTrue(all(stack.startswith("translate;") for stack in stacks))
+        # Every sample is either the thread that entered the stage or a worker running a bound task
+        for stack in stacks:
+            self.assertTrue("run_translate_stage" in stack or "translate_in_worker" in stack, stack)
+
+    def test_bind_outside_a_stage_returns_function_unchanged(self):
+        self.assertIs(self.profiler.bind(translate_in_worker), translate_in_worker)
+        self.assertIs(PipelineProfiler(enabled=False).bind(translate_in_worker), translate_in_worker)
+
+    def test_save_writes_merged_stage_profile(self):
+        self.run_translate_stage()
+
+        output_dir = self.profiler.save()
+        self.assertTrue(os.path.exists(os.path.join(output_dir, "translate.prof")))
+        self.assertTrue(os.path.exists(os.path.join(output_dir, "summary.txt")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Unit tests for the streaming RSS parser
+
+Run from the Tamil_News_Translator directory:
+    python -m unittest test_rss_parser
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import httpx
+import requests
+
+from config import RSS_PARSER_CONFIG
+from http_client import Http2Adapter
+from rss_parser import RSSParseError, iter_rss_items
+
+
+def make_feed(count: int) -> bytes:
+    items = "".join(
+        f"<item><title>Title {i}</title><link>https://news.google.com/rss/articles/{i}</link>"
+        f"<guid>{i}</guid><pubDate>Mon, 0{i % 9 + 1} Jan 2024 10:00:00 GMT</pubDate>"
+        f"<description>&lt;a href=\"x\"&gt;Story {i}&lt;/a&gt;</description>"
+        f"<source url=\"https://example.com\">Example</source></item>"
+        for i in range(count)
+    )
+    return (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>Top stories</title>{items}</channel></rss>").encode("utf-8")
+
+
+def split(body: bytes, size: int):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class IterRssItemsTest(unittest.TestCase):
+    def test_yields_only_pipeline_fields(self):
+        entries = list(iter_rss_items([make_feed(1)]))
+
+        self.assertEqual(entries, [{
+            "title": "Title 0",
+            "link": "https://news.google.com/rss/articles/0",
+            "published": "Mon, 01 Jan 2024 10:00:00 GMT",
+            "description": '<a href="x">Story 0</a>'
+        }])
+
+    def test_chunk_boundaries_do_not_matter(self):
+        body = make_feed(25)
+        whole = list(iter_rss_items([body]))
+
+        for size in (1, 7, 100, 4096):
+            with self.subTest(chunk_size=size):
+                self.assertEqual(list(iter_rss_items(split(body, size))), whole)
+        self.assertEqual(len(whole), 25)
+
+    def test_items_arrive_before_the_feed_ends(self):
+        chunks = split(make_feed(10), 50)
+        consumed = []
+
+        def source():
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        first = next(iter_rss_items(source()))
+        self.assertEqual(first["title"], "Title 0")
+        self.assertLess(len(consumed), len(chunks))
+
+    def test_malformed_feed_raises_parse_error(self):
+        body = make_feed(3).replace(b"</item>", b"", 1)
+        with self.assertRaises(RSSParseError):
+            list(iter_rss_items(split(body, 64)))
+
+    def test_streams_from_http2_adapter_response(self):
+        # Same path as GoogleNewsFetcher._feed_chunks: make_request(..., stream=True) then iter_content
+        body = make_feed(40)
+        session = requests.Session()
+        session.mount("https://news.google.com", Http2Adapter(httpx.Client(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+        )))
+
+        response = session.get("https://news.google.com/rss/search?q=tamil", stream=True)
+        try:
+            entries = list(iter_rss_items(response.iter_content(chunk_size=RSS_PARSER_CONFIG["chunk_size"])))
+        finally:
+            response.close()
+            session.close()
+
+        self.assertEqual(len(entries), 40)
+        self.assertEqual(entries[-1]["title"], "Title 39")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Unit tests for article prioritisation and the daily translation quota
+
+Run from the Tamil_News_Translator directory:
+    python -m unittest test_scheduler
+"""
+
+import json
+import os
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import mock
+
+import test_support
+
+import scheduler
+from news_fetcher import NewsArticle
+from scheduler import PriorityScheduler, TranslationQuota
+
+NOW = datetime(2024, 5, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def article(title, hours_old=None, source=""):
+    published = format_datetime(NOW - timedelta(hours=hours_old)) if hours_old is not None else ""
+    return NewsArticle(title=title, link=f"https://news.google.com/{title}", published=published,
+                       description="", source=source)
+
+
+class PrioritySchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = PriorityScheduler()
+        config = dict(scheduler.SCHEDULER_CONFIG, recency_half_life_hours=12, default_source_weight=1.0,
+                      source_weights={"Reuters": 2.0, "Blocked": 0},
+                      category_weights={"top_stories": 1.5, "sports": 0.8})
+        patcher = mock.patch.object(scheduler, "SCHEDULER_CONFIG", config)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def order(self, articles, category=None):
+        with mock.patch.object(scheduler, "datetime", wraps=datetime) as clock:
+            clock.now.return_value = NOW
+            return [a.title for a in self.scheduler.order(articles, category)]
+
+    def test_newer_articles_first(self):
+        articles = [article("old", 30), article("new", 1), article("middle", 10)]
+        self.assertEqual(self.order(articles), ["new", "middle", "old"])
+
+    def test_score_halves_every_half_life(self):
+        fresh = self.scheduler.score(article("fresh", 0), now=NOW)
+        half = self.scheduler.score(article("half", 12), now=NOW)
+        self.assertAlmostEqual(fresh - half, 0.6931, places=3)
+
+    def test_source_weight_can_outrank_recency(self):
+        # Twice the weight is worth exactly one half-life of age
+        articles = [article("plain", 1), article("wire", 12, source="Reuters"), article("older wire", 14, source="Reuters")]
+        self.assertEqual(self.order(articles), ["wire", "plain", "older wire"])
+
+    def test_zero_weight_sources_go_last(self):
+        articles = [article("blocked", 0, source="Blocked"), article("week old", 24 * 7)]
+        self.assertEqual(self.order(articles), ["week old", "blocked"])
+
+    def test_undated_articles_count_as_one_half_life_old(self):
+        articles = [article("undated"), article("newer", 6), article("older", 18)]
+        self.assertEqual(self.order(articles), ["newer", "undated", "older"])
+
+    def test_ties_keep_feed_order(self):
+        articles = [article(f"same {n}", 5) for n in range(5)]
+        self.assertEqual(self.order(articles), [f"same {n}" for n in range(5)])
+
+    def test_categories_ordered_by_weight(self):
+        self.assertEqual(self.scheduler.order_categories(["sports", "query", "top_stories"]),
+                         ["top_stories", "query", "sports"])
+
+
+class TranslationQuotaTest(unittest.TestCase):
+    def setUp(self):
+        self.state_file = os.path.join(test_support.WORK_DIR, "data", f"quota_{self.id()}.json")
+
+    def test_consume_and_remaining(self):
+        quota = TranslationQuota(state_file=self.state_file, daily_limit=1000)
+        self.assertTrue(quota.can_afford(1000))
+
+        quota.consume(600)
+        self.assertEqual(quota.remaining(), 400)
+        self.assertTrue(quota.can_afford(400))
+        self.assertFalse(quota.can_afford(401))
+
+        quota.consume(500)
+        self.assertEqual(quota.remaining(), 0)
+
+    def test_usage_persists_for_the_same_day(self):
+        quota = TranslationQuota(state_file=self.state_file, daily_limit=1000)
+        quota.consume(250)
+        self.assertTrue(quota.save())
+
+        self.assertEqual(TranslationQuota(state_file=self.state_file, daily_limit=1000).remaining(), 750)
+
+    def test_usage_from_an_earlier_day_is_discarded(self):
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        with open(self.state_file, "w", encoding="utf-8") as f:
+            json.dump({"date": yesterday, "chars": 900, "limit": 1000}, f)
+
+        self.assertEqual(TranslationQuota(state_file=self.state_file, daily_limit=1000).remaining(), 1000)
+
+    def test_day_rolls_over_while_running(self):
+        quota = TranslationQuota(state_file=self.state_file, daily_limit=1000)
+        quota.consume(1000)
+        quota.day = (date.today() - timedelta(days=1)).isoformat()
+
+        self.assertEqual(quota.remaining(), 1000)
+
+    def test_no_limit(self):
+        quota = TranslationQuota(state_file=self.state_file, daily_limit=0)
+        quota.consume(10 ** 9)
+
+        self.assertTrue(quota.unlimited)
+        self.assertIsNone(quota.remaining())
+        self.assertTrue(quota.can_afford(10 ** 9))
+        self.assertEqual(quota.get_stats()["used"], 10 ** 9)
+
+    def test_corrupt_state_file_starts_fresh(self):
+        with open(self.state_file, "w", encoding="utf-8") as f:
+            f.write("{not json")
+
+        self.assertEqual(TranslationQuota(state_file=self.state_file, daily_limit=1000).remaining(), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
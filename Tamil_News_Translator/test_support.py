@@ -0,0 +1,19 @@
+"""
+Shared setup for the unit tests
+
+Puts src/ on the import path and moves into a scratch directory, since the modules log to
+data/error_log.txt and keep their state files under data/ relative to the working directory.
+"""
+
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+WORK_DIR = tempfile.mkdtemp(prefix="tamil-news-tests-")
+os.makedirs(os.path.join(WORK_DIR, "data"), exist_ok=True)
+os.chdir(WORK_DIR)
+atexit.register(shutil.rmtree, WORK_DIR, True)
@@ -0,0 +1,155 @@
+"""
+Background jobs for the slow AI endpoints (writer, voice, video).
+
+Jobs are rows in the `jobs` table, so queued and interrupted work survives a
+restart. Each job kind has its own thread pool, which caps how many jobs of
+that kind run at once.
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+FINISHED_STATES = (DONE, FAILED)
+
+FINISHED_JOB_RETENTION_DAYS = 7
+
+
+class JobError(Exception):
+    """Raised by a job handler to fail the job with a message meant for the user."""
+
+
+class JobQueue:
+    def __init__(self, database, concurrency):
+        self.db = database
+        self.concurrency = concurrency
+        self.handlers = {}
+        self.executors = {}
+        self.started = False
+        self._start_lock = threading.Lock()
+
+    def register(self, kind, handler):
+        """handler(payload, report) -> JSON-serialisable result; report(message) updates progress."""
+        self.handlers[kind] = handler
+        self.executors[kind] = ThreadPoolExecutor(max_workers=self.concurrency.get(kind, 1),
+                                                  thread_name_prefix=f"job-{kind}")
+
+    def setup(self):
+        with self.db.writer() as conn:
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                dedupe_key TEXT,
+                payload TEXT,
+                result TEXT,
+                error TEXT,
+                progress TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_pending ON jobs (created_at) WHERE status IN ('queued', 'running')")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs (kind, dedupe_key) WHERE status IN ('queued', 'running')")
+
+    def start(self):
+        """Create the table, requeue jobs cut off by the last shutdown and start working."""
+        with self._start_lock:
+            if not self.started:
+                self._start()
+
+    def ensure_started(self):
+        # Under `flask run` or a WSGI server nothing calls start(), so the first use does
+        if not self.started:
+            self.start()
+
+    def _start(self):
+        self.setup()
+        with self.db.writer() as conn:
+            interrupted = conn.execute(
+                "UPDATE jobs SET status = ?, progress = 'Restarted after shutdown' WHERE status = ?", (QUEUED, RUNNING)
+            ).rowcount
+            conn.execute("DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                         (DONE, FAILED, time.time() - FINISHED_JOB_RETENTION_DAYS * 86400))
+        self.started = True
+
+        pending = self.db.query("SELECT id, kind FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,))
+        for row in pending:
+            self._dispatch(row["id"], row["kind"])
+        logging.info(f"Job queue started: {len(pending)} pending job(s), {interrupted} resumed after restart.")
+
+    def shutdown(self):
+        for executor in self.executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, kind, payload, dedupe_key=None):
+        """Persist a job and hand it to its pool; an identical job still pending is reused instead."""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        self.ensure_started()
+        with self.db.writer() as conn:
+            if dedupe_key is not None:
+                existing = conn.execute(
+                    "SELECT id FROM jobs WHERE kind = ? AND dedupe_key = ? AND status IN (?, ?)",
+                    (kind, dedupe_key, QUEUED, RUNNING)
+                ).fetchone()
+                if existing:
+                    return existing["id"]
+
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, dedupe_key, payload, progress, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, dedupe_key, json.dumps(payload), 'Queued', time.time())
+            )
+
+        self._dispatch(job_id, kind)
+        return job_id
+
+    def get(self, job_id):
+        self.ensure_started()
+        row = self.db.query_one("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if row is None:
+            return None
+        job = {key: row[key] for key in ("id", "kind", "status", "progress", "error",
+                                         "attempts", "created_at", "started_at", "finished_at")}
+        job["result"] = json.loads(row["result"]) if row["result"] else None
+        return job
+
+    def _dispatch(self, job_id, kind):
+        self.executors[kind].submit(self._run, job_id)
+
+    def _run(self, job_id):
+        with self.db.writer() as conn:
+            row = conn.execute("SELECT kind, payload, status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row["status"] != QUEUED:
+                return
+            conn.execute("UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1, progress = 'Started' WHERE id = ?",
+                         (RUNNING, time.time(), job_id))
+
+        def report(message):
+            self.db.execute("UPDATE jobs SET progress = ? WHERE id = ?", (message, job_id))
+
+        try:
+            result = self.handlers[row["kind"]](json.loads(row["payload"]), report)
+            self.db.execute(
+                "UPDATE jobs SET status = ?, result = ?, progress = 'Done', finished_at = ? WHERE id = ?",
+                (DONE, json.dumps(result), time.time(), job_id)
+            )
+        except Exception as e:
+            if not isinstance(e, JobError):
+                logging.error(f"Job {job_id} ({row['kind']}) failed: {e}", exc_info=True)
+            self.db.execute(
+                "UPDATE jobs SET status = ?, error = ?, progress = 'Failed', finished_at = ? WHERE id = ?",
+                (FAILED, str(e), time.time(), job_id)
+            )
@@ -0,0 +1,123 @@
+"""
+SQLite access layer for the news web app.
+
+Connections are opened once and reused: a pool of read-only connections for the
+request handlers and a single writer connection shared by the scraper, the
+scheduler and the AI endpoints. Pragmas are applied when a connection is opened,
+not on every query.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# --- Connection Settings ---------------------------------------------
+READ_POOL_SIZE = 8
+BUSY_TIMEOUT_MS = 30000
+STATEMENT_CACHE_SIZE = 512
+CONNECTION_PRAGMAS = [
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",   # 256 MB
+    "PRAGMA cache_size=-65536",     # 64 MB
+    "PRAGMA temp_store=MEMORY",
+    f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}",
+]
+
+
+class Database:
+    def __init__(self, db_name, read_pool_size=READ_POOL_SIZE):
+        self.db_name = db_name
+        self.read_pool_size = read_pool_size
+        self._readers = queue.LifoQueue()
+        self._reader_count = 0
+        self._pool_lock = threading.Lock()
+        self._writer = None
+        self._write_lock = threading.RLock()
+
+    def _connect(self, read_only):
+        # Connections move between the Flask worker threads, so sqlite3's same-thread check is off;
+        # each one is only ever used by one thread at a time (pool checkout / write lock)
+        conn = sqlite3.connect(self.db_name, timeout=BUSY_TIMEOUT_MS / 1000,
+                               check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        if not read_only:
+            # WAL is stored in the file, so setting it once from the writer covers every reader
+            conn.execute("PRAGMA journal_mode=WAL")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """Borrow a read-only connection from the pool."""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._pool_lock:
+                if self._reader_count < self.read_pool_size:
+                    self._reader_count += 1
+                    conn = self._connect(read_only=True)
+            if conn is None:
+                conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    @contextmanager
+    def writer(self):
+        """The shared writer connection; commits on success, rolls back on error."""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect(read_only=False)
+            try:
+                yield self._writer
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    def query(self, sql, params=()):
+        with self.reader() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql, params=()):
+        with self.reader() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def execute(self, sql, params=()):
+        with self.writer() as conn:
+            return conn.execute(sql, params).rowcount
+
+    def close(self):
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._pool_lock:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._reader_count = 0
+
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(db_name):
+    """One shared Database per file, created on first use."""
+    with _databases_lock:
+        if db_name not in _databases:
+            _databases[db_name] = Database(db_name)
+            logging.info(f"Opened connection pool for '{db_name}'.")
+        return _databases[db_name]
@@ -0,0 +1,190 @@
+"""
+Tests for saving scraped articles to the archive database.
+
+Run from this directory:
+    python -m unittest test_article_store
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import web_app
+from news_db import get_database
+
+
+def make_article(n, **overrides):
+    article = {
+        "title": f"Article {n}", "authors": ["Desk"], "publish_date": "2024-05-02 10:00:00",
+        "text": f"Body of article {n}. " * 20, "text_length": 400, "top_image": None,
+        "keywords": ["news"], "summary": f"Summary {n}", "canonical_link": None,
+        "original_url": f"https://example.com/{n}", "fetch_timestamp": "2024-05-02T10:05:00"
+    }
+    article.update(overrides)
+    return article
+
+
+class SaveArticlesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_name = os.path.join(self.tmp_dir.name, "articles.db")
+        web_app.setup_database(self.db_name)
+        self.db = get_database(self.db_name)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp_dir.cleanup()
+
+    def article_ids(self):
+        return {row["original_url"]: row["id"] for row in self.db.query("SELECT id, original_url FROM articles")}
+
+    def test_new_and_known_urls_are_split(self):
+        web_app.save_articles_to_db(self.db_name, [make_article(1), make_article(2)], "India")
+
+        inserted_ids, known_urls, failed_urls = web_app.save_articles_to_db(
+            self.db_name, [make_article(2), make_article(3), make_article(1)], "India"
+        )
+
+        self.assertEqual(list(inserted_ids), ["https://example.com/3"])
+        self.assertEqual(known_urls, ["https://example.com/2", "https://example.com/1"])
+        self.assertEqual(failed_urls, [])
+
+    def test_returning_ids_match_stored_rows(self):
+        # ON CONFLICT DO NOTHING rows, including a duplicate inside the batch, return nothing
+        batch = [make_article(1), make_article(2), make_article(1, title="Same URL again")]
+        inserted_ids, known_urls, _ = web_app.save_articles_to_db(self.db_name, batch, "India")
+
+        self.assertEqual(inserted_ids, self.article_ids())
+        self.assertEqual(len(inserted_ids), 2)
+        self.assertEqual(known_urls, [])
+        stored = self.db.query_one("SELECT title, publish_day, fetched_at FROM articles WHERE original_url = ?",
+                                   ("https://example.com/1",))
+        self.assertEqual(stored["title"], "Article 1")
+        self.assertEqual(stored["publish_day"], "2024-05-02")
+        self.assertGreater(stored["fetched_at"], 0)
+
+    def test_batches_larger_than_variable_limit_are_chunked(self):
+        # Ten rows per statement, so 95 articles need ten INSERTs
+        with self.db.writer() as conn:
+            default_limit = conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 10 * len(web_app.ARTICLE_INSERT_COLUMNS))
+        try:
+            web_app.save_articles_to_db(self.db_name, [make_article(n) for n in range(0, 95, 2)], "India")
+            inserted_ids, known_urls, failed_urls = web_app.save_articles_to_db(
+                self.db_name, [make_article(n) for n in range(95)], "India"
+            )
+        finally:
+            with self.db.writer() as conn:
+                conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, default_limit)
+
+        self.assertEqual(len(inserted_ids), 47)
+        self.assertEqual(len(known_urls), 48)
+        self.assertEqual(failed_urls, [])
+        self.assertEqual(len(self.article_ids()), 95)
+
+    def test_failed_chunk_is_reported_separately(self):
+        with self.db.writer() as conn:
+            default_limit = conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 2 * len(web_app.ARTICLE_INSERT_COLUMNS))
+        try:
+            # A value sqlite3 cannot bind fails the chunk holding articles 2 and 3 only
+            batch = [make_article(0), make_article(1), make_article(2), make_article(3, title={"bad": "value"}),
+                     make_article(4)]
+            with self.assertLogs(level="ERROR"):
+                inserted_ids, known_urls, failed_urls = web_app.save_articles_to_db(self.db_name, batch, "India")
+        finally:
+            with self.db.writer() as conn:
+                conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, default_limit)
+
+        self.assertEqual(failed_urls, ["https://example.com/2", "https://example.com/3"])
+        self.assertEqual(known_urls, [])
+        self.assertEqual(sorted(inserted_ids), ["https://example.com/0", "https://example.com/1", "https://example.com/4"])
+        self.assertEqual(inserted_ids, self.article_ids())
+
+    def test_refreshed_rows_are_returned_with_new_dates(self):
+        web_app.save_articles_to_db(self.db_name, [make_article(1), make_article(2)], "India")
+        processed_id = self.article_ids()["https://example.com/2"]
+        self.db.execute("UPDATE articles SET is_processed = 1 WHERE id = ?", (processed_id,))
+
+        rescraped = [make_article(1, title="Updated", publish_date="2024-05-03 08:00:00"),
+                     make_article(2, title="Updated")]
+        saved_ids, known_urls, _ = web_app.save_articles_to_db(
+            self.db_name, rescraped, "India", refresh_urls={"https://example.com/1", "https://example.com/2"}
+        )
+
+        self.assertEqual(saved_ids, {"https://example.com/1": self.article_ids()["https://example.com/1"]})
+        self.assertEqual(known_urls, ["https://example.com/2"])
+        refreshed = self.db.query_one("SELECT title, publish_day, last_scraped_at FROM articles WHERE original_url = ?",
+                                      ("https://example.com/1",))
+        self.assertEqual(refreshed["title"], "Updated")
+        self.assertEqual(refreshed["publish_day"], "2024-05-03")
+        self.assertIsNotNone(refreshed["last_scraped_at"])
+        # Articles already handled by the AI writer keep their content
+        processed = self.db.query_one("SELECT title FROM articles WHERE id = ?", (processed_id,))
+        self.assertEqual(processed["title"], "Article 2")
+
+    def test_store_fetched_articles_returns_refreshed_articles(self):
+        with mock.patch.object(web_app, "DB_FILE", self.db_name):
+            first = web_app.store_fetched_articles([make_article(1)], "India")
+            again = web_app.store_fetched_articles([make_article(1)], "India")
+            refreshed = web_app.store_fetched_articles([make_article(1, title="Updated")], "India",
+                                                       refresh_urls={"https://example.com/1"})
+
+        self.assertEqual(again, [])
+        self.assertEqual([(a["id"], a["title"]) for a in refreshed], [(first[0]["id"], "Updated")])
+
+
+class SelectUrlsToScrapeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_name = os.path.join(self.tmp_dir.name, "articles.db")
+        web_app.setup_database(self.db_name)
+        self.db = get_database(self.db_name)
+        self.patch_db = mock.patch.object(web_app, "db", self.db)
+        self.patch_db.start()
+
+        web_app.save_articles_to_db(self.db_name, [make_article(n) for n in ("fresh", "stale", "processed")], "India")
+        now = time.time()
+        self.db.execute("UPDATE articles SET last_scraped_at = ? WHERE original_url LIKE '%/fresh'", (now,))
+        self.db.execute("UPDATE articles SET last_scraped_at = ? WHERE original_url LIKE '%/stale'", (now - 48 * 3600,))
+        self.db.execute("UPDATE articles SET is_processed = 1, last_scraped_at = ? WHERE original_url LIKE '%/processed'",
+                        (now - 48 * 3600,))
+        self.candidates = [f"https://example.com/{n}" for n in ("new", "fresh", "stale", "processed", "other")]
+
+    def tearDown(self):
+        self.patch_db.stop()
+        self.db.close()
+        self.tmp_dir.cleanup()
+
+    def test_archived_urls_are_skipped_without_refresh_policy(self):
+        with mock.patch.object(web_app, "ARTICLE_REFRESH_HOURS", 0):
+            to_scrape, stale_urls = web_app.select_urls_to_scrape(self.candidates, limit=10)
+
+        self.assertEqual(to_scrape, ["https://example.com/new", "https://example.com/other"])
+        self.assertEqual(stale_urls, set())
+
+    def test_stale_archived_urls_are_rescraped(self):
+        with mock.patch.object(web_app, "ARTICLE_REFRESH_HOURS", 24):
+            to_scrape, stale_urls = web_app.select_urls_to_scrape(self.candidates, limit=10)
+
+        self.assertEqual(to_scrape, ["https://example.com/new", "https://example.com/stale", "https://example.com/other"])
+        self.assertEqual(stale_urls, {"https://example.com/stale"})
+
+    def test_refresh_rescrapes_every_unprocessed_url(self):
+        with mock.patch.object(web_app, "ARTICLE_REFRESH_HOURS", 0):
+            to_scrape, stale_urls = web_app.select_urls_to_scrape(self.candidates, limit=10, refresh=True)
+
+        self.assertNotIn("https://example.com/processed", to_scrape)
+        self.assertEqual(stale_urls, {"https://example.com/fresh", "https://example.com/stale"})
+        self.assertEqual(len(to_scrape), 4)
+
+    def test_limit_counts_urls_to_scrape(self):
+        with mock.patch.object(web_app, "ARTICLE_REFRESH_HOURS", 0):
+            to_scrape, _ = web_app.select_urls_to_scrape(self.candidates, limit=1)
+
+        self.assertEqual(to_scrape, ["https://example.com/new"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Tests for the shared GoogleNews result page cache.
+
+GoogleNews itself is replaced by a fake page fetcher, so no network is used.
+
+Run from this directory:
+    python -m unittest test_google_news_cache
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+import web_app
+
+
+class FakePages:
+    """Stands in for fetch_google_news_page, counting calls per page."""
+
+    def __init__(self, results=None, release=None):
+        self.results = results or (lambda page: [{"link": f"https://example.com/{page}"}])
+        self.release = release
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, full_search_term, page):
+        with self.lock:
+            self.calls.append(page)
+        if self.release is not None:
+            self.release.wait(5)
+        return self.results(page)
+
+
+class FakeResponse:
+    def read(self):
+        return b"<html><body></body></html>"
+
+    def close(self):
+        pass
+
+
+class FetchGoogleNewsPageTest(unittest.TestCase):
+    def fetch(self, page):
+        urls = []
+
+        def urlopen(request, *args, **kwargs):
+            urls.append(request.full_url)
+            return FakeResponse()
+
+        with mock.patch("urllib.request.urlopen", urlopen):
+            web_app.fetch_google_news_page("Chennai rain", page)
+        return urls
+
+    def test_first_page_is_the_news_google_search(self):
+        urls = self.fetch(0)
+
+        self.assertEqual(len(urls), 1)
+        self.assertTrue(urls[0].startswith("https://news.google.com/search?q=Chennai"))
+
+    def test_later_pages_make_one_request_each(self):
+        urls = self.fetch(3)
+
+        # No news.google.com search first: only the google.com result page itself
+        self.assertEqual(len(urls), 1)
+        self.assertTrue(urls[0].startswith("https://www.google.com/search?"))
+        self.assertIn("q=Chennai%20rain", urls[0])
+        self.assertTrue(urls[0].endswith("&start=20"))
+
+
+class GoogleNewsCacheTest(unittest.TestCase):
+    def setUp(self):
+        web_app._google_news_cache.clear()
+
+    def tearDown(self):
+        web_app._google_news_cache.clear()
+
+    def get_page(self, page, term="Chennai"):
+        return web_app.get_google_news_page(term, "", "", term, page)
+
+    def test_repeated_requests_hit_cache(self):
+        fake = FakePages()
+        with mock.patch.object(web_app, "fetch_google_news_page", fake):
+            first = asyncio.run(self.get_page(1))
+            second = asyncio.run(self.get_page(1))
+            # The key ignores case and surrounding spaces of the search term
+            third = asyncio.run(self.get_page(1, term="  chennai "))
+
+        self.assertEqual(first, [{"link": "https://example.com/1"}])
+        self.assertEqual(second, first)
+        self.assertEqual(third, first)
+        self.assertEqual(fake.calls, [1])
+
+    def test_cached_results_are_copies(self):
+        with mock.patch.object(web_app, "fetch_google_news_page", FakePages()):
+            asyncio.run(self.get_page(1)).append({"link": "added by caller"})
+            self.assertEqual(len(asyncio.run(self.get_page(1))), 1)
+
+    def test_expired_pages_are_fetched_again(self):
+        fake = FakePages()
+        with mock.patch.object(web_app, "fetch_google_news_page", fake), \
+                mock.patch.object(web_app, "GOOGLE_NEWS_CACHE_TTL", 0.05):
+            asyncio.run(self.get_page(1))
+            time.sleep(0.1)
+            asyncio.run(self.get_page(1))
+
+        self.assertEqual(fake.calls, [1, 1])
+
+    def test_concurrent_requests_share_one_download(self):
+        release = threading.Event()
+        fake = FakePages(release=release)
+
+        async def scenario():
+            waiters = [asyncio.ensure_future(self.get_page(2)) for _ in range(3)]
+            # A caller giving up must not cancel the download the others are waiting on
+            impatient = asyncio.ensure_future(asyncio.wait_for(self.get_page(2), timeout=0.05))
+            with self.assertRaises(asyncio.TimeoutError):
+                await impatient
+            release.set()
+            return await asyncio.gather(*waiters)
+
+        with mock.patch.object(web_app, "fetch_google_news_page", fake):
+            results = asyncio.run(scenario())
+
+        self.assertEqual(fake.calls, [2])
+        self.assertEqual(results, [[{"link": "https://example.com/2"}]] * 3)
+
+    def test_empty_pages_are_not_cached(self):
+        fake = FakePages(results=lambda page: [])
+        with mock.patch.object(web_app, "fetch_google_news_page", fake):
+            self.assertEqual(asyncio.run(self.get_page(3)), [])
+            self.assertEqual(asyncio.run(self.get_page(3)), [])
+
+        self.assertEqual(fake.calls, [3, 3])
+        self.assertEqual(web_app._google_news_cache, {})
+
+    def test_failed_pages_are_not_cached(self):
+        def results(page):
+            if len(fake.calls) == 1:
+                raise ConnectionError("429 Too Many Requests")
+            return [{"link": "https://example.com/retry"}]
+
+        fake = FakePages(results=results)
+        with mock.patch.object(web_app, "fetch_google_news_page", fake):
+            with self.assertRaises(ConnectionError):
+                asyncio.run(self.get_page(4))
+            self.assertEqual(asyncio.run(self.get_page(4)), [{"link": "https://example.com/retry"}])
+
+        self.assertEqual(fake.calls, [4, 4])
+
+    def test_cache_size_is_bounded(self):
+        with mock.patch.object(web_app, "fetch_google_news_page", FakePages()), \
+                mock.patch.object(web_app, "GOOGLE_NEWS_CACHE_MAX_ENTRIES", 3):
+            for page in range(1, 6):
+                asyncio.run(self.get_page(page))
+
+        self.assertEqual([key[3] for key in web_app._google_news_cache], [3, 4, 5])
+
+    def test_search_stops_at_first_empty_page_and_skips_failures(self):
+        def results(page):
+            if page == 2:
+                raise ConnectionError("timed out")
+            return [] if page == 4 else [{"link": f"https://example.com/{page}"}]
+
+        with mock.patch.object(web_app, "fetch_google_news_page", FakePages(results=results)):
+            with self.assertLogs(level="WARNING"):
+                all_results = asyncio.run(web_app.search_google_news("Chennai", "", "", "Chennai", 1, 5))
+
+        # search() results stand in for page 1, so pages 2-5 follow page 0
+        self.assertEqual([r["link"] for r in all_results], ["https://example.com/0", "https://example.com/3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+Tests for the persisted background job queue.
+
+Run from this directory:
+    python -m unittest test_job_queue
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from job_queue import DONE, FAILED, QUEUED, RUNNING, JobError, JobQueue
+from news_db import Database
+
+WAIT_SECONDS = 5
+
+
+class JobQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmp_dir.name, "jobs.db"))
+        self.queues = []
+
+    def tearDown(self):
+        for job_queue in self.queues:
+            job_queue.shutdown()
+        self.db.close()
+        self.tmp_dir.cleanup()
+
+    def make_queue(self, handlers, concurrency=None):
+        job_queue = JobQueue(self.db, concurrency=concurrency or {})
+        for kind, handler in handlers.items():
+            job_queue.register(kind, handler)
+        self.queues.append(job_queue)
+        return job_queue
+
+    def wait_for(self, job_queue, job_id, statuses):
+        deadline = time.time() + WAIT_SECONDS
+        while time.time() < deadline:
+            job = job_queue.get(job_id)
+            if job["status"] in statuses:
+                return job
+            time.sleep(0.01)
+        self.fail(f"job {job_id} never reached {statuses}: {job_queue.get(job_id)}")
+
+    def test_submit_starts_queue_lazily_and_returns_result(self):
+        job_queue = self.make_queue({"echo": lambda payload, report: {"echo": payload["text"]}})
+
+        # Nothing called start(): the first submit creates the table and starts dispatching
+        job_id = job_queue.submit("echo", {"text": "வணக்கம்"})
+        job = self.wait_for(job_queue, job_id, (DONE,))
+
+        self.assertTrue(job_queue.started)
+        self.assertEqual(job["result"], {"echo": "வணக்கம்"})
+        self.assertEqual(job["attempts"], 1)
+        self.assertEqual(job["progress"], "Done")
+
+    def test_get_unknown_job_on_fresh_database(self):
+        job_queue = self.make_queue({"echo": lambda payload, report: None})
+        self.assertIsNone(job_queue.get("missing"))
+
+    def test_pending_job_with_same_dedupe_key_is_reused(self):
+        release = threading.Event()
+
+        def slow(payload, report):
+            release.wait(WAIT_SECONDS)
+            return payload
+
+        job_queue = self.make_queue({"video": slow})
+        first = job_queue.submit("video", {"article_id": 1}, dedupe_key="1")
+        second = job_queue.submit("video", {"article_id": 1}, dedupe_key="1")
+        other = job_queue.submit("video", {"article_id": 2}, dedupe_key="2")
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+        release.set()
+        self.wait_for(job_queue, first, (DONE,))
+        # A finished job is not reused
+        self.assertNotEqual(job_queue.submit("video", {"article_id": 1}, dedupe_key="1"), first)
+
+    def test_concurrency_is_capped_per_kind(self):
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def tracked(payload, report):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        job_queue = self.make_queue({"voice": tracked}, concurrency={"voice": 2})
+        job_ids = [job_queue.submit("voice", {"n": n}) for n in range(6)]
+        for job_id in job_ids:
+            self.wait_for(job_queue, job_id, (DONE,))
+
+        self.assertEqual(peak[0], 2)
+
+    def test_job_error_fails_job_with_message(self):
+        def reject(payload, report):
+            report("Checking article")
+            raise JobError("Article not found.")
+
+        job_queue = self.make_queue({"voice": reject})
+        job = self.wait_for(job_queue, job_queue.submit("voice", {}), (FAILED,))
+
+        self.assertEqual(job["error"], "Article not found.")
+        self.assertEqual(job["progress"], "Failed")
+        self.assertIsNotNone(job["finished_at"])
+
+    def test_unexpected_exception_fails_job(self):
+        def broken(payload, report):
+            raise KeyError("image_path")
+
+        job_queue = self.make_queue({"ai_writer": broken})
+        with self.assertLogs(level="ERROR"):
+            job = self.wait_for(job_queue, job_queue.submit("ai_writer", {}), (FAILED,))
+
+        self.assertIn("image_path", job["error"])
+
+    def test_unknown_kind_is_rejected(self):
+        job_queue = self.make_queue({"echo": lambda payload, report: None})
+        with self.assertRaises(ValueError):
+            job_queue.submit("missing", {})
+
+    def test_restart_requeues_interrupted_and_queued_jobs(self):
+        # A queue that persisted jobs but was never started stands in for a process that died
+        dead = self.make_queue({"echo": lambda payload, report: payload})
+        dead.setup()
+        with self.db.writer() as conn:
+            for job_id, status in (("interrupted", RUNNING), ("waiting", QUEUED)):
+                conn.execute(
+                    "INSERT INTO jobs (id, kind, status, payload, progress, attempts, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, "echo", status, '{"id": "%s"}' % job_id, "Started", 1 if status == RUNNING else 0, time.time())
+                )
+
+        job_queue = self.make_queue({"echo": lambda payload, report: payload})
+        job_queue.start()
+
+        interrupted = self.wait_for(job_queue, "interrupted", (DONE,))
+        waiting = self.wait_for(job_queue, "waiting", (DONE,))
+        self.assertEqual(interrupted["result"], {"id": "interrupted"})
+        self.assertEqual(interrupted["attempts"], 2)
+        self.assertEqual(waiting["attempts"], 1)
+
+    def test_start_removes_old_finished_jobs(self):
+        job_queue = self.make_queue({"echo": lambda payload, report: None})
+        job_queue.setup()
+        old = time.time() - 30 * 86400
+        with self.db.writer() as conn:
+            conn.execute("INSERT INTO jobs (id, kind, status, created_at, finished_at) VALUES ('old', 'echo', ?, ?, ?)",
+                         (DONE, old, old))
+
+        job_queue.start()
+        self.assertIsNone(job_queue.get("old"))
+
+
+if __name__ == "__main__":
+    unittest.main()
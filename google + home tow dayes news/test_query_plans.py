@@ -0,0 +1,99 @@
+"""
+EXPLAIN QUERY PLAN regression test for the article list queries.
+
+Every page query must be answered from one of the partial indexes created by
+setup_database, never by scanning the whole articles table.
+
+Run from this directory:
+    python -m unittest test_query_plans
+"""
+
+import os
+import tempfile
+import unittest
+
+import web_app
+from news_db import get_database
+
+DATE_FILTERS = [
+    ("no dates", "", ""),
+    ("from", "2024-05-01", ""),
+    ("to", "", "2024-05-31"),
+    ("from and to", "2024-05-01", "2024-05-31"),
+]
+
+# Each distinct list query once; the home page shares UNPROCESSED_QUERY (INDEX_QUERY is an alias)
+LIST_PAGE_QUERIES = [
+    ("unprocessed", web_app.UNPROCESSED_QUERY),
+    ("processed", web_app.PROCESSED_QUERY),
+]
+
+
+class QueryPlanTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.db_name = os.path.join(cls.tmp_dir.name, "plans.db")
+        web_app.setup_database(cls.db_name)
+        cls.db = get_database(cls.db_name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        cls.tmp_dir.cleanup()
+
+    def plan(self, query, params):
+        return [row["detail"] for row in self.db.query("EXPLAIN QUERY PLAN " + query, params)]
+
+    def assert_indexed(self, name, query, params):
+        plan = self.plan(query, params)
+        table_steps = [step for step in plan if step.startswith(("SCAN articles", "SEARCH articles"))]
+        self.assertTrue(table_steps, f"{name}: no step reads articles in {plan}")
+        for step in table_steps:
+            self.assertIn("INDEX", step, f"{name}: full table scan in {plan}")
+
+    def test_list_pages_use_indexes(self):
+        for base_name, base_query in LIST_PAGE_QUERIES:
+            for filter_name, date_from, date_to in DATE_FILTERS:
+                with self.subTest(page=base_name, dates=filter_name):
+                    query, params = web_app.build_date_query(base_query, date_from, date_to)
+                    self.assert_indexed(f"{base_name} ({filter_name})", query, params)
+
+    def test_category_page_uses_index(self):
+        for filter_name, date_from, date_to in DATE_FILTERS:
+            with self.subTest(dates=filter_name):
+                query, params = web_app.build_date_query(
+                    web_app.CATEGORY_QUERY, date_from, date_to,
+                    params=["India"], limit=web_app.CATEGORY_PAGE_LIMIT
+                )
+                plan = self.plan(query, params)
+                self.assert_indexed(f"category ({filter_name})", query, params)
+                self.assertTrue(any("idx_articles_category_fetched" in step for step in plan), plan)
+
+    def test_keyset_pages_use_indexes(self):
+        for base_name, base_query in LIST_PAGE_QUERIES:
+            for filter_name, date_from, date_to in DATE_FILTERS:
+                with self.subTest(page=base_name, dates=filter_name):
+                    query, params = web_app.build_date_query(
+                        base_query, date_from, date_to,
+                        limit=web_app.ARTICLES_PAGE_SIZE + 1, cursor=(1714636800, 42)
+                    )
+                    self.assert_indexed(f"{base_name} page 2 ({filter_name})", query, params)
+
+    def test_archived_url_lookup_uses_unique_index(self):
+        # Each URL in the batch is one probe of the UNIQUE index on original_url
+        plan = self.plan(web_app.ARCHIVED_URLS_QUERY, ['["http://a", "http://b"]'])
+        self.assertTrue(any(step.startswith("SEARCH a USING") and "INDEX" in step and "original_url=?" in step
+                            for step in plan), plan)
+
+    def test_unfiltered_lists_need_no_sort(self):
+        # Without a date window the pages are read straight off the index in fetched_at order
+        for base_name, base_query in LIST_PAGE_QUERIES:
+            with self.subTest(page=base_name):
+                query, params = web_app.build_date_query(base_query, "", "")
+                plan = self.plan(query, params)
+                self.assertFalse(any("TEMP B-TREE" in step for step in plan), plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
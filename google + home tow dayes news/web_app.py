@@ -7,6 +7,10 @@ from pathlib import Path
 import sqlite3
 import os
 import io
+import html
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
 # --- Image Processing Libraries ---
 from PIL import Image, ImageSequence, ImageEnhance 
@@ -15,7 +19,8 @@ import google.generativeai as genai
 from dateutil import parser
 from GoogleNews import GoogleNews
 from newspaper import Article, Config
-from flask import Flask, render_template, request, jsonify
+import aiohttp
+from flask import Flask, render_template, request, jsonify, url_for
 from apscheduler.schedulers.background import BackgroundScheduler
 import shutil
 from elevenlabs.client import ElevenLabs
@@ -27,11 +32,27 @@ from datetime import datetime, timedelta  # <--- timedelta-வை இங்க
 from google.cloud import texttospeech
 from google.oauth2 import service_account
 
+from news_db import get_database
+from job_queue import JobQueue, JobError
+
 # --- Configuration ---------------------------------------------------
 MIN_TEXT_LENGTH = 250
 DB_FILE = "news_archive.db"
 DEFAULT_ARTICLES_TO_FETCH = 20
 DEFAULT_MAX_CONCURRENT = 50
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", os.cpu_count() or 4))
+FETCH_JOB_TIMEOUT = 300          # seconds a request handler waits for a scrape job
+GOOGLE_NEWS_CACHE_TTL = 600      # seconds a GoogleNews result page is reused across requests and the scheduler
+GOOGLE_NEWS_CACHE_MAX_ENTRIES = 500
+ARTICLE_REFRESH_HOURS = float(os.environ.get("ARTICLE_REFRESH_HOURS", 0))   # re-scrape archived articles older than this; 0 = never
+JOB_CONCURRENCY = {'ai_writer': 2, 'voice': 2, 'video': 1}   # jobs of each kind run at once
+CATEGORY_PAGE_LIMIT = 50
+ARTICLES_PAGE_SIZE = int(os.environ.get("ARTICLES_PAGE_SIZE", 30))
+MAX_PAGE_SIZE = 100
+SEARCH_RESULTS_LIMIT = 30
+SEARCH_MIN_LOCAL_RESULTS = 5     # fewer local hits than this triggers a live GoogleNews fetch
+SEARCH_STALE_HOURS = 6           # so does a newest local hit older than this
+BACKFILL_BATCH_SIZE = 500
 JSON_OUTPUT_DIR = Path("news_articles")
 ELEVENLABS_AUDIO_DIR = Path("static/audio")
 IMAGE_OUTPUT_DIR = Path("static/images")
@@ -200,11 +221,15 @@ def add_watermark_and_create_gif(input_image_path, output_filename):
         return None
 
 # --- Database Functions ----------------
+db = get_database(DB_FILE)
+
 def setup_database(db_name):
-    conn = sqlite3.connect(db_name)
-    cursor = conn.cursor()
-    cursor.execute("PRAGMA journal_mode=WAL;")
-    
+    with get_database(db_name).writer() as conn:
+        _create_schema(conn.cursor())
+    backfill_normalized_dates(db_name)
+    logging.info(f"Database '{db_name}' initialized.")
+
+def _create_schema(cursor):
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS articles (
         id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, authors TEXT, publish_date TEXT, 
@@ -217,7 +242,10 @@ def setup_database(db_name):
         ai_title TEXT,
         ai_content TEXT,
         ai_generated_image_path TEXT,
-        ai_generated_video_path TEXT
+        ai_generated_video_path TEXT,
+        publish_day TEXT,
+        fetched_at INTEGER,
+        last_scraped_at INTEGER
     )
     """)
     
@@ -239,44 +267,343 @@ def setup_database(db_name):
     try: cursor.execute("ALTER TABLE articles DROP COLUMN source")
     except sqlite3.OperationalError: pass
 
-    conn.commit()
-    conn.close()
-    logging.info(f"Database '{db_name}' initialized.")
+    # Normalized copies of publish_date / fetch_timestamp that the list queries filter and sort on
+    try: cursor.execute("SELECT publish_day FROM articles LIMIT 1")
+    except sqlite3.OperationalError: cursor.execute("ALTER TABLE articles ADD COLUMN publish_day TEXT"); cursor.execute("ALTER TABLE articles ADD COLUMN fetched_at INTEGER")
 
-def save_articles_to_db(db_name, articles_list, category_name):
-    conn = sqlite3.connect(db_name)
-    cursor = conn.cursor()
-    cursor.execute("PRAGMA journal_mode=WAL;")
-    inserted_count = 0
-    
-    sql = """
-    INSERT OR IGNORE INTO articles (
-        title, authors, publish_date, text, text_length, top_image,
-        keywords, summary, canonical_link, original_url, fetch_timestamp, category
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    try: cursor.execute("SELECT last_scraped_at FROM articles LIMIT 1")
+    except sqlite3.OperationalError: cursor.execute("ALTER TABLE articles ADD COLUMN last_scraped_at INTEGER")
+
+    _create_list_indexes(cursor)
+    _create_stats_table(cursor)
+    _create_search_index(cursor)
+
+# One index per list query shape (see INDEX_QUERY and friends); test_query_plans.py checks they are used
+def _create_list_indexes(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_unprocessed_fetched ON articles (fetched_at) WHERE is_processed = 0")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_unprocessed_day ON articles (publish_day, fetched_at) WHERE is_processed = 0")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_processed_fetched ON articles (fetched_at) WHERE is_processed = 1")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_category_fetched ON articles (category, fetched_at) WHERE is_processed = 0")
+
+def normalize_publish_day(date_str):
+    if not date_str or date_str == "None": return None
+    try:
+        return parser.parse(date_str).strftime('%Y-%m-%d')
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+def normalize_fetch_time(timestamp_str):
+    # 0 for unparseable values, so the backfill does not pick the row up again
+    try:
+        return int(parser.parse(timestamp_str).timestamp())
+    except (ValueError, TypeError, OverflowError):
+        return 0
+
+def backfill_normalized_dates(db_name, batch_size=BACKFILL_BATCH_SIZE):
+    # Small transactions, so the web app keeps reading (and the scheduler writing) during a long migration
+    database = get_database(db_name)
+    total = 0
+    last_id = 0
+    while True:
+        rows = database.query(
+            "SELECT id, publish_date, fetch_timestamp FROM articles WHERE id > ? AND fetched_at IS NULL ORDER BY id LIMIT ?",
+            (last_id, batch_size)
+        )
+        if not rows: break
+        last_id = rows[-1]["id"]
+        with database.writer() as conn:
+            conn.executemany(
+                "UPDATE articles SET publish_day = ?, fetched_at = ? WHERE id = ?",
+                [(normalize_publish_day(row["publish_date"]), normalize_fetch_time(row["fetch_timestamp"]), row["id"]) for row in rows]
+            )
+        total += len(rows)
+    if total:
+        logging.info(f"Backfilled normalized dates for {total} articles.")
+
+# Article counts per (category, is_processed), kept current by triggers so page renders never COUNT(*)
+def _create_stats_table(cursor):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'article_stats'")
+    is_new = cursor.fetchone() is None
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS article_stats (
+        category TEXT NOT NULL,
+        is_processed INTEGER NOT NULL,
+        article_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (category, is_processed)
+    ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS article_stats_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO article_stats (category, is_processed, article_count)
+        VALUES (COALESCE(NEW.category, ''), COALESCE(NEW.is_processed, 0), 1)
+        ON CONFLICT (category, is_processed) DO UPDATE SET article_count = article_count + 1;
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS article_stats_delete AFTER DELETE ON articles BEGIN
+        UPDATE article_stats SET article_count = article_count - 1
+        WHERE category = COALESCE(OLD.category, '') AND is_processed = COALESCE(OLD.is_processed, 0);
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS article_stats_update AFTER UPDATE OF category, is_processed ON articles
+    WHEN COALESCE(OLD.category, '') != COALESCE(NEW.category, '')
+      OR COALESCE(OLD.is_processed, 0) != COALESCE(NEW.is_processed, 0)
+    BEGIN
+        UPDATE article_stats SET article_count = article_count - 1
+        WHERE category = COALESCE(OLD.category, '') AND is_processed = COALESCE(OLD.is_processed, 0);
+        INSERT INTO article_stats (category, is_processed, article_count)
+        VALUES (COALESCE(NEW.category, ''), COALESCE(NEW.is_processed, 0), 1)
+        ON CONFLICT (category, is_processed) DO UPDATE SET article_count = article_count + 1;
+    END
+    """)
+
+    # Existing archives are counted once when the table is first created; the triggers take over from there
+    if is_new:
+        cursor.execute("""
+        INSERT INTO article_stats (category, is_processed, article_count)
+        SELECT COALESCE(category, ''), COALESCE(is_processed, 0), COUNT(*) FROM articles
+        GROUP BY COALESCE(category, ''), COALESCE(is_processed, 0)
+        """)
+
+# Full-text index over title/summary/text; external content, so the text is not stored twice
+def _create_search_index(cursor):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'")
+    is_new = cursor.fetchone() is None
+    try:
+        cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, summary, text, content='articles', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+        )
+        """)
+    except sqlite3.OperationalError as e:
+        logging.warning(f"!!! SQLite FTS5 not available ({e}). Search will always fetch live. !!!")
+        return
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts (rowid, title, summary, text) VALUES (NEW.id, NEW.title, NEW.summary, NEW.text);
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, title, summary, text) VALUES ('delete', OLD.id, OLD.title, OLD.summary, OLD.text);
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, summary, text ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, title, summary, text) VALUES ('delete', OLD.id, OLD.title, OLD.summary, OLD.text);
+        INSERT INTO articles_fts (rowid, title, summary, text) VALUES (NEW.id, NEW.title, NEW.summary, NEW.text);
+    END
+    """)
+
+    if is_new:
+        cursor.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+
+def has_search_index():
+    return db.query_one("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'") is not None
+
+def to_fts_query(search_term):
+    # Every word quoted, so user input is never parsed as FTS5 syntax; words are ANDed
+    words = search_term.split()
+    return " ".join('"' + word.replace('"', '""') + '"' for word in words)
+
+def format_snippet(raw_snippet):
+    # snippet() marks hits with \x02/\x03; escape the article text first, then turn the marks into <mark>
+    return html.escape(raw_snippet or "").replace("\x02", "<mark>").replace("\x03", "</mark>")
+
+def search_local_articles(search_term, date_from=None, date_to=None, limit=SEARCH_RESULTS_LIMIT):
+    fts_query = to_fts_query(search_term)
+    if not fts_query or not has_search_index(): return []
+
+    # bm25 weights: a hit in the title counts more than one in the summary, and both more than the body
+    query = """
+        SELECT a.id, a.title, a.summary, a.text, a.original_url, a.category, a.publish_date, a.fetched_at,
+               snippet(articles_fts, -1, char(2), char(3), '…', 24) AS snippet,
+               bm25(articles_fts, 10.0, 4.0, 1.0) AS rank
+        FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid
+        WHERE articles_fts MATCH ?
     """
-    for article in articles_list:
-        try:
-            authors_str = json.dumps(article.get('authors', []))
-            keywords_str = json.dumps(article.get('keywords', []))
-            cursor.execute(sql, (
-                article.get('title'), authors_str, article.get('publish_date'),
-                article.get('text'), article.get('text_length'), article.get('top_image'),
-                keywords_str, article.get('summary'), article.get('canonical_link'),
-                article.get('original_url'), article.get('fetch_timestamp'),
-                category_name
-            ))
-            inserted_count += cursor.rowcount
-        except sqlite3.Error as e:
-            logging.error(f"Failed to insert article: {e}")
-    conn.commit()
-    conn.close()
-    return inserted_count
+    params = [fts_query]
+    if date_from:
+        query += " AND a.publish_day >= ? "
+        params.append(date_from)
+    if date_to:
+        query += " AND a.publish_day <= ? "
+        params.append(date_to)
+    query += " ORDER BY rank LIMIT ?"
+    params.append(limit)
+
+    try:
+        rows = db.query(query, params)
+    except sqlite3.OperationalError as e:
+        logging.error(f"Local search failed for '{search_term}': {e}")
+        return []
+
+    results = []
+    for row in rows:
+        article_dict = dict(row)
+        article_dict['snippet'] = format_snippet(article_dict['snippet'])
+        article_dict['publish_date'] = format_date_filter(article_dict['publish_date'])
+        article_dict['source'] = 'local'
+        results.append(article_dict)
+    return results
+
+def local_results_need_live_fetch(results):
+    if len(results) < SEARCH_MIN_LOCAL_RESULTS: return True
+    newest = max(result['fetched_at'] or 0 for result in results)
+    return time.time() - newest > SEARCH_STALE_HOURS * 3600
+
+def get_article_stats():
+    stats = {"total": 0, "processed": 0, "unprocessed": 0, "categories": {}, "unprocessed_by_category": {}}
+    for row in db.query("SELECT category, is_processed, article_count FROM article_stats"):
+        count = row["article_count"]
+        stats["total"] += count
+        stats["categories"][row["category"]] = stats["categories"].get(row["category"], 0) + count
+        if row["is_processed"]:
+            stats["processed"] += count
+        else:
+            stats["unprocessed"] += count
+            stats["unprocessed_by_category"][row["category"]] = count
+    return stats
+
+ARTICLE_INSERT_COLUMNS = (
+    "title", "authors", "publish_date", "text", "text_length", "top_image",
+    "keywords", "summary", "canonical_link", "original_url", "fetch_timestamp", "category",
+    "publish_day", "fetched_at"
+)
+SQLITE_DEFAULT_MAX_VARIABLES = 999
+
+def _article_row(article, category_name):
+    return (
+        article.get('title'), json.dumps(article.get('authors', [])), article.get('publish_date'),
+        article.get('text'), article.get('text_length'), article.get('top_image'),
+        json.dumps(article.get('keywords', [])), article.get('summary'), article.get('canonical_link'),
+        article.get('original_url'), article.get('fetch_timestamp'),
+        category_name,
+        normalize_publish_day(article.get('publish_date')),
+        normalize_fetch_time(article.get('fetch_timestamp'))
+    )
+
+# Inserts a batch in one transaction; returns ({url: id} of new or refreshed rows, [urls already archived],
+# [urls whose insert failed]). Archived, unprocessed articles listed in refresh_urls get their scraped content replaced.
+def save_articles_to_db(db_name, articles_list, category_name, refresh_urls=()):
+    rows = [_article_row(article, category_name) for article in articles_list if article.get('original_url')]
+    saved_ids = {}
+    failed_urls = []
+
+    # sqlite3's executemany discards RETURNING rows, so rows go in as multi-row INSERTs,
+    # as many per statement as SQLite's bound-variable limit allows
+    with get_database(db_name).writer() as conn:
+        max_variables = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER) if hasattr(conn, 'getlimit') else SQLITE_DEFAULT_MAX_VARIABLES
+        chunk_size = max(1, max_variables // len(ARTICLE_INSERT_COLUMNS))
+        row_placeholders = "(" + ", ".join("?" for _ in ARTICLE_INSERT_COLUMNS) + ")"
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            sql = f"""
+            INSERT INTO articles ({", ".join(ARTICLE_INSERT_COLUMNS)})
+            VALUES {", ".join(row_placeholders for _ in chunk)}
+            ON CONFLICT (original_url) DO NOTHING
+            RETURNING id, original_url
+            """
+            try:
+                for row in conn.execute(sql, [value for article_row in chunk for value in article_row]):
+                    saved_ids[row["original_url"]] = row["id"]
+            except sqlite3.Error as e:
+                # A failed statement leaves the rest of the transaction intact; its URLs are reported, not counted as archived
+                logging.error(f"Failed to insert {len(chunk)} articles: {e}")
+                failed_urls.extend(article_row[ARTICLE_INSERT_COLUMNS.index("original_url")] for article_row in chunk)
+
+        refreshed = 0
+        for article in articles_list:
+            url = article.get('original_url')
+            if url not in refresh_urls or url in saved_ids or url in failed_urls: continue
+            # One statement per row: executemany would discard the RETURNING ids
+            row = conn.execute("""
+                UPDATE articles SET title = ?, authors = ?, publish_date = COALESCE(?, publish_date),
+                    publish_day = COALESCE(?, publish_day), text = ?, text_length = ?,
+                    top_image = ?, keywords = ?, summary = ?, canonical_link = ?, last_scraped_at = ?
+                WHERE original_url = ? AND is_processed = 0
+                RETURNING id
+            """, (
+                article.get('title'), json.dumps(article.get('authors', [])), article.get('publish_date'),
+                normalize_publish_day(article.get('publish_date')), article.get('text'), article.get('text_length'),
+                article.get('top_image'), json.dumps(article.get('keywords', [])), article.get('summary'),
+                article.get('canonical_link'), int(time.time()), url
+            )).fetchone()
+            if row:
+                saved_ids[url] = row["id"]
+                refreshed += 1
+        if refreshed:
+            logging.info(f"Refreshed {refreshed} stale archived article(s).")
+
+    known_urls = [article['original_url'] for article in articles_list
+                  if article.get('original_url') and article['original_url'] not in saved_ids
+                  and article['original_url'] not in failed_urls]
+    return saved_ids, known_urls, failed_urls
+
+# --- Background Event Loop -------------------------------
+# One loop for the whole process: Flask handlers and the scheduler submit coroutines to it,
+# downloads share one aiohttp session, and newspaper parsing runs on a dedicated thread pool.
+_background_loop = None
+_background_loop_lock = threading.Lock()
+_http_session = None
+parse_executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+
+def get_background_loop():
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="event-loop", daemon=True).start()
+            _background_loop = loop
+            logging.info("--- Background event loop started. ---")
+        return _background_loop
+
+def run_in_background_loop(coro, timeout=FETCH_JOB_TIMEOUT):
+    future = asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise
+
+async def get_http_session():
+    # Created lazily inside the loop, which aiohttp requires; only ever touched from the loop thread
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=DEFAULT_MAX_CONCURRENT, ttl_dns_cache=300),
+            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'}
+        )
+    return _http_session
+
+def shutdown_background_loop():
+    global _background_loop
+    if _background_loop is None: return
+    if _http_session is not None and not _http_session.closed:
+        asyncio.run_coroutine_threadsafe(_http_session.close(), _background_loop).result(10)
+    _background_loop.call_soon_threadsafe(_background_loop.stop)
+    _background_loop = None
+    parse_executor.shutdown(wait=False, cancel_futures=True)
+
+atexit.register(shutdown_background_loop)
 
 # --- Scraper Functions -------------------------------
-def download_and_parse_sync(original_url, config, timeout=30):
+async def download_html_async(original_url, timeout):
+    session = await get_http_session()
+    async with session.get(original_url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+        if response.status >= 400: return None
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and 'html' not in content_type: return None
+        return await response.text(errors='replace')
+
+def download_and_parse_sync(original_url, config, timeout=30, html_text=None):
     article = Article(original_url, config=config)
-    article.download()
+    # With html_text the page was already downloaded asynchronously; newspaper only parses it
+    article.download(input_html=html_text)
     article.parse()
     article.nlp()
     pub_date = str(article.publish_date) if article.publish_date else datetime.now().isoformat()
@@ -292,16 +619,115 @@ def download_and_parse_sync(original_url, config, timeout=30):
 async def fetch_single_article_async(original_url, config, semaphore, timeout=30):
     async with semaphore:
         try:
-            await asyncio.sleep(0.1)
+            html_text = await download_html_async(original_url, timeout)
+            if not html_text: return None
+            loop = asyncio.get_running_loop()
             article_json = await asyncio.wait_for(
-                asyncio.to_thread(download_and_parse_sync, original_url, config, timeout),
+                loop.run_in_executor(parse_executor, download_and_parse_sync, original_url, config, timeout, html_text),
                 timeout=timeout
             )
             return article_json
         except Exception:
             return None
 
-async def fetch_and_parse_news(search_term, category_name, date_from=None, date_to=None, offset=0):
+# --- GoogleNews Result Pages (fetched concurrently, cached with a TTL) ---
+# Page 0 is what GoogleNews.search() returns (news.google.com); pages 1+ are google.com news result pages.
+# (term, date_from, date_to, page) -> (expires_at, task); only touched from the background loop, so no lock
+_google_news_cache = {}
+
+class GoogleNewsResultPage(GoogleNews):
+    # search() stores the encoded query and then fetches news.google.com through get_news(); with
+    # get_news() a no-op it only sets the query, so page_at() makes the single google.com request
+    def get_news(self, key="", deamplify=False):
+        pass
+
+def fetch_google_news_page(full_search_term, page):
+    # One GoogleNews per page: it keeps the current URL and response on the instance, so pages fetched
+    # in parallel can't share one. page_at() returns a single page without getpage()'s accumulated results
+    if page == 0:
+        googlenews = GoogleNews(lang='en')
+        googlenews.search(full_search_term)
+        return list(googlenews.results())
+    googlenews = GoogleNewsResultPage(lang='en')
+    googlenews.search(full_search_term)
+    return googlenews.page_at(page)
+
+def _prune_google_news_cache(now):
+    for key in [key for key, (expires_at, _) in _google_news_cache.items() if expires_at <= now]:
+        del _google_news_cache[key]
+    while len(_google_news_cache) > GOOGLE_NEWS_CACHE_MAX_ENTRIES:
+        del _google_news_cache[next(iter(_google_news_cache))]
+
+async def get_google_news_page(search_term, date_from, date_to, full_search_term, page):
+    key = (search_term.strip().lower(), date_from or '', date_to or '', page)
+    now = time.monotonic()
+    cached = _google_news_cache.get(key)
+    if cached is None or cached[0] <= now:
+        # Requests arriving while the page is still downloading await the same task
+        cached = (now + GOOGLE_NEWS_CACHE_TTL, asyncio.ensure_future(asyncio.to_thread(fetch_google_news_page, full_search_term, page)))
+        _google_news_cache[key] = cached
+        _prune_google_news_cache(now)
+
+    task = cached[1]
+    try:
+        # shield: a caller timing out must not cancel a download other callers are waiting on
+        results = await asyncio.shield(task)
+    except Exception:
+        results = None
+    if not results and _google_news_cache.get(key, (None, None))[1] is task:
+        del _google_news_cache[key]   # don't keep errors or empty pages (often rate limiting) for the full TTL
+    if results is None:
+        raise task.exception() or RuntimeError(f"GoogleNews page {page} failed")
+    return list(results)
+
+async def search_google_news(search_term, date_from, date_to, full_search_term, start_page, num_pages_to_fetch):
+    pages = [0] + ([start_page] if start_page > 1 else []) + list(range(start_page + 1, num_pages_to_fetch + 1))
+    page_results = await asyncio.gather(
+        *(get_google_news_page(search_term, date_from, date_to, full_search_term, page) for page in pages),
+        return_exceptions=True
+    )
+
+    all_results = []
+    for page, results in zip(pages, page_results):
+        if isinstance(results, Exception):
+            logging.warning(f"GoogleNews page {page} for '{full_search_term}' failed: {results}")
+            continue
+        # As with the old page-by-page loop, nothing after the first empty result page is used
+        if page > 0 and not results: break
+        all_results.extend(results)
+    return all_results
+
+# One indexed lookup for a whole batch of URLs; json_each keeps it to a single bound variable
+ARCHIVED_URLS_QUERY = """
+    SELECT a.original_url, a.is_processed, COALESCE(a.last_scraped_at, a.fetched_at, 0) AS last_scraped_at
+    FROM json_each(?) AS j JOIN articles a ON a.original_url = j.value
+"""
+
+def find_archived_urls(urls):
+    if not urls: return {}
+    return {row["original_url"]: row for row in db.query(ARCHIVED_URLS_QUERY, (json.dumps(urls),))}
+
+def select_urls_to_scrape(candidate_urls, limit, refresh=False):
+    # New URLs, plus archived ones that are stale (or all archived ones with refresh=True);
+    # articles already processed by the AI writer are never re-scraped
+    archived = find_archived_urls(candidate_urls)
+    stale_before = time.time() - ARTICLE_REFRESH_HOURS * 3600
+    to_scrape, stale_urls = [], set()
+    for url in candidate_urls:
+        row = archived.get(url)
+        if row is not None:
+            if row["is_processed"]: continue
+            if not refresh and not (ARTICLE_REFRESH_HOURS and row["last_scraped_at"] < stale_before): continue
+            stale_urls.add(url)
+        to_scrape.append(url)
+        if len(to_scrape) >= limit: break
+
+    skipped = len(archived) - len(stale_urls)
+    if skipped:
+        logging.info(f"Skipping {skipped} already archived URL(s); scraping {len(to_scrape)} ({len(stale_urls)} stale).")
+    return to_scrape, stale_urls
+
+async def fetch_and_parse_news(search_term, category_name, date_from=None, date_to=None, offset=0, refresh=False):
     num_articles = DEFAULT_ARTICLES_TO_FETCH
     max_concurrent = DEFAULT_MAX_CONCURRENT
     
@@ -315,37 +741,27 @@ async def fetch_and_parse_news(search_term, category_name, date_from=None, date_
             
     logging.info(f"--- Starting Scrape Job for Category: '{category_name}' (Search: '{full_search_term}', Offset: {offset}) ---")
     
-    googlenews = GoogleNews(lang='en')
-    googlenews.search(full_search_term) 
-
     start_page = (offset // 10) + 1 
-    if start_page > 1:
-        googlenews.getpage(start_page)
-        
     num_pages_to_fetch = start_page + ((num_articles + 9) // 10)
-    all_results = googlenews.results()
-    
-    if num_pages_to_fetch > start_page:
-        for page in range(start_page + 1, num_pages_to_fetch + 1):
-            googlenews.getpage(page)
-            page_results = googlenews.results()
-            if not page_results: break
-            all_results.extend(page_results)
+    all_results = await search_google_news(search_term, date_from, date_to, full_search_term, start_page, num_pages_to_fetch)
     
     config = Config()
     config.browser_user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     config.request_timeout = 15
     config.fetch_images = False
     semaphore = asyncio.Semaphore(max_concurrent)
-    tasks = []
+    candidate_urls = []
     seen_urls = set()
     
     for entry in all_results:
-        if len(tasks) >= num_articles: break
         original_url = entry['link'].split('&ved=')[0] 
         if original_url and original_url not in seen_urls and original_url.startswith('http'):
             seen_urls.add(original_url)
-            tasks.append(fetch_single_article_async(original_url, config, semaphore, timeout=config.request_timeout))
+            candidate_urls.append(original_url)
+
+    # Archived URLs are dropped before download, so only new (or stale) articles use the scrape slots
+    urls_to_scrape, stale_urls = await asyncio.to_thread(select_urls_to_scrape, candidate_urls, num_articles, refresh)
+    tasks = [fetch_single_article_async(url, config, semaphore, timeout=config.request_timeout) for url in urls_to_scrape]
 
     all_data = await asyncio.gather(*tasks)
     valid_articles = [data for data in all_data if data is not None]
@@ -354,40 +770,39 @@ async def fetch_and_parse_news(search_term, category_name, date_from=None, date_
         if article.get("text_length", 0) > MIN_TEXT_LENGTH and article.get("title"):
             filtered_articles.append(article)
     
-    newly_inserted_urls = [a['original_url'] for a in filtered_articles]
-    if newly_inserted_urls:
-        save_articles_to_db(DB_FILE, filtered_articles, category_name)
-        conn = sqlite3.connect(DB_FILE)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        placeholders = ','.join('?' for _ in newly_inserted_urls)
-        cursor.execute(f"SELECT id, title, summary, text, original_url, publish_date FROM articles WHERE original_url IN ({placeholders})", newly_inserted_urls)
-        articles_with_ids = cursor.fetchall()
-        conn.close()
-        final_articles = []
-        for row in articles_with_ids:
-            article_dict = dict(row)
-            article_dict['publish_date'] = format_date_filter(article_dict['publish_date'])
-            final_articles.append(article_dict)
-        return final_articles
-    return []
+    # SQLite calls block, so they run off the loop as well
+    return await asyncio.to_thread(store_fetched_articles, filtered_articles, category_name, stale_urls)
+
+def store_fetched_articles(filtered_articles, category_name, refresh_urls=()):
+    # Only articles that were new or refreshed are returned; ids come back from the INSERT/UPDATE itself
+    if not filtered_articles: return []
+    saved_ids, known_urls, failed_urls = save_articles_to_db(DB_FILE, filtered_articles, category_name, refresh_urls)
+    if known_urls:
+        logging.info(f"{len(known_urls)} fetched article(s) were already in the archive.")
+    if failed_urls:
+        logging.warning(f"{len(failed_urls)} fetched article(s) could not be saved and will be retried on a later fetch.")
+
+    final_articles = []
+    for article in filtered_articles:
+        article_id = saved_ids.pop(article['original_url'], None)
+        if article_id is None: continue
+        final_articles.append({
+            "id": article_id, "title": article.get('title'), "summary": article.get('summary'),
+            "text": article.get('text'), "original_url": article['original_url'],
+            "publish_date": format_date_filter(article.get('publish_date'))
+        })
+    return final_articles
 
 def fetch_breaking_news_job():
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(fetch_and_parse_news(search_term="Latest News", category_name="Home"))
+        run_in_background_loop(fetch_and_parse_news(search_term="Latest News", category_name="Home"))
     except Exception as e:
         logging.error(f"Error in background job: {e}")
 
 # --- Web Routes (Flask) -----------------------------------
 @app.context_processor
 def inject_shared_data():
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM articles")
-    count = cursor.fetchone()[0]
-    conn.close()
+    stats = get_article_stats()
     
     category_icons = {
         'India': 'fa-solid fa-flag',
@@ -406,31 +821,86 @@ def inject_shared_data():
         LANGUAGES=LANGUAGES, 
         VOICES=VOICES, 
         STATES=STATES, 
-        article_count=count,
+        article_count=stats["total"],
+        ARTICLE_STATS=stats,
         CATEGORY_ICONS=category_icons
     )
 
 def get_articles_from_db(query, params):
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    articles = cursor.fetchall()
-    conn.close()
-    return articles
-
-def build_date_query(base_query, date_from, date_to):
-    params = []
+    return db.query(query, params)
+
+# --- List Queries (each has a matching partial index) ---
+UNPROCESSED_QUERY = "SELECT id, title, summary, text, original_url, category, publish_date, is_processed, fetched_at FROM articles WHERE is_processed = 0"
+# The home page lists the same articles; only its default date window (set in the route) differs
+INDEX_QUERY = UNPROCESSED_QUERY
+PROCESSED_QUERY = "SELECT id, ai_title, ai_content, original_url, publish_date, ai_generated_audio_path, ai_generated_image_path, ai_generated_video_path, fetched_at FROM articles WHERE is_processed = 1"
+CATEGORY_QUERY = "SELECT id, title, summary, text, original_url, publish_date, fetched_at FROM articles WHERE category = ? AND is_processed = 0"
+
+LIST_QUERIES = {
+    'index': INDEX_QUERY,
+    'unprocessed': UNPROCESSED_QUERY,
+    'processed': PROCESSED_QUERY,
+}
+
+def build_date_query(base_query, date_from, date_to, params=None, limit=None, cursor=None):
+    params = list(params or [])
     query = base_query
     if date_from:
-        query += " AND DATE(publish_date) >= ? "
+        query += " AND publish_day >= ? "
         params.append(date_from)
     if date_to:
-        query += " AND DATE(publish_date) <= ? "
+        query += " AND publish_day <= ? "
         params.append(date_to)
-    query += " ORDER BY fetch_timestamp DESC"
+    if cursor:
+        # Keyset pagination: continue strictly after the last (fetched_at, id) already shown
+        query += " AND (fetched_at, id) < (?, ?) "
+        params.extend(cursor)
+    query += " ORDER BY fetched_at DESC, id DESC"
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
     return query, params
 
+# Cursors are "<fetched_at>_<id>" of the last row on the previous page
+def encode_cursor(row):
+    return f"{row['fetched_at'] or 0}_{row['id']}"
+
+def decode_cursor(cursor):
+    if not cursor: return None
+    try:
+        fetched_at, article_id = cursor.split('_')
+        return int(fetched_at), int(article_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+def get_page_size():
+    page_size = request.args.get('page_size', ARTICLES_PAGE_SIZE, type=int)
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+def fetch_article_page(base_query, date_from, date_to, cursor=None, params=None, page_size=ARTICLES_PAGE_SIZE):
+    # One extra row tells whether another page exists without a COUNT
+    query, params = build_date_query(base_query, date_from, date_to, params=params,
+                                     limit=page_size + 1, cursor=decode_cursor(cursor))
+    rows = get_articles_from_db(query, params)
+    next_cursor = encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+    return rows[:page_size], next_cursor
+
+def next_page_url(next_cursor):
+    # Link to the following page of the current list, keeping its dates and page_size
+    if not next_cursor: return None
+    args = request.args.to_dict()
+    args['cursor'] = next_cursor
+    return url_for(request.endpoint, **args)
+
+def page_cursor():
+    # Pages ignore a mangled cursor and start from the newest article
+    cursor = request.args.get('cursor', '')
+    try:
+        decode_cursor(cursor)
+        return cursor
+    except ValueError:
+        return None
+
 @app.route('/')
 def index():
     date_from = request.args.get('date_from', '')
@@ -446,36 +916,27 @@ def index():
         date_from = yesterday.strftime('%Y-%m-%d')
     # --- [MODIFICATION END] ---
 
-    query, params = build_date_query(
-        "SELECT id, title, summary, text, original_url, category, publish_date, is_processed FROM articles WHERE is_processed = 0",
-        date_from, date_to
-    )
-    articles = get_articles_from_db(query, params)
+    articles, next_cursor = fetch_article_page(INDEX_QUERY, date_from, date_to, cursor=page_cursor(), page_size=get_page_size())
     
     # render_template-க்கு date_from-ஐ அனுப்புவதால், ஃபில்டர் பாக்ஸில் அந்தத் தேதி தெரியும்.
-    return render_template('index.html', articles=articles, date_from=date_from, date_to=date_to)
+    return render_template('index.html', articles=articles, date_from=date_from, date_to=date_to,
+                           next_cursor=next_cursor, next_page_url=next_page_url(next_cursor))
 
 @app.route('/unprocessed')
 def unprocessed_page():
     date_from = request.args.get('date_from', '')
     date_to = request.args.get('date_to', '')
-    query, params = build_date_query(
-        "SELECT id, title, summary, text, original_url, category, publish_date FROM articles WHERE is_processed = 0",
-        date_from, date_to
-    )
-    articles = get_articles_from_db(query, params)
-    return render_template('unprocessed.html', articles=articles, date_from=date_from, date_to=date_to)
+    articles, next_cursor = fetch_article_page(UNPROCESSED_QUERY, date_from, date_to, cursor=page_cursor(), page_size=get_page_size())
+    return render_template('unprocessed.html', articles=articles, date_from=date_from, date_to=date_to,
+                           next_cursor=next_cursor, next_page_url=next_page_url(next_cursor))
 
 @app.route('/processed')
 def processed_page():
     date_from = request.args.get('date_from', '')
     date_to = request.args.get('date_to', '')
-    query, params = build_date_query(
-        "SELECT id, ai_title, ai_content, original_url, publish_date, ai_generated_audio_path, ai_generated_image_path, ai_generated_video_path FROM articles WHERE is_processed = 1", 
-        date_from, date_to
-    )
-    articles = get_articles_from_db(query, params)
-    return render_template('processed.html', articles=articles, date_from=date_from, date_to=date_to)
+    articles, next_cursor = fetch_article_page(PROCESSED_QUERY, date_from, date_to, cursor=page_cursor(), page_size=get_page_size())
+    return render_template('processed.html', articles=articles, date_from=date_from, date_to=date_to,
+                           next_cursor=next_cursor, next_page_url=next_page_url(next_cursor))
 
 @app.route('/category/<string:category_name>')
 def category_page(category_name):
@@ -483,18 +944,8 @@ def category_page(category_name):
         return "Category not found", 404
     date_from = request.args.get('date_from', '')
     date_to = request.args.get('date_to', '')
-    base_query = "SELECT id, title, summary, text, original_url, publish_date FROM articles WHERE category = ? AND is_processed = 0"
-    params = [category_name]
-    
-    if date_from:
-        base_query += " AND DATE(publish_date) >= ? "
-        params.append(date_from)
-    if date_to:
-        base_query += " AND DATE(publish_date) <= ? "
-        params.append(date_to)
-        
-    base_query += " ORDER BY fetch_timestamp DESC LIMIT 50"
-    old_articles = get_articles_from_db(base_query, params)
+    query, params = build_date_query(CATEGORY_QUERY, date_from, date_to, params=[category_name], limit=CATEGORY_PAGE_LIMIT)
+    old_articles = get_articles_from_db(query, params)
     
     return render_template('category.html', old_articles=old_articles, category_name=category_name, date_from=date_from, date_to=date_to)
 
@@ -504,11 +955,43 @@ def search_page():
     date_from = request.args.get('date_from', '')
     date_to = request.args.get('date_to', '')
     if not query: return "Please enter a search term.", 400
-    return render_template('search.html', query=query, date_from=date_from, date_to=date_to)
+    local_results = search_local_articles(query, date_from, date_to)
+    return render_template('search.html', query=query, date_from=date_from, date_to=date_to,
+                           local_results=local_results, needs_live_fetch=local_results_need_live_fetch(local_results))
 
 
 # --- API Routes ------------------------------------------
 
+# "Load more" for the list pages: same filters as the page, plus the cursor it returned
+@app.route('/api/articles/<string:list_name>')
+def api_articles(list_name):
+    category_name = request.args.get('category')
+    if list_name == 'category':
+        if category_name not in CATEGORIES: return jsonify({"error": "Category not found"}), 404
+        base_query, params = CATEGORY_QUERY, [category_name]
+    elif list_name in LIST_QUERIES:
+        base_query, params = LIST_QUERIES[list_name], None
+    else:
+        return jsonify({"error": "Unknown article list"}), 404
+
+    try:
+        articles, next_cursor = fetch_article_page(
+            base_query,
+            request.args.get('date_from', ''),
+            request.args.get('date_to', ''),
+            cursor=request.args.get('cursor'),
+            params=params,
+            page_size=get_page_size()
+        )
+    except ValueError as e: return jsonify({"error": str(e)}), 400
+
+    items = []
+    for row in articles:
+        article_dict = dict(row)
+        article_dict['publish_date'] = format_date_filter(article_dict['publish_date'])
+        items.append(article_dict)
+    return jsonify({"articles": items, "next_cursor": next_cursor})
+
 @app.route('/api/fetch-category/<string:category_name>')
 def api_fetch_category(category_name):
     if category_name not in CATEGORIES: return jsonify({"error": "Category not found"}), 404
@@ -516,14 +999,16 @@ def api_fetch_category(category_name):
     date_from = request.args.get('date_from')
     date_to = request.args.get('date_to')
     offset = request.args.get('offset', type=int) 
+    refresh = request.args.get('refresh', '') in ('1', 'true')
     
     try:
-        newly_fetched_articles = asyncio.run(fetch_and_parse_news(
+        newly_fetched_articles = run_in_background_loop(fetch_and_parse_news(
             category_name, 
             category_name,
             date_from=date_from,
             date_to=date_to,
-            offset=offset 
+            offset=offset,
+            refresh=refresh
         ))
         return jsonify(newly_fetched_articles)
     except Exception as e: return jsonify({"error": str(e)}), 500
@@ -536,18 +1021,41 @@ def api_search_and_fetch():
     date_from = request.args.get('date_from')
     date_to = request.args.get('date_to')
     offset = request.args.get('offset', type=int) 
+    more = request.args.get('more', '') in ('1', 'true')
+    refresh = request.args.get('refresh', '') in ('1', 'true')
     
+    # Answer from the local index unless the user asked for more, or it has too few / only old hits
+    local_results = [] if more or offset else search_local_articles(query, date_from, date_to)
+    if local_results and not local_results_need_live_fetch(local_results):
+        return jsonify(local_results)
+
     try:
-        newly_fetched_articles = asyncio.run(fetch_and_parse_news(
+        newly_fetched_articles = run_in_background_loop(fetch_and_parse_news(
             query, 
             "Search",
             date_from=date_from,
             date_to=date_to,
-            offset=offset 
+            offset=offset,
+            refresh=refresh
         ))
-        return jsonify(newly_fetched_articles)
+        local_ids = {article['id'] for article in local_results}
+        return jsonify(local_results + [a for a in newly_fetched_articles if a['id'] not in local_ids])
     except Exception as e: return jsonify({"error": str(e)}), 500
 
+# --- Background Jobs (AI Writer / Voice / Video) ---
+# The AI endpoints only validate and enqueue; the work runs on the job queue and the page polls
+# /api/jobs/<id> for progress and the result, so no request thread is held for the whole job.
+job_queue = JobQueue(db, concurrency=JOB_CONCURRENCY)
+
+@app.route('/api/jobs/<string:job_id>')
+def api_job_status(job_id):
+    job = job_queue.get(job_id)
+    if not job: return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+def job_accepted(job_id):
+    return jsonify({"job_id": job_id, "status": "queued", "status_url": f"/api/jobs/{job_id}"}), 202
+
 # --- AI Writer: Returns STATIC IMAGE ---
 @app.route('/api/ai-writer', methods=['POST'])
 def api_ai_writer():
@@ -563,10 +1071,22 @@ def api_ai_writer():
     if not article_id or not title or not text:
         return jsonify({"error": "Missing article_id, title, or text"}), 400
         
+    job_id = job_queue.submit('ai_writer', {
+        "article_id": article_id, "title": title, "text": text, "target_lang": target_lang
+    }, dedupe_key=f"{article_id}:{target_lang}")
+    return job_accepted(job_id)
+
+def run_ai_writer_job(payload, report):
+    article_id = payload['article_id']
+    title = payload['title']
+    text = payload['text']
+    target_lang = payload['target_lang']
+
     lang_name = LANGUAGES.get(target_lang, 'English')
 
     try:
         # --- 1. Generate Text (Summary) ---
+        report("Writing summary")
         prompt_template = f"""
         Act as a {lang_name} journalist. Based on the following news article, write a short, layman-readable summary in {lang_name}, under 250 words.
         
@@ -607,6 +1127,7 @@ def api_ai_writer():
         db_image_path = None
         if gemini_image_model:
             try:
+                report("Generating image")
                 logging.info(f"Generating image for article {article_id}")
                 image_prompt = f"""
 Generate a high-quality, photorealistic news-style image.
@@ -634,9 +1155,8 @@ Summary: {ai_content_raw[:400]}
                 logging.error(f"Failed to generate image: {e}")
 
         # --- 3. Update Database ---
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute(
+        report("Saving")
+        db.execute(
             """UPDATE articles 
                SET ai_title = ?, 
                    ai_content = ?, 
@@ -646,8 +1166,6 @@ Summary: {ai_content_raw[:400]}
                WHERE id = ?""",
             (ai_title, ai_content_html, ai_raw_response_text, db_image_path, article_id)
         )
-        conn.commit()
-        conn.close()
         
         if target_lang == 'en': title_label, content_label = "Title", "Text Content"
         elif target_lang == 'ta': title_label, content_label = "தலைப்பு செய்தி", "செய்தி உள்ளடக்கம்"
@@ -655,14 +1173,14 @@ Summary: {ai_content_raw[:400]}
 
         ai_text_for_js = f"**{title_label}**\n**{ai_title}**\n\n**{content_label}**\n{ai_content_raw}"
 
-        return jsonify({
+        return {
             "ai_text": ai_text_for_js,
             "image_path": db_image_path 
-        })
+        }
 
     except Exception as e:
         logging.error(f"Error calling Gemini API: {e}")
-        return jsonify({"error": str(e)}), 500
+        raise JobError(str(e))
 
 # --- API: Generate Video (GIF + Update DB) ---
 @app.route('/api/generate-video', methods=['POST'])
@@ -673,42 +1191,43 @@ def api_generate_video():
     if not article_id:
         return jsonify({"error": "Missing article_id"}), 400
 
+    job_id = job_queue.submit('video', {"article_id": article_id}, dedupe_key=str(article_id))
+    return job_accepted(job_id)
+
+def run_video_job(payload, report):
+    article_id = payload['article_id']
+
     try:
         # 1. Fetch the static image path from DB
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute("SELECT ai_generated_image_path FROM articles WHERE id = ?", (article_id,))
-        row = cursor.fetchone()
+        row = db.query_one("SELECT ai_generated_image_path FROM articles WHERE id = ?", (article_id,))
         
         if not row or not row[0]:
-            conn.close()
-            return jsonify({"error": "No static image found to generate video from."}), 404
+            raise JobError("No static image found to generate video from.")
             
         static_image_path = row[0] 
         
         # 2. Check if file exists on disk
         file_path = Path(static_image_path)
         if not file_path.exists():
-            conn.close()
-            return jsonify({"error": "Image file missing on disk"}), 404
+            raise JobError("Image file missing on disk")
             
         # 3. Generate GIF using existing image
+        report("Rendering frames")
         gif_db_path = add_watermark_and_create_gif(file_path, file_path.name)
         
         if not gif_db_path:
-             conn.close()
-             return jsonify({"error": "Failed to create GIF"}), 500
+             raise JobError("Failed to create GIF")
              
         # 4. Update Database with Video Path
-        cursor.execute("UPDATE articles SET ai_generated_video_path = ? WHERE id = ?", (gif_db_path, article_id))
-        conn.commit()
-        conn.close()
+        db.execute("UPDATE articles SET ai_generated_video_path = ? WHERE id = ?", (gif_db_path, article_id))
         
-        return jsonify({"success": True, "video_path": gif_db_path})
+        return {"success": True, "video_path": gif_db_path}
 
+    except JobError:
+        raise
     except Exception as e:
         logging.error(f"Error generating video for {article_id}: {e}")
-        return jsonify({"error": str(e)}), 500
+        raise JobError(str(e))
 
 # --- [UPDATED] API: Generate Voice (ElevenLabs -> Fallback Google TTS with Voice Switching) ---
 @app.route('/api/generate-voice', methods=['POST'])
@@ -725,10 +1244,22 @@ def api_generate_voice():
     if not all([article_id, ai_summary_text, target_lang]):
         return jsonify({"error": "Missing required parameters"}), 400
 
+    job_id = job_queue.submit('voice', {
+        "article_id": article_id, "ai_text": ai_summary_text, "target_lang": target_lang, "voice_id": voice_id
+    }, dedupe_key=f"{article_id}:{target_lang}:{voice_id}")
+    return job_accepted(job_id)
+
+def run_voice_job(payload, report):
+    article_id = payload['article_id']
+    ai_summary_text = payload['ai_text']
+    target_lang = payload['target_lang']
+    voice_id = payload['voice_id']
+
     lang_name = LANGUAGES.get(target_lang, 'English')
 
     try:
         # 1. Generate concise text for speech using Gemini
+        report("Writing audio script")
         deep_summary_prompt = f"""
         Act as a {lang_name} news reader. 
         The following is a news article summary. 
@@ -754,6 +1285,7 @@ def api_generate_voice():
         # 2. Try ElevenLabs First
         if elevenlabs_client and voice_id:
             try:
+                report("Generating voice (ElevenLabs)")
                 logging.info(f"Attempting ElevenLabs generation for article {article_id}...")
                 audio = elevenlabs_client.text_to_speech.convert(
                     voice_id=voice_id,
@@ -775,6 +1307,7 @@ def api_generate_voice():
         # 3. Fallback to Google Cloud TTS if ElevenLabs failed
         if not audio_generated:
             if google_tts_client:
+                report("Generating voice (Google TTS)")
                 logging.info(f"Switching to Google Cloud TTS for article {article_id}...")
                 try:
                     # Determine Gender based on the selected voice ID from existing VOICES dict
@@ -835,37 +1368,40 @@ def api_generate_voice():
                     
                 except Exception as google_e:
                     logging.error(f"Google TTS also failed: {google_e}")
-                    return jsonify({"error": f"Both ElevenLabs ({error_message}) and Google TTS ({str(google_e)}) failed."}), 500
+                    raise JobError(f"Both ElevenLabs ({error_message}) and Google TTS ({str(google_e)}) failed.")
             else:
                 logging.error("Google TTS client not available for fallback.")
-                return jsonify({"error": f"ElevenLabs failed: {error_message}. Google TTS not configured."}), 500
+                raise JobError(f"ElevenLabs failed: {error_message}. Google TTS not configured.")
 
         # 4. Save path to DB if successful
         if audio_generated:
             db_path = f"static/audio/{audio_filename}"
-            conn = sqlite3.connect(DB_FILE)
-            cursor = conn.cursor()
-            cursor.execute(
+            db.execute(
                 "UPDATE articles SET ai_generated_audio_path = ? WHERE id = ?",
                 (db_path, article_id)
             )
-            conn.commit()
-            conn.close()
             
-            return jsonify({
+            return {
                 "success": True, 
                 "audio_path": db_path, 
                 "deep_summary_text": deep_summary_text
-            })
+            }
         else:
-            return jsonify({"error": "Unknown error during voice generation"}), 500
+            raise JobError("Unknown error during voice generation")
 
+    except JobError:
+        raise
     except Exception as e:
         logging.error(f"Error in voice generation for {article_id}: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+        raise JobError(str(e))
+
+job_queue.register('ai_writer', run_ai_writer_job)
+job_queue.register('voice', run_voice_job)
+job_queue.register('video', run_video_job)
 
 if __name__ == '__main__':
     setup_database(DB_FILE)
+    job_queue.start()
     scheduler = BackgroundScheduler(daemon=True)
     scheduler.add_job(fetch_breaking_news_job, 'interval', minutes=30, id='breaking_news_india')
     scheduler.start()